@@ -6,15 +6,25 @@ setup(
     description="A classic Snake game implementation in Python",
     author="Developer",
     packages=find_packages(),
+    package_data={"src": ["levels/*.txt"]},
     python_requires=">=3.10",
     install_requires=[
         "pygame>=2.5.3",
         "setuptools",
         "wheel",
     ],
+    extras_require={
+        "surfarray": ["numpy>=1.24"],
+        "trace": ["numpy>=1.24"],
+        "analytics": ["numpy>=1.24"],
+        "train": ["numpy>=1.24"],
+    },
     entry_points={
         "console_scripts": [
             "snakegame=src.main:run",
+            "snake-train=src.train:main",
+            "snake-server=src.arena_server:main",
+            "snake-loadgen=src.loadgen:main",
         ],
     },
 )
@@ -0,0 +1,261 @@
+"""Position heatmaps aggregated over many games
+
+Heatmaps counts, per board cell, how often a snake's head passed through
+it (travel), where food spawned and where snakes died. Positions are
+buffered as flat cell indices (y * width + x) and added to the (height,
+width) count arrays with one np.bincount per batch, never cell by cell.
+Partial results from parallel workers combine with merge(), and a map
+renders to an image in the game's own colours.
+
+    python -m src.analytics heatmap.png --games 5000 --kind food
+    python -m src.analytics deaths.png --trace traces/ --kind deaths
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+from array import array
+import numpy as np
+from src.config import (COLOR_BACKGROUND, COLOR_PANEL_DIVIDER, COLOR_SNAKE_BODY,
+                        COLOR_SNAKE_HEAD, COLOR_TEXT)
+from src.settings import DEFAULT_CONFIG
+
+KIND_TRAVEL = "travel"
+KIND_FOOD = "food"
+KIND_DEATHS = "deaths"
+KINDS = (KIND_TRAVEL, KIND_FOOD, KIND_DEATHS)
+
+# Colour stops from an empty cell to the busiest one
+HEATMAP_COLORS = (COLOR_BACKGROUND, COLOR_PANEL_DIVIDER, COLOR_SNAKE_BODY,
+                  COLOR_SNAKE_HEAD, COLOR_TEXT)
+
+
+class Heatmaps:
+    """Travel, food spawn and death counts for one board size"""
+
+    def __init__(self, width, height):
+        """Initialize empty maps
+
+        Args:
+            width: Board width in cells
+            height: Board height in cells
+        """
+        self.width = width
+        self.height = height
+        self.games = 0
+        self.maps = {kind: np.zeros((height, width), dtype=np.int64) for kind in KINDS}
+
+    def add_cells(self, kind, cells):
+        """Count flat cell indices (y * width + x) into one map"""
+        cells = np.asarray(cells, dtype=np.intp)
+        if cells.size == 0:
+            return
+        counts = np.bincount(cells, minlength=self.width * self.height)
+        self.maps[kind] += counts.reshape(self.height, self.width)
+
+    def add_positions(self, kind, xs, ys):
+        """Count positions given as parallel x and y arrays into one map"""
+        xs = np.asarray(xs, dtype=np.intp)
+        ys = np.asarray(ys, dtype=np.intp)
+        self.add_cells(kind, ys * self.width + xs)
+
+    def add_trace(self, trace):
+        """Count the games of a trace loaded with src.trace.load_trace
+
+        Every row is a travel sample. Food is counted where it stood on
+        each game's first tick and after every tick the snake ate; a death
+        is counted at each game's final head position.
+        """
+        games = np.asarray(trace['game'])
+        if games.size == 0:
+            return
+        head_x = trace['head_x']
+        head_y = trace['head_y']
+        self.add_positions(KIND_TRAVEL, head_x, head_y)
+
+        last = np.flatnonzero(np.diff(games) != 0)
+        first = np.concatenate(([0], last + 1))
+        last = np.append(last, games.size - 1)
+        spawned = np.union1d(first, np.flatnonzero(trace['ate']))
+        self.add_positions(KIND_FOOD, trace['food_x'][spawned], trace['food_y'][spawned])
+        self.add_positions(KIND_DEATHS, head_x[last], head_y[last])
+        self.games += first.size
+
+    def merge(self, other):
+        """Add another Heatmaps' counts into this one
+
+        Raises:
+            ValueError: If the board sizes differ
+        """
+        if (other.width, other.height) != (self.width, self.height):
+            raise ValueError("Cannot merge heatmaps of different board sizes")
+        for kind in KINDS:
+            self.maps[kind] += other.maps[kind]
+        self.games += other.games
+        return self
+
+    def save(self, path):
+        """Write the counts to an .npz file"""
+        np.savez(path, games=self.games, **self.maps)
+
+    @classmethod
+    def load(cls, path):
+        """Read counts written by save()"""
+        with np.load(path) as data:
+            height, width = data[KIND_TRAVEL].shape
+            heatmaps = cls(width, height)
+            for kind in KINDS:
+                heatmaps.maps[kind][:] = data[kind]
+            heatmaps.games = int(data['games'])
+        return heatmaps
+
+    def to_rgb(self, kind):
+        """Return a (height, width, 3) uint8 image of one map, scaled to its busiest cell"""
+        counts = self.maps[kind]
+        peak = counts.max()
+        level = counts / peak if peak else np.zeros(counts.shape)
+        stops = np.linspace(0.0, 1.0, len(HEATMAP_COLORS))
+        palette = np.array(HEATMAP_COLORS, dtype=np.float64)
+        rgb = np.empty(counts.shape + (3,), dtype=np.uint8)
+        for channel in range(3):
+            rgb[..., channel] = np.interp(level, stops, palette[:, channel]).round()
+        return rgb
+
+    def render(self, kind, path, cell_size=16):
+        """Save one map as an image (format from the file extension)"""
+        import pygame
+        rgb = self.to_rgb(kind)
+        # Surfaces are indexed (x, y)
+        surface = pygame.surfarray.make_surface(rgb.transpose(1, 0, 2))
+        surface = pygame.transform.scale(surface, (self.width * cell_size, self.height * cell_size))
+        pygame.image.save(surface, path)
+
+
+def collect_bot_games(games, config=None, seed=None, max_ticks=10000):
+    """Play games with GreedyBot and count them into a new Heatmaps
+
+    Args:
+        games: Number of games to play
+        config (GameConfig, optional): Game settings
+        seed: Seed for the first game (later games use the following
+            seeds); None picks random seeds
+        max_ticks: Games still running after this many ticks are cut off
+            and not counted as deaths
+
+    Returns:
+        Heatmaps: Counts for the played games
+    """
+    from src.bot import GreedyBot
+    from src.game_board import GameBoard
+    from src.difficulty import Difficulty, create_schedule
+    from src.simulation import Simulation, new_seed
+
+    config = config if config is not None else DEFAULT_CONFIG
+    board = GameBoard.from_config(config)
+    difficulty = Difficulty(create_schedule(config))
+    width = board.width
+    heatmaps = Heatmaps(board.width, board.height)
+    bot = GreedyBot()
+
+    # Flat cell indices, counted in one bincount per map at the end
+    cells = {kind: array('q') for kind in KINDS}
+    travel = cells[KIND_TRAVEL]
+    food = cells[KIND_FOOD]
+    for game_index in range(games):
+        simulation = Simulation(new_seed() if seed is None else seed + game_index,
+                                config, board, difficulty, timed=False)
+        x, y = simulation.food.position
+        food.append(y * width + x)
+        while simulation.death_cause is None and simulation.tick < max_ticks:
+            ate = simulation.step(bot.choose_direction(simulation))
+            x, y = simulation.snake.body[0]
+            travel.append(y * width + x)
+            if ate:
+                x, y = simulation.food.position
+                food.append(y * width + x)
+        if simulation.death_cause is not None:
+            x, y = simulation.snake.body[0]
+            cells[KIND_DEATHS].append(y * width + x)
+
+    for kind in KINDS:
+        heatmaps.add_cells(kind, np.frombuffer(cells[kind], dtype=np.int64))
+    heatmaps.games = games
+    return heatmaps
+
+
+def _collect_job(job):
+    """Collect one worker's share of games"""
+    games, config, seed = job
+    return collect_bot_games(games, config, seed=seed)
+
+
+def collect_parallel(games, workers=None, seed=None, chunk=100, config=None):
+    """Collect bot games across a process pool and merge the partial maps
+
+    Args:
+        games: Total number of games
+        workers: Pool size; None uses every CPU
+        seed: Seed of the first game, or None for random seeds
+        chunk: Games per job
+        config (GameConfig, optional): Game settings
+
+    Returns:
+        Heatmaps: Merged counts, empty when games is 0
+    """
+    if games <= 0:
+        return collect_bot_games(0, config)
+    jobs = []
+    for start in range(0, games, chunk):
+        jobs.append((min(chunk, games - start), config,
+                     None if seed is None else seed + start))
+    with multiprocessing.Pool(workers) as pool:
+        parts = pool.map(_collect_job, jobs)
+    merged = parts[0]
+    for part in parts[1:]:
+        merged.merge(part)
+    return merged
+
+
+def main(argv=None):
+    """Aggregate heatmaps from bot games, a trace or saved counts and render one"""
+    parser = argparse.ArgumentParser(description="Render travel, food spawn or death heatmaps")
+    parser.add_argument("output", help="Image path (.png, .bmp, ...)")
+    parser.add_argument("--kind", choices=KINDS, default=KIND_TRAVEL)
+    parser.add_argument("--games", type=int, default=1000, help="Bot games to play")
+    parser.add_argument("--trace", help="Aggregate a trace directory instead of playing")
+    parser.add_argument("--merge", nargs="+", metavar="NPZ",
+                        help="Merge saved counts instead of playing")
+    parser.add_argument("--size", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"),
+                        default=(DEFAULT_CONFIG.board_width, DEFAULT_CONFIG.board_height),
+                        help="Board size of the traced games")
+    parser.add_argument("--save", help="Also write the counts to this .npz file")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cell-size", type=int, default=16)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    if args.merge:
+        heatmaps = Heatmaps.load(args.merge[0])
+        for path in args.merge[1:]:
+            heatmaps.merge(Heatmaps.load(path))
+    elif args.trace:
+        from src.trace import load_trace
+        heatmaps = Heatmaps(*args.size)
+        heatmaps.add_trace(load_trace(args.trace))
+    else:
+        heatmaps = collect_parallel(args.games, args.workers)
+    elapsed = time.perf_counter() - started
+
+    if args.save:
+        heatmaps.save(args.save)
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    heatmaps.render(args.kind, args.output, args.cell_size)
+    print(f"{heatmaps.games} games aggregated in {elapsed:.1f} s; "
+          f"{int(heatmaps.maps[args.kind].sum())} {args.kind} samples")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
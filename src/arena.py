@@ -0,0 +1,207 @@
+"""Multi-snake arena with a shared occupancy grid"""
+
+from collections import namedtuple
+from src.snake import Snake
+from src.food import Food
+from src.game_board import GameBoard
+from src.config import BOARD_WIDTH, BOARD_HEIGHT, INITIAL_SNAKE_LENGTH, ARENA_FOOD_COUNT
+from src.direction import OPPOSITE, to_code
+
+# Death causes reported by Arena.step()
+DEATH_HEAD_ON = "head_on"
+DEATH_BODY = "body"
+
+# Result of a single arena tick
+ArenaTick = namedtuple("ArenaTick", ["tick", "eaten", "died", "respawned"])
+
+
+class OccupancyGrid:
+    """Counts snake segments per board cell
+
+    A count (rather than a flag) is kept because a freshly grown snake
+    stacks two segments on its tail cell.
+    """
+
+    def __init__(self, width, height):
+        """Initialize an empty grid of the given size"""
+        self.width = width
+        self.height = height
+        self.cells = [0] * (width * height)
+
+    def index(self, position):
+        """Return the flat index of an (x, y) position"""
+        x, y = position
+        return y * self.width + x
+
+    def add(self, position):
+        """Mark one more segment on a cell"""
+        self.cells[position[1] * self.width + position[0]] += 1
+
+    def remove(self, position):
+        """Remove one segment from a cell"""
+        self.cells[position[1] * self.width + position[0]] -= 1
+
+    def is_occupied(self, position):
+        """Check if any segment covers the cell"""
+        return self.cells[position[1] * self.width + position[0]] > 0
+
+    def __contains__(self, position):
+        """Allow the grid to be used as Food.spawn's exclude container"""
+        return self.is_occupied(position)
+
+
+class ArenaPlayer:
+    """A snake taking part in an arena match"""
+
+    def __init__(self, player_id, snake):
+        """Wrap a snake with its arena bookkeeping"""
+        self.player_id = player_id
+        self.snake = snake
+        self.alive = True
+        self.score = 0
+        self.death_cause = None
+
+
+class Arena:
+    """Steps many snakes at once on one toroidal board
+
+    Simultaneous-move rules, applied to every living snake in one pass:
+        - Every mover vacates its tail cell before heads are placed, so a
+          snake may follow any tail (its own or another snake's).
+        - Two or more heads entering the same cell all die (head-on).
+        - A head entering a cell still covered by a body dies. Head swaps
+          fall out of this rule, since each head lands on the other's neck.
+        - Food is only eaten by a snake that survives the tick.
+    """
+
+    def __init__(self, width=BOARD_WIDTH, height=BOARD_HEIGHT, food_count=ARENA_FOOD_COUNT,
+                 rng=None):
+        """Initialize an empty arena
+
+        Args:
+            width: Board width in cells
+            height: Board height in cells
+            food_count: Number of food items kept on the board
+            rng: Optional random.Random used for food spawns
+        """
+        self.board = GameBoard(width, height)
+        self.grid = OccupancyGrid(width, height)
+        self.players = []
+        self.tick = 0
+        self.foods = []
+        self._food_at = {}
+        for _ in range(food_count):
+            food = Food(self.board, rng)
+            food.spawn(exclude_positions=self)
+            self.foods.append(food)
+            self._food_at[food.position] = len(self.foods) - 1
+
+    def __contains__(self, position):
+        """Check if a cell is blocked by a snake or another food item"""
+        return self.grid.is_occupied(position) or position in self._food_at
+
+    def add_snake(self, position, direction='RIGHT', length=INITIAL_SNAKE_LENGTH):
+        """Add a snake whose body extends upward from position
+
+        Returns:
+            ArenaPlayer: The new player
+
+        Raises:
+            ValueError: If the snake would overlap another snake
+        """
+        snake = Snake(position, length, board=self.board)
+        snake.direction = direction
+        if any(self.grid.is_occupied(segment) for segment in snake.body):
+            raise ValueError(f"Cannot place snake at {position}: cell occupied")
+
+        for segment in snake.body:
+            self.grid.add(segment)
+        player = ArenaPlayer(len(self.players), snake)
+        self.players.append(player)
+        return player
+
+    def alive_players(self):
+        """Return the players still in the match"""
+        return [player for player in self.players if player.alive]
+
+    def food_positions(self):
+        """Return the positions of all food items"""
+        return [food.position for food in self.foods]
+
+    def step(self, directions=None):
+        """Advance every living snake by one cell
+
+        Args:
+            directions: Optional dict of player_id -> requested direction.
+                180 degree turns are ignored, as in the single-player game.
+
+        Returns:
+            ArenaTick: Players who ate, players who died (id -> cause) and
+                indices of respawned food items
+        """
+        if directions:
+            for player_id, new_dir in directions.items():
+                snake = self.players[player_id].snake
+                new_dir = to_code(new_dir)
+                if new_dir != OPPOSITE[snake.heading]:
+                    snake.heading = new_dir
+
+        grid = self.grid
+        wrap_position = self.board.wrap_position
+        movers = []
+        targets = []
+        head_counts = {}
+
+        # Pass 1: compute targets and vacate all tails
+        for player in self.players:
+            if not player.alive:
+                continue
+            snake = player.snake
+            target = wrap_position(snake.next_head_position(snake.heading))
+            movers.append(player)
+            targets.append(target)
+            head_counts[target] = head_counts.get(target, 0) + 1
+            grid.remove(snake.body[-1])
+
+        # Pass 2: resolve conflicts against the shared grid
+        died = {}
+        for player, target in zip(movers, targets):
+            if head_counts[target] > 1:
+                died[player.player_id] = DEATH_HEAD_ON
+            elif grid.is_occupied(target):
+                died[player.player_id] = DEATH_BODY
+
+        # Pass 3: commit moves, growth and deaths
+        eaten = []
+        eaten_food = []
+        for player, target in zip(movers, targets):
+            snake = player.snake
+            if player.player_id in died:
+                # The tail was already vacated in pass 1
+                for segment in snake.body[:-1]:
+                    grid.remove(segment)
+                player.alive = False
+                player.death_cause = died[player.player_id]
+                continue
+
+            snake.move(snake.heading)
+            snake.body[0] = target
+            grid.add(target)
+
+            food_index = self._food_at.get(target)
+            if food_index is not None:
+                snake.grow()
+                grid.add(snake.body[-1])
+                player.score += 1
+                eaten.append(player.player_id)
+                eaten_food.append(food_index)
+
+        # Respawn eaten food once the board reflects every move
+        for food_index in eaten_food:
+            food = self.foods[food_index]
+            del self._food_at[food.position]
+            food.spawn(exclude_positions=self)
+            self._food_at[food.position] = food_index
+
+        self.tick += 1
+        return ArenaTick(self.tick, eaten, died, eaten_food)
@@ -0,0 +1,389 @@
+"""Asyncio arena server on localhost
+
+Clients connect over TCP and are seated in rooms of SERVER_ROOM_SIZE
+snakes, each an Arena driven by a netplay.LocalServer. Messages are the
+src.protocol messages, each prefixed with its 4 byte length. A new client
+gets a welcome with its player id and a snapshot, then one delta (or
+keyframe snapshot) per tick, encoded once per room and written to every
+seat. Clients send tick-tagged input batches.
+
+Seats no client holds keep a snake moving straight. A room restarts with
+fresh snakes once every seated snake has died.
+
+    python -m src.arena_server --port 8765
+"""
+
+import sys
+import time
+import random
+import struct
+import asyncio
+import argparse
+from array import array
+from dataclasses import dataclass, field
+from src.arena import Arena
+from src.config import (SERVER_HOST, SERVER_PORT, SERVER_TICK_INTERVAL, SERVER_ROOM_SIZE,
+                        SERVER_ROOM_WIDTH, SERVER_ROOM_HEIGHT, ARENA_FOOD_COUNT)
+from src.netplay import LocalServer
+from src.protocol import MSG_INPUT, decode, encode_welcome, message_type
+
+_LENGTH = struct.Struct('<I')
+
+# Clients this far behind on reading are disconnected
+WRITE_BUFFER_LIMIT = 1 << 20
+
+# Longest message a reader accepts; clients only send small input batches
+MAX_MESSAGE_SIZE = 1 << 20
+MAX_INPUT_MESSAGE_SIZE = 2048
+
+
+def frame_message(data):
+    """Prefix a protocol message with its length for the stream"""
+    return _LENGTH.pack(len(data)) + data
+
+
+class MessageReader:
+    """Splits a byte stream back into length-prefixed messages"""
+
+    def __init__(self, max_length=MAX_MESSAGE_SIZE):
+        """Initialize an empty buffer
+
+        Args:
+            max_length: Longest message accepted, so a bad length prefix
+                cannot make the buffer grow without bound
+        """
+        self.max_length = max_length
+        self._buffer = bytearray()
+
+    def feed(self, data):
+        """Add received bytes and return the messages completed by them
+
+        Raises:
+            ValueError: If a length prefix exceeds max_length
+        """
+        buffer = self._buffer
+        buffer += data
+        messages = []
+        offset = 0
+        while len(buffer) - offset >= _LENGTH.size:
+            length = _LENGTH.unpack_from(buffer, offset)[0]
+            if length > self.max_length:
+                raise ValueError(f"Message of {length} bytes exceeds {self.max_length}")
+            end = offset + _LENGTH.size + length
+            if end > len(buffer):
+                break
+            messages.append(bytes(buffer[offset + _LENGTH.size:end]))
+            offset = end
+        del buffer[:offset]
+        return messages
+
+
+@dataclass
+class ServerStats:
+    """Tick timing and traffic measured inside a window
+
+    Lateness is how long after its deadline a tick started; duration is
+    the time the tick took to step and send every room.
+    """
+    ticks: int = 0
+    overruns: int = 0
+    lateness_ms: array = field(default_factory=lambda: array('d'))
+    duration_ms: array = field(default_factory=lambda: array('d'))
+    messages: int = 0
+    bytes_sent: int = 0
+    inputs: int = 0
+    rooms: int = 0
+    peak_connections: int = 0
+    slow_disconnects: int = 0
+    rejected: int = 0
+
+
+class Room:
+    """One arena and the connections seated in it"""
+
+    def __init__(self, size=SERVER_ROOM_SIZE, width=SERVER_ROOM_WIDTH,
+                 height=SERVER_ROOM_HEIGHT, rng=None):
+        """Initialize a room with every seat free
+
+        Args:
+            size: Seats (snakes) in the room
+            width: Arena width in cells
+            height: Arena height in cells
+            rng (random.Random, optional): Food spawn stream shared by the
+                room's matches. Defaults to a freshly seeded one.
+        """
+        self.size = size
+        self.width = width
+        self.height = height
+        self.rng = rng if rng is not None else random.Random()
+        self.seats = [None] * size
+        self.seated = 0
+        self.reset()
+
+    def reset(self):
+        """Start a new match with one snake per seat"""
+        arena = Arena(self.width, self.height, food_count=ARENA_FOOD_COUNT, rng=self.rng)
+        spacing = self.width // self.size
+        for seat in range(self.size):
+            row = self.height // 4 if seat % 2 == 0 else self.height * 3 // 4
+            arena.add_snake((seat * spacing + spacing // 2, row))
+        self.server = LocalServer(arena)
+
+    def seated_alive(self):
+        """Return True if any seated player's snake is alive"""
+        players = self.server.arena.players
+        return any(connection is not None and players[seat].alive
+                   for seat, connection in enumerate(self.seats))
+
+
+class _Connection(asyncio.Protocol):
+    """One client's transport, seat and message reader"""
+
+    def __init__(self, server):
+        """Initialize an unseated connection"""
+        self.server = server
+        self.transport = None
+        self.room = None
+        self.seat = None
+        self.reader = MessageReader(MAX_INPUT_MESSAGE_SIZE)
+
+    def connection_made(self, transport):
+        """Seat the client"""
+        self.transport = transport
+        self.server.join(self)
+
+    def data_received(self, data):
+        """Pass complete messages to the server, dropping clients that send garbage"""
+        try:
+            messages = self.reader.feed(data)
+        except ValueError:
+            self.server.reject(self)
+            return
+        for message in messages:
+            if self.transport.is_closing():
+                break
+            self.server.receive(self, message)
+
+    def connection_lost(self, exc):
+        """Free the seat"""
+        self.server.leave(self)
+
+    def send(self, message):
+        """Write a framed message, dropping clients that stopped reading"""
+        transport = self.transport
+        if transport.is_closing():
+            return False
+        if transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+            self.server.stats.slow_disconnects += 1
+            transport.abort()
+            return False
+        transport.write(message)
+        return True
+
+
+class ArenaServer:
+    """Rooms of arenas stepped together on one tick schedule"""
+
+    def __init__(self, host=SERVER_HOST, port=SERVER_PORT, tick_interval=SERVER_TICK_INTERVAL,
+                 room_size=SERVER_ROOM_SIZE, seed=None):
+        """Initialize the server
+
+        Args:
+            host: Interface to listen on
+            port: TCP port; 0 picks a free one (see self.port after start)
+            tick_interval: Seconds between ticks
+            room_size: Snakes per room
+            seed: Seeds each room's food spawns, so a run can be repeated;
+                None seeds from the system
+        """
+        self.host = host
+        self.port = port
+        self.tick_interval = tick_interval
+        self.room_size = room_size
+        self.rng = random.Random(seed)
+        self.rooms = []
+        self.connections = 0
+        self.tick = 0
+        self.stats = ServerStats()
+        # Ticks starting inside this time.time() window are measured
+        self.window = (0.0, float('inf'))
+        self._server = None
+
+    async def start(self):
+        """Start listening"""
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: _Connection(self), self.host, self.port,
+                                                backlog=4096)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Stop listening and drop every client"""
+        if self._server is not None:
+            self._server.close()
+            for room in self.rooms:
+                for connection in room.seats:
+                    if connection is not None:
+                        connection.transport.abort()
+            await self._server.wait_closed()
+            self._server = None
+
+    def join(self, connection):
+        """Seat a new connection in the first room with a free seat"""
+        for room in self.rooms:
+            if room.seated < room.size:
+                break
+        else:
+            room = Room(self.room_size, rng=random.Random(self.rng.getrandbits(64)))
+            self.rooms.append(room)
+            self.stats.rooms = len(self.rooms)
+        seat = room.seats.index(None)
+        room.seats[seat] = connection
+        room.seated += 1
+        connection.room = room
+        connection.seat = seat
+        self.connections += 1
+        self.stats.peak_connections = max(self.stats.peak_connections, self.connections)
+        connection.send(frame_message(encode_welcome(room.server.arena.tick, seat)))
+        connection.send(frame_message(room.server.snapshot()))
+
+    def leave(self, connection):
+        """Free a connection's seat"""
+        room = connection.room
+        if room is None:
+            return
+        room.seats[connection.seat] = None
+        room.seated -= 1
+        connection.room = None
+        self.connections -= 1
+
+    def receive(self, connection, data):
+        """Queue an input batch for the sender's own snake
+
+        A malformed message disconnects its sender.
+        """
+        room = connection.room
+        if room is None:
+            return
+        try:
+            if message_type(data) != MSG_INPUT:
+                return
+            batch = decode(data)
+        except (ValueError, struct.error):
+            self.reject(connection)
+            return
+        if batch.player_id != connection.seat:
+            return
+        room.server.receive_batch(batch)
+        self.stats.inputs += 1
+
+    def reject(self, connection):
+        """Disconnect a client that sent a malformed message"""
+        self.stats.rejected += 1
+        connection.transport.abort()
+
+    def step(self):
+        """Tick every occupied room and send each room's frame to its seats
+
+        Returns:
+            tuple: (messages, bytes) written
+        """
+        messages = 0
+        sent = 0
+        for room in self.rooms:
+            if room.seated == 0:
+                continue
+            if room.seated_alive():
+                data = room.server.tick()
+            else:
+                room.reset()
+                data = room.server.snapshot()
+            message = frame_message(data)
+            for connection in room.seats:
+                if connection is not None and connection.send(message):
+                    messages += 1
+                    sent += len(message)
+        self.tick += 1
+        return messages, sent
+
+    async def run(self, should_stop=None):
+        """Tick on schedule until should_stop() returns True
+
+        Deadlines advance by the interval, as in SnakeGame.run; a tick that
+        starts more than one interval late resets the schedule and counts
+        as an overrun.
+        """
+        stats = self.stats
+        started_window, end_window = self.window
+        next_tick = time.perf_counter() + self.tick_interval
+        while should_stop is None or not should_stop():
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            started = time.perf_counter()
+            lateness = started - next_tick
+            messages, sent = self.step()
+            finished = time.perf_counter()
+
+            if started_window <= time.time() < end_window:
+                stats.ticks += 1
+                stats.lateness_ms.append(lateness * 1000.0)
+                stats.duration_ms.append((finished - started) * 1000.0)
+                stats.messages += messages
+                stats.bytes_sent += sent
+            next_tick += self.tick_interval
+            if lateness > self.tick_interval:
+                stats.overruns += 1
+                next_tick = finished + self.tick_interval
+
+
+def serve_process(port, tick_interval, window, ready, stop, results, seed=None):
+    """Run a server in its own process for the load generator
+
+    Args:
+        port: TCP port, or 0 for a free one
+        tick_interval: Seconds between ticks
+        window: (start, end) time.time() range to measure
+        ready: multiprocessing.Queue that receives the bound port
+        stop: multiprocessing.Event that ends the run
+        results: multiprocessing.Queue that receives the ServerStats
+        seed: Seed for the rooms' food spawns (see ArenaServer)
+    """
+    async def main():
+        server = ArenaServer(port=port, tick_interval=tick_interval, seed=seed)
+        server.window = window
+        await server.start()
+        ready.put(server.port)
+        await server.run(stop.is_set)
+        await server.close()
+        return server.stats
+
+    results.put(asyncio.run(main()))
+
+
+def main(argv=None):
+    """Serve arenas on localhost until interrupted"""
+    parser = argparse.ArgumentParser(description="Serve Snake arenas on localhost")
+    parser.add_argument("--port", type=int, default=SERVER_PORT)
+    parser.add_argument("--tick-interval", type=float, default=SERVER_TICK_INTERVAL)
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed the rooms' food spawns")
+    args = parser.parse_args(argv)
+
+    async def serve():
+        server = ArenaServer(port=args.port, tick_interval=args.tick_interval, seed=args.seed)
+        await server.start()
+        print(f"Serving arenas on {server.host}:{server.port}", flush=True)
+        try:
+            await server.run()
+        finally:
+            await server.close()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""Asset cache for rendered text and display-format surfaces
+
+Rendering a string or converting a surface the first time is much slower
+than blitting the result. AssetCache keeps rendered text keyed by
+(font, string, colour) and converts every surface to the display format
+once, so a frame only pays for blits. SnakeGame fills the cache while the
+menu is idle (see SnakeGame._warmup_steps).
+"""
+
+from collections import OrderedDict
+import pygame
+from src.config import TEXT_CACHE_SIZE
+
+
+def prepare_surface(surface):
+    """Convert a surface to the display's pixel format for fast blitting
+
+    Surfaces are returned unchanged when no display mode is set (headless
+    rendering), since there is no format to convert to.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+class AssetCache:
+    """Least-recently-used cache of rendered text surfaces"""
+
+    def __init__(self, max_text=TEXT_CACHE_SIZE):
+        """Initialize an empty cache
+
+        Args:
+            max_text: Rendered strings kept before the oldest is evicted
+        """
+        self.max_text = max_text
+        self._text = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def text(self, font, string, color):
+        """Return string rendered (antialiased) in font and color"""
+        # Fonts live as long as the game, so their id is a stable key
+        key = (id(font), string, color)
+        surface = self._text.get(key)
+        if surface is not None:
+            self._text.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = prepare_surface(font.render(string, True, color))
+        self._text[key] = surface
+        if len(self._text) > self.max_text:
+            self._text.popitem(last=False)
+        return surface
+
+    def __len__(self):
+        """Return the number of cached text surfaces"""
+        return len(self._text)
@@ -0,0 +1,50 @@
+"""Greedy autopilot for unattended play
+
+Assign an instance to SnakeGame.autopilot and the game asks it for a
+direction before every tick. Used by the soak test and for attract-mode
+demos; it is not meant to play well, only to keep games going.
+"""
+
+from src.direction import DIRECTIONS, OPPOSITE
+
+
+class GreedyBot:
+    """Heads for the food, avoiding cells that would end the game"""
+
+    def choose_direction(self, game):
+        """Return the direction code for the next tick
+
+        Every safe turn is scored by the wrapped distance from the cell it
+        leads to to the food; the closest wins, preferring to keep going
+        straight on ties. With no safe turn the current heading is kept.
+        """
+        snake = game.snake
+        board = game.board
+        heading = snake.heading
+        steps = board.steps(snake.body[0])
+        if steps is None:
+            return heading
+
+        # The tail moves away this tick, so its cell is free
+        blocked = set(snake.body[:-1])
+        food_x, food_y = game.food.position
+        best = None
+        best_distance = None
+        for code in (heading,) + DIRECTIONS:
+            if code == OPPOSITE[heading]:
+                continue
+            cell = steps[code]
+            if cell in blocked or board.is_wall(cell):
+                continue
+            distance = (self._wrapped(cell[0] - food_x, board.width)
+                        + self._wrapped(cell[1] - food_y, board.height))
+            if best_distance is None or distance < best_distance:
+                best = code
+                best_distance = distance
+        return heading if best is None else best
+
+    @staticmethod
+    def _wrapped(delta, size):
+        """Return the shorter way round a board axis of the given size"""
+        delta %= size
+        return min(delta, size - delta)
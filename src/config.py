@@ -1,3 +1,5 @@
+import os
+
 # Game Configuration
 BOARD_WIDTH = 20
 BOARD_HEIGHT = 20
@@ -7,6 +9,24 @@ GAME_SPEED_MIN = 0.04  # fastest allowed speed (25 moves per second)
 GAME_SPEED_STEP = 0.005  # speed increase per food eaten
 INITIAL_SNAKE_LENGTH = 3
 
+# Difficulty Configuration
+SPEED_SCHEDULE_LINEAR = "linear"
+SPEED_SCHEDULE_EXPONENTIAL = "exponential"
+SPEED_SCHEDULE_TIERED = "tiered"
+SPEED_SCHEDULE_TIME = "time"
+SPEED_SCHEDULE = SPEED_SCHEDULE_LINEAR
+SPEED_EXPONENTIAL_FACTOR = 0.95  # interval multiplier per food eaten
+# (min_score, fraction of the way from game_speed_initial to game_speed_min)
+SPEED_TIERS = ((0, 0.0), (5, 0.25), (10, 0.45), (20, 0.65), (35, 0.85), (50, 1.0))
+SPEED_TIME_PERIOD = 15.0  # seconds of play per time-based level
+DIFFICULTY_TABLE_SIZE = 256  # levels with a precomputed interval
+MAX_CATCHUP_TICKS = 5  # ticks run back to back before the loop gives up catching up
+
+# Level Configuration
+LEVEL = ""  # level name in LEVEL_DIR or path to a level file; empty for an open board
+LEVEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "levels")  # shipped as package data
+LEVEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".level_cache")
+
 # Game States
 STATE_MENU = "menu"
 STATE_PLAYING = "playing"
@@ -17,6 +37,7 @@ STATE_PAUSED = "paused"
 COLOR_SNAKE_HEAD = (0, 230, 255)
 COLOR_SNAKE_BODY = (0, 160, 220)
 COLOR_FOOD = (120, 80, 255)
+COLOR_WALL = (45, 70, 130)
 COLOR_BACKGROUND = (6, 8, 16)
 COLOR_BORDER = (80, 140, 255)
 COLOR_TEXT = (220, 235, 255)
@@ -43,6 +64,76 @@ PANEL_WIDTH_MAX = 200
 PANEL_PADDING = 16
 BUTTON_SPACING = 18
 
+# Persistence Configuration
+HIGH_SCORE_REFRESH_INTERVAL = 1.0  # seconds between checks for changes by other processes
+
 # Window Configuration
 MIN_WINDOW_WIDTH = 800
 MIN_WINDOW_HEIGHT = 600
+
+# Arena Configuration
+ARENA_FOOD_COUNT = 3
+
+# Network Configuration
+KEYFRAME_INTERVAL = 30  # ticks between full snapshots
+INPUT_MAX_LEAD_TICKS = 64  # furthest ahead of the server a client input may be tagged
+INPUT_MAX_PENDING = 32  # inputs held per player until their tick comes
+SPECTATOR_QUEUE_LIMIT = 60  # frames a spectator may lag before resyncing
+SERVER_HOST = "127.0.0.1"  # arena server and load generator stay on loopback
+SERVER_PORT = 8765
+SERVER_TICK_INTERVAL = 0.1  # seconds between arena server ticks
+SERVER_ROOM_SIZE = 8  # snakes per arena room
+SERVER_ROOM_WIDTH = 32
+SERVER_ROOM_HEIGHT = 32
+
+# Input Configuration
+INPUT_QUEUE_DEPTH = 3  # direction changes buffered ahead of the simulation
+IDLE_WAIT_TIMEOUT_MS = 1000  # longest block on the event queue on idle screens
+
+# Render Configuration
+RENDER_BACKEND_DRAW = "draw"
+RENDER_BACKEND_SURFARRAY = "surfarray"  # needs numpy; suits very large boards
+RENDER_BACKEND = RENDER_BACKEND_DRAW
+FRAME_RATE_CAP = 60  # most frames drawn per second while playing
+TEXT_CACHE_SIZE = 256  # rendered strings kept by the asset cache
+WARMUP_SCORE_LABELS = 50  # score labels pre-rendered while the menu is idle
+
+# Telemetry Configuration
+TELEMETRY_PATH = ""  # .ndjson or .db file; empty disables telemetry
+TELEMETRY_BUFFER_SIZE = 4096  # events held in memory between flushes
+TELEMETRY_FLUSH_INTERVAL = 2.0  # seconds between background flushes
+
+# Soak Test Configuration
+SOAK_HOURS = 1.0  # simulated play per soak run
+SOAK_SNAPSHOT_INTERVAL = 600.0  # simulated seconds between tracemalloc snapshots
+SOAK_RSS_BUDGET_MB = 32.0  # allowed resident memory growth after warm-up
+SOAK_OBJECT_BUDGET = 5000  # allowed growth in live objects tracked by the GC
+SOAK_TOP_LINES = 10  # allocation hot spots reported per snapshot
+
+# Trace Configuration
+TRACE_PATH = ""  # directory for per-tick column files; empty disables tracing
+TRACE_CHUNK_ROWS = 65536  # ticks buffered in memory before a chunk is appended
+
+# Replay Verification Configuration
+VERIFY_MAX_TICKS = 1000000  # longer replays are rejected without simulating
+VERIFY_CHUNK_SIZE = 64  # replays handed to a pool worker at a time
+
+# Training Configuration
+TRAIN_POPULATION = 96  # policies per generation
+TRAIN_HIDDEN = 16  # hidden units per policy
+TRAIN_GAMES = 2  # games each policy plays per generation
+TRAIN_ELITE = 0.1  # fraction of each generation kept as parents
+TRAIN_MUTATION = 0.1  # weight noise added to children
+TRAIN_MAX_TICKS = 2000  # games are stopped after this many ticks
+TRAIN_CHECKPOINT = "snake_policy.npz"  # best genome, loadable with --autopilot
+
+# Split Process Configuration
+SPLIT_INPUT_CAPACITY = 256  # direction codes and commands queued for the simulation process
+SPLIT_POLL_INTERVAL = 0.002  # longest the simulation process sleeps before checking input
+SPLIT_READ_RETRIES = 1000  # frame reads retried before a stuck writer is given up on
+
+# Load Generator Configuration
+LOADGEN_INPUT_RATE = 2.0  # direction changes per second per bot
+LOADGEN_DURATION = 10.0  # seconds measured per load step
+LOADGEN_JITTER_BUDGET_MS = 10.0  # p99 server tick lateness a step may reach
+LOADGEN_LATENCY_BUDGET_MS = 150.0  # p99 input latency a step may reach
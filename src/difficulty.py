@@ -0,0 +1,148 @@
+"""Difficulty schedules mapping progress to tick intervals
+
+A schedule turns a level into the seconds between simulation ticks.
+Score-based schedules use the score as the level; the time-based one
+uses whole periods of play time. Difficulty precomputes the interval for
+every level into a table so the game loop only does a lookup per tick.
+"""
+
+from src.config import (SPEED_SCHEDULE_LINEAR, SPEED_SCHEDULE_EXPONENTIAL, SPEED_SCHEDULE_TIERED,
+                        SPEED_SCHEDULE_TIME, SPEED_EXPONENTIAL_FACTOR, SPEED_TIERS,
+                        SPEED_TIME_PERIOD, DIFFICULTY_TABLE_SIZE)
+
+
+class LinearSchedule:
+    """Interval shrinks by a fixed step per food eaten"""
+
+    def __init__(self, initial, minimum, step):
+        """Initialize with the starting and fastest intervals and the step per food"""
+        self.initial = initial
+        self.minimum = minimum
+        self.step = step
+
+    def level(self, score, play_time):
+        """Return the level reached at this score"""
+        return score
+
+    def interval(self, level):
+        """Return the seconds per tick at a level"""
+        return max(self.minimum, self.initial - self.step * level)
+
+
+class ExponentialSchedule:
+    """Interval shrinks by a constant factor per food eaten"""
+
+    def __init__(self, initial, minimum, factor=SPEED_EXPONENTIAL_FACTOR):
+        """Initialize with the starting and fastest intervals and the factor per food"""
+        self.initial = initial
+        self.minimum = minimum
+        self.factor = factor
+
+    def level(self, score, play_time):
+        """Return the level reached at this score"""
+        return score
+
+    def interval(self, level):
+        """Return the seconds per tick at a level"""
+        return max(self.minimum, self.initial * self.factor ** level)
+
+
+class TieredSchedule:
+    """Interval jumps at fixed score thresholds"""
+
+    def __init__(self, initial, minimum, tiers=SPEED_TIERS):
+        """Initialize the schedule
+
+        Args:
+            initial: Seconds per tick in the first tier
+            minimum: Seconds per tick at fraction 1.0
+            tiers: (min_score, fraction) pairs sorted by min_score, starting at 0;
+                fraction is how far the interval has moved from initial to minimum
+        """
+        self.tiers = tuple((min_score, initial - (initial - minimum) * fraction)
+                           for min_score, fraction in tiers)
+
+    def level(self, score, play_time):
+        """Return the level reached at this score"""
+        return score
+
+    def interval(self, level):
+        """Return the seconds per tick at a level"""
+        current = self.tiers[0][1]
+        for min_score, interval in self.tiers:
+            if level < min_score:
+                break
+            current = interval
+        return current
+
+
+class TimeBasedSchedule:
+    """Interval shrinks by a fixed step every period of play time"""
+
+    def __init__(self, initial, minimum, step, period=SPEED_TIME_PERIOD):
+        """Initialize with the starting and fastest intervals, the step and its period"""
+        self.initial = initial
+        self.minimum = minimum
+        self.step = step
+        self.period = period
+
+    def level(self, score, play_time):
+        """Return the number of whole periods played"""
+        return int(play_time // self.period)
+
+    def interval(self, level):
+        """Return the seconds per tick at a level"""
+        return max(self.minimum, self.initial - self.step * level)
+
+
+def create_schedule(config):
+    """Build the schedule named by a GameConfig
+
+    Raises:
+        ValueError: If the schedule name is unknown
+    """
+    name = config.speed_schedule
+    if name == SPEED_SCHEDULE_LINEAR:
+        return LinearSchedule(config.game_speed_initial, config.game_speed_min, config.game_speed_step)
+    if name == SPEED_SCHEDULE_EXPONENTIAL:
+        return ExponentialSchedule(config.game_speed_initial, config.game_speed_min)
+    if name == SPEED_SCHEDULE_TIERED:
+        return TieredSchedule(config.game_speed_initial, config.game_speed_min)
+    if name == SPEED_SCHEDULE_TIME:
+        return TimeBasedSchedule(config.game_speed_initial, config.game_speed_min, config.game_speed_step)
+    raise ValueError(f"Unknown speed schedule: {name}")
+
+
+class Difficulty:
+    """Tracks the current tick interval using a precomputed table"""
+
+    def __init__(self, schedule, levels=DIFFICULTY_TABLE_SIZE):
+        """Initialize the table
+
+        Args:
+            schedule: Schedule providing level() and interval()
+            levels: Number of levels to precompute; higher levels reuse the last entry
+        """
+        self.schedule = schedule
+        self.table = [schedule.interval(level) for level in range(levels)]
+        self.reset()
+
+    def reset(self):
+        """Return to level 0"""
+        self.level = 0
+        self.interval = self.table[0]
+
+    @property
+    def ticks_per_second(self):
+        """Return the current simulation rate"""
+        return 1.0 / self.interval
+
+    def update(self, score, play_time):
+        """Move to the level for this score and play time
+
+        Returns:
+            float: Seconds until the next tick
+        """
+        self.level = min(self.schedule.level(score, play_time), len(self.table) - 1)
+        self.interval = self.table[self.level]
+        return self.interval
@@ -0,0 +1,40 @@
+"""Integer direction codes and their lookup tables
+
+Directions are small integers so movement, reversal checks and
+serialization are plain tuple lookups. The order matches the wire
+protocol's 2-bit direction field. Names ('UP', 'RIGHT', ...) remain
+accepted wherever a direction is passed in, via to_code().
+"""
+
+UP = 0
+RIGHT = 1
+DOWN = 2
+LEFT = 3
+
+DIRECTIONS = (UP, RIGHT, DOWN, LEFT)
+DIRECTION_NAMES = ('UP', 'RIGHT', 'DOWN', 'LEFT')
+DIRECTION_CODES = {name: code for code, name in enumerate(DIRECTION_NAMES)}
+
+# Cell offsets and reversals, indexed by direction code
+DX = (0, 1, 0, -1)
+DY = (-1, 0, 1, 0)
+OPPOSITE = (DOWN, LEFT, UP, RIGHT)
+
+
+def to_code(direction):
+    """Return the code of a direction given as a code or a name
+
+    Raises:
+        ValueError: If the name is not a direction
+    """
+    if isinstance(direction, str):
+        try:
+            return DIRECTION_CODES[direction]
+        except KeyError:
+            raise ValueError(f"Unknown direction: {direction}") from None
+    return direction
+
+
+def to_name(direction):
+    """Return the name of a direction code"""
+    return DIRECTION_NAMES[direction]
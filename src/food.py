@@ -1,20 +1,45 @@
 """Food class for the game"""
 
-from src.utils import get_random_position
+import random
+from src import utils
 from src.config import BOARD_WIDTH, BOARD_HEIGHT
 
 class Food:
     """Represents the food in the game"""
     
-    def __init__(self):
-        """Initialize food at a random position"""
-        self.position = get_random_position()
+    def __init__(self, board=None, rng=None):
+        """Initialize food at a random position
+        
+        Args:
+            board (GameBoard, optional): Board whose size bounds the spawn area.
+                Defaults to None (the configured board size).
+            rng (random.Random, optional): Seeded source for spawns on a
+                board, so a game can be replayed. Defaults to the random module.
+        """
+        self.board = board
+        self.rng = rng if rng is not None else random
+        self.position = self._random_position()
+    
+    def _random_position(self):
+        """Pick a random cell on the board, never inside a maze wall
+
+        With a board, the board's shared cell tuple is returned, so comparing
+        it with the snake's head usually short-circuits on identity.
+        """
+        if self.board is None:
+            return utils.get_random_position()
+        if self.board.level is not None:
+            position = self.board.level.random_free_position(self.rng)
+        else:
+            position = utils.get_random_position(self.board.width, self.board.height, self.rng)
+        return self.board.wrap_position(position)
     
     def spawn(self, exclude_positions=None):
         """Spawn food at a new random position
         
         Args:
-            exclude_positions (list, optional): List of (x, y) tuples to avoid. 
+            exclude_positions (list, optional): List of (x, y) tuples to avoid.
+                Any container supporting ``in`` works (e.g. an occupancy grid).
                 Defaults to None.
         """
         if exclude_positions is None:
@@ -22,7 +47,7 @@ class Food:
             
         attempts = 0
         while attempts < 100:
-            new_pos = get_random_position()
+            new_pos = self._random_position()
             if new_pos not in exclude_positions:
                 self.position = new_pos
                 return
@@ -30,7 +55,7 @@ class Food:
         
         # Timeout protection: if we try more than 100 times, just use the position anyway
         # (board almost full)
-        self.position = get_random_position()
+        self.position = self._random_position()
     
     def get_position(self):
         """Return the current (x, y) position of the food"""
@@ -1,43 +1,95 @@
 """Main Game Engine"""
 
+import os
 import time
+import uuid
+import random
+from collections import deque
 import pygame
-from src.snake import Snake
-from src.food import Food
 from src.game_board import GameBoard
 from src.high_score import HighScoreManager
-from src.config import (BOARD_WIDTH, BOARD_HEIGHT, GAME_SPEED_INITIAL, GAME_SPEED_MIN,
-                        GAME_SPEED_STEP, INITIAL_SNAKE_LENGTH,
-                        GRID_SIZE, COLOR_SNAKE_HEAD, COLOR_SNAKE_BODY, COLOR_FOOD,
+from src.layout import LayoutManager
+from src.assets import AssetCache, prepare_surface
+from src.difficulty import Difficulty, create_schedule
+from src.telemetry import (create_recorder, EVENT_GAME_START, EVENT_FOOD_EATEN, EVENT_DEATH,
+                           EVENT_SESSION_END, DEATH_SELF)
+from src.settings import DEFAULT_CONFIG
+from src.config import (GRID_SIZE, COLOR_SNAKE_HEAD,
                         COLOR_BACKGROUND, COLOR_BORDER, COLOR_TEXT, COLOR_BUTTON,
                         COLOR_BUTTON_HOVER, COLOR_BUTTON_TEXT, COLOR_TITLE, COLOR_SUBTITLE,
                         COLOR_HIGHLIGHT, STATE_MENU, STATE_PLAYING, STATE_GAME_OVER,
                         STATE_PAUSED,
-                        BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_MARGIN, MIN_WINDOW_WIDTH,
-                        MIN_WINDOW_HEIGHT, PANEL_WIDTH_RATIO, PANEL_WIDTH_MIN,
-                        PANEL_WIDTH_MAX, PANEL_PADDING, BUTTON_SPACING,
+                        BUTTON_HEIGHT, MIN_WINDOW_WIDTH, MIN_WINDOW_HEIGHT, PANEL_PADDING,
                         COLOR_PANEL_BG, COLOR_PANEL_DIVIDER, COLOR_BUTTON_PRIMARY,
                         COLOR_BUTTON_PRIMARY_HOVER, COLOR_BUTTON_SECONDARY,
-                        COLOR_BUTTON_SECONDARY_HOVER)
-from src.utils import is_valid_direction
+                        COLOR_BUTTON_SECONDARY_HOVER,
+                        RENDER_BACKEND_SURFARRAY, IDLE_WAIT_TIMEOUT_MS, MAX_CATCHUP_TICKS,
+                        WARMUP_SCORE_LABELS)
+from src.direction import UP, RIGHT, DOWN, LEFT, to_code
+from src.simulation import (Replay, new_seed, create_snake, create_food, queue_direction,
+                            turn, advance, collision_cause)
+
+# Only these events reach the queue; everything else is dropped by SDL
+ALLOWED_EVENTS = [pygame.QUIT, pygame.VIDEORESIZE, pygame.KEYDOWN, pygame.MOUSEBUTTONDOWN]
+
+# Extra events needed to repaint idle screens (hover changes, uncovered window)
+IDLE_EVENTS = [pygame.MOUSEMOTION, pygame.WINDOWEXPOSED, pygame.WINDOWLEAVE]
+
+# Direction codes for the arrow keys and WASD
+KEY_DIRECTIONS = {
+    pygame.K_UP: UP, pygame.K_w: UP,
+    pygame.K_DOWN: DOWN, pygame.K_s: DOWN,
+    pygame.K_LEFT: LEFT, pygame.K_a: LEFT,
+    pygame.K_RIGHT: RIGHT, pygame.K_d: RIGHT,
+}
 
 class SnakeGame:
     """Main game class managing game state and logic"""
     
-    def __init__(self):
-        """Initialize the game with all components and initial state"""
+    def __init__(self, headless=False, config=None):
+        """Initialize the game with all components and initial state
+
+        Args:
+            headless: Render into an offscreen surface instead of opening a
+                window (uses the SDL dummy video driver)
+            config (GameConfig, optional): Runtime settings. Defaults to the
+                built-in defaults from src.config.
+        """
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.headless = headless
+        if headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
         # Initialize game board
-        self.board = GameBoard(BOARD_WIDTH, BOARD_HEIGHT)
+        self.board = GameBoard.from_config(self.config)
 
         # Initialize high score manager
-        self.high_score_manager = HighScoreManager()
+        self.high_score_manager = HighScoreManager.from_config(self.config)
+
+        # Tick intervals come from a precomputed difficulty table
+        self.difficulty = Difficulty(create_schedule(self.config))
+
+        # Session events are buffered and written by a background thread
+        self.telemetry = create_recorder(self.config.telemetry_path)
+        self.session_id = None
+
+        # Per-tick column export for offline analysis (needs numpy)
+        self.trace = None
+        if self.config.trace_path:
+            from src.trace import TraceWriter
+            self.trace = TraceWriter(self.config.trace_path)
 
         # Initialize pygame display with resizable flag
         pygame.init()
         self.window_width = MIN_WINDOW_WIDTH
         self.window_height = MIN_WINDOW_HEIGHT
-        self.window = pygame.display.set_mode((self.window_width, self.window_height), pygame.RESIZABLE)
-        pygame.display.set_caption("Snake Game")
+        self.window = self._create_window()
+        if not headless:
+            pygame.display.set_caption("Snake Game")
+
+        # Skip mouse motion, window and joystick events we never handle
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(ALLOWED_EVENTS)
 
         # Initialize fonts
         self.font_small = pygame.font.Font(None, 24)
@@ -45,8 +97,31 @@ class SnakeGame:
         self.font_large = pygame.font.Font(None, 72)
         self.font_title = pygame.font.Font(None, 96)
 
+        # Optional bot (e.g. GreedyBot) asked for a direction before every tick
+        self.autopilot = None
+
+        # Rendered text, and one-time work done while the menu is idle
+        self.assets = AssetCache()
+        self._warmup = self._warmup_steps()
+
+        # Best-score labels keyed by (template, font, colour) -> (version, surface)
+        self._best_score_surfaces = {}
+
+        # Geometry is computed once per window size
+        walls = self.board.level.wall_positions() if self.board.level is not None else ()
+        self.layout = LayoutManager(self.board.width, self.board.height,
+                                    self.font_small, self.font_medium, self.font_large, walls)
+        self.layout.update(self.window_width, self.window_height)
+        self.board_renderer = self._create_board_renderer(self.config.render_backend)
+
         # Initialize game state - start in menu for new behavior
         self.current_state = STATE_MENU
+
+        # Idle screens are only redrawn when something visible changed
+        self.needs_redraw = True
+        self._rendered_state = None
+        self._hovered_button = None
+        self._idle_events_allowed = False
         self.play_button_rect = self._get_play_button_rect()
 
         # Initialize game objects (for backward compatibility with tests)
@@ -57,32 +132,19 @@ class SnakeGame:
         self.game_over = False
         self.game_running = True
         self.is_new_high_score = False
-        self.game_speed = GAME_SPEED_INITIAL
+        self.game_speed = self.difficulty.interval
+        self.play_time = 0.0
 
         # Collision grace period to prevent immediate collision detection
         self.collision_grace_period = 3  # Allow 3 frames before collision detection
 
     def _get_layout(self, include_panel=True):
-        """Calculate layout rectangles for game and UI panels"""
-        if not include_panel:
-            game_rect = pygame.Rect(0, 0, self.window_width, self.window_height)
-            ui_rect = pygame.Rect(self.window_width, 0, 0, self.window_height)
-            return game_rect, ui_rect
-
-        panel_width = int(self.window_width * PANEL_WIDTH_RATIO)
-        panel_width = max(PANEL_WIDTH_MIN, min(PANEL_WIDTH_MAX, panel_width))
-        available_width = max(0, self.window_width - panel_width)
-        game_rect = pygame.Rect(0, 0, available_width, self.window_height)
-
-        ui_rect = pygame.Rect(game_rect.width, 0, panel_width, self.window_height)
-        return game_rect, ui_rect
+        """Return layout rectangles for game and UI panels (cached per window size)"""
+        return self.layout.get_layout(include_panel)
 
     def _get_cell_size(self):
-        """Calculate cell size dynamically based on current game area dimensions"""
-        game_rect, _ = self._get_layout()
-        cell_width = game_rect.width / BOARD_WIDTH if BOARD_WIDTH else 0
-        cell_height = game_rect.height / BOARD_HEIGHT if BOARD_HEIGHT else 0
-        return cell_width, cell_height
+        """Return the cell size for the current game area (cached per window size)"""
+        return self.layout.get_cell_size()
 
     def _handle_window_resize(self, width, height):
         """Handle window resize event
@@ -95,40 +157,49 @@ class SnakeGame:
         self.window_width = max(width, MIN_WINDOW_WIDTH)
         self.window_height = max(height, MIN_WINDOW_HEIGHT)
 
-        # Update the display surface
-        self.window = pygame.display.set_mode((self.window_width, self.window_height), pygame.RESIZABLE)
+        # Update the display surface and the cached geometry
+        self.window = self._create_window()
+        self.layout.update(self.window_width, self.window_height)
+
+    def _create_window(self):
+        """Create the display surface, or an offscreen one when headless"""
+        if self.headless:
+            return pygame.Surface((self.window_width, self.window_height))
+        return pygame.display.set_mode((self.window_width, self.window_height), pygame.RESIZABLE)
 
     def _get_play_button_rect(self):
         """Get the rectangle for the play button"""
-        game_rect, _ = self._get_layout(include_panel=False)
-        center_x = game_rect.centerx
-        center_y = game_rect.centery
-        return pygame.Rect(
-            center_x - BUTTON_WIDTH // 2,
-            center_y - BUTTON_HEIGHT // 2,
-            BUTTON_WIDTH,
-            BUTTON_HEIGHT
-        )
+        return self.layout.play_button_rect
     
     def _initialize_game_objects(self):
         """Initialize snake and food for a new game"""
-        # Initialize snake at center of board
-        center_x = BOARD_WIDTH // 2
-        center_y = BOARD_HEIGHT // 2
-        self.snake = Snake((center_x, center_y), INITIAL_SNAKE_LENGTH)
-        
-        # Set initial direction to something safe to prevent immediate collision
-        self.snake.direction = 'RIGHT'  # Safe initial direction
+        # Snake starts at the level spawn or the centre, heading right
+        self.snake = create_snake(self.board, self.config.initial_snake_length)
+
+        # Direction changes waiting for their simulation tick, and those
+        # applied so far (for the game's Replay)
+        self.input_queue = deque()
+        self.input_log = []
         
-        # Initialize food at random position (excluding snake body)
-        self.food = Food()
-        self.food.spawn(exclude_positions=self.snake.get_body())
+        # Food spawns come from a per-game seed, so the game can be replayed
+        self.seed = new_seed()
+        self.food = create_food(self.board, self.snake, random.Random(self.seed))
         
         # Initialize game state variables
         self.score = 0
         self.game_over = False
         self.is_new_high_score = False
-        self.game_speed = GAME_SPEED_INITIAL
+        self.difficulty.reset()
+        self.game_speed = self.difficulty.interval
+        self.play_time = 0.0
+        self.tick = 0
+
+        # Per-session telemetry counters
+        self.food_spawn_tick = 0
+        self.food_spawn_time = 0.0
+        self.frame_count = 0
+        self.frame_time_total = 0.0
+        self.frame_time_max = 0.0
         
         # Reset collision grace period for new game
         self.collision_grace_period = 3
@@ -138,30 +209,92 @@ class SnakeGame:
 
         Structure:
             - Loop while game is running
-            - Handle user input
-            - Update game state (only if playing)
-            - Render the game (different screens for different states)
-            - Control game speed with sleep
+            - Handle user input (block on the event queue when idle)
+            - Run every simulation tick that is due (only if playing)
+            - Render the game (at most frame_rate_cap times per second,
+              idle screens only when something changed)
+            - Sleep until the next tick or frame is due
+
+        Tick deadlines advance by the current interval rather than by the
+        time a frame took, so the tick rate stays exact at high speeds.
         """
+        frame_interval = 1.0 / self.config.frame_rate_cap
+        next_tick = time.perf_counter()
+        last_frame = 0.0
+
         while self.game_running:
             # Handle user input
-            self.handle_input()
-
-            # Update game state (only if playing)
             if self.current_state == STATE_PLAYING:
+                self._set_idle_events(False)
+                self.handle_input()
+            else:
+                # Menu, pause and game over screens sleep until input arrives,
+                # unless there is warmup work left to do in the meantime
+                self._set_idle_events(True)
+                if self._warmup is not None:
+                    self._wait_for_events(timeout_ms=0)
+                    self._run_warmup_step()
+                else:
+                    self._wait_for_events()
+                # Resume without a burst of catch-up ticks
+                next_tick = time.perf_counter()
+
+            # Run the ticks that are due (only if playing)
+            now = time.perf_counter()
+            ticks = 0
+            while self.current_state == STATE_PLAYING and now >= next_tick:
                 self.update()
+                next_tick += self.game_speed
+                ticks += 1
+                if ticks >= MAX_CATCHUP_TICKS:
+                    # Too far behind (e.g. the window was dragged): drop the backlog
+                    next_tick = max(next_tick, now)
+                    break
 
             # Render the game
-            self.render()
+            if self._needs_render():
+                if self.current_state != STATE_PLAYING or now - last_frame >= frame_interval:
+                    self.render()
+                    last_frame = now
 
-            # Control game speed (only if playing)
+            # Sleep until the next tick, or the next frame if one is pending
             if self.current_state == STATE_PLAYING:
-                time.sleep(self.game_speed)
-            else:
-                # Small delay for menu and game over screens to reduce CPU usage
-                time.sleep(0.016)  # ~60 FPS for UI screens
-
+                wake_at = next_tick
+                if self._needs_render():
+                    wake_at = min(wake_at, last_frame + frame_interval)
+                delay = wake_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+        if self.telemetry is not None:
+            self._finish_session("quit")
+            self.telemetry.close()
+        if self.trace is not None:
+            self.trace.close()
         pygame.quit()
+
+    def _needs_render(self):
+        """Return True if the next frame would differ from the last one"""
+        return self.needs_redraw or self.current_state != self._rendered_state
+
+    def _set_idle_events(self, idle):
+        """Let hover and expose events through only while a screen is idle"""
+        if idle == self._idle_events_allowed:
+            return
+        if idle:
+            pygame.event.set_allowed(IDLE_EVENTS)
+        else:
+            pygame.event.set_blocked(IDLE_EVENTS)
+        self._idle_events_allowed = idle
+
+    def _wait_for_events(self, timeout_ms=IDLE_WAIT_TIMEOUT_MS):
+        """Block until an event arrives (or the timeout passes) and handle it
+
+        A timeout of 0 only handles events that are already queued.
+        """
+        event = pygame.event.wait(timeout_ms) if timeout_ms > 0 else pygame.event.poll()
+        if event.type != pygame.NOEVENT:
+            self._process_events([event] + pygame.event.get())
     
     def update(self):
         """Update game state each frame
@@ -172,25 +305,38 @@ class SnakeGame:
             - Check wall collision (game over)
             - Check self collision (game over)
         """
-        # Move the snake in current direction
-        self.snake.move(self.snake.direction)
-        
-        # Check if snake ate the food
-        if self.snake.get_head_position() == self.food.get_position():
-            # Snake ate food - grow and increase score
-            self.snake.grow()
-            self.score += 1
-            self.game_speed = max(GAME_SPEED_MIN, self.game_speed - GAME_SPEED_STEP)
-            # Respawn food at new position (excluding snake body)
-            self.food.spawn(exclude_positions=self.snake.get_body())
-
-        head_position = self.snake.get_head_position()
-        if not self.board.is_within_bounds(head_position):
-            self.snake.body[0] = self.board.wrap_position(head_position)
+        self.tick += 1
+
+        if self.autopilot is not None:
+            self._queue_direction(self.autopilot.choose_direction(self))
+
+        # Apply at most one buffered direction change per tick
+        if self.input_queue:
+            new_dir = self.input_queue.popleft()
+            if turn(self.snake, new_dir):
+                self.input_log.append((self.tick, new_dir))
+
+        # Move the snake (wrapping at the edges); eating grows it, scores
+        # and respawns the food away from the body
+        ate = advance(self)
+        if ate:
+            if self.telemetry is not None:
+                self._record_food_eaten()
+            self.food_spawn_tick = self.tick
+            self.food_spawn_time = self.play_time
+
+        if self.trace is not None:
+            self.trace.record_game(self, ate)
+
+        # Advance play time and look up the interval for the next tick
+        self.play_time += self.game_speed
+        self.game_speed = self.difficulty.update(self.score, self.play_time)
+        self.needs_redraw = True
 
         # Check for collisions using the proper logic
-        if self._check_collisions():
-            self._end_game()
+        cause = self._collision_cause()
+        if cause is not None:
+            self._end_game(cause)
     
     def _check_collisions(self):
         """Check for all collision types that end the game
@@ -199,21 +345,22 @@ class SnakeGame:
             bool: True if any collision detected (game over), False otherwise
             
         Checks:
-            - Wall collision (snake head hits board boundary)
+            - Wall collision (snake head hits a maze wall)
             - Self collision (snake head hits its own body, using previous state)
         
         Note: Food collision is handled separately in update() as it doesn't end the game
         """
-        # Check self collision using the current body state (excluding head)
-        # This prevents false collision when snake moves into the space vacated by its tail
-        head_position = self.snake.get_head_position()
-        body_without_head = self.snake.get_body()[1:]
-        if head_position in body_without_head:
-            return True
-        
-        return False
+        return self._collision_cause() is not None
+
+    def _collision_cause(self):
+        """Return why the snake died this tick, or None if it is still alive"""
+        return collision_cause(self.board, self.snake)
     
-    def _end_game(self):
+    def get_replay(self):
+        """Return the current game's Replay, for verified leaderboards"""
+        return Replay(self.seed, list(self.input_log), self.score, self.tick)
+
+    def _end_game(self, cause=DEATH_SELF):
         """End the current game and update high scores"""
         self.game_over = True
         self.current_state = STATE_GAME_OVER
@@ -221,13 +368,66 @@ class SnakeGame:
         # Update high scores
         self.is_new_high_score = self.high_score_manager.update_score(self.score)
         self.high_score_manager.update_last_game_score(self.score)
+
+        if self.telemetry is not None:
+            self.telemetry.record(EVENT_DEATH, session=self.session_id, tick=self.tick,
+                                  cause=cause, score=self.score, length=len(self.snake.body))
+            self._finish_session("death")
+
+    def _record_food_eaten(self):
+        """Queue a food_eaten event with the time taken to reach the food"""
+        # The food has already respawned; the head is where it was eaten
+        x, y = self.snake.get_head_position()
+        self.telemetry.record(
+            EVENT_FOOD_EATEN,
+            session=self.session_id,
+            tick=self.tick,
+            position=[x, y],
+            latency_ticks=self.tick - self.food_spawn_tick,
+            latency_s=round(self.play_time - self.food_spawn_time, 4),
+            score=self.score,
+        )
+
+    def _finish_session(self, outcome):
+        """Queue the frame statistics of the running session, if any"""
+        if self.session_id is None:
+            return
+        frames = self.frame_count
+        self.telemetry.record(
+            EVENT_SESSION_END,
+            session=self.session_id,
+            outcome=outcome,
+            ticks=self.tick,
+            play_time=round(self.play_time, 3),
+            frames=frames,
+            frame_ms_avg=round(self.frame_time_total / frames * 1000, 3) if frames else 0.0,
+            frame_ms_max=round(self.frame_time_max * 1000, 3),
+        )
+        self.session_id = None
     
     def render(self):
         """Render the game to display based on current state"""
+        started = time.perf_counter()
+
         # Clear screen
         self.window.fill(COLOR_BACKGROUND)
+        self._render_screen()
 
-        # Render based on current state
+        # Update display
+        if not self.headless:
+            pygame.display.flip()
+        self.needs_redraw = False
+        self._rendered_state = self.current_state
+
+        if self.session_id is not None and self.current_state == STATE_PLAYING:
+            frame_time = time.perf_counter() - started
+            self.frame_count += 1
+            self.frame_time_total += frame_time
+            if frame_time > self.frame_time_max:
+                self.frame_time_max = frame_time
+
+    def _render_screen(self):
+        """Draw the screen for the current state into self.window"""
         if self.current_state == STATE_MENU:
             self._render_menu()
         elif self.current_state == STATE_PLAYING:
@@ -237,23 +437,83 @@ class SnakeGame:
         elif self.current_state == STATE_GAME_OVER:
             self._render_game_over()
 
-        # Update display
-        pygame.display.flip()
+    def _warmup_steps(self):
+        """Do one-time rendering work in small steps, yielding between them
+
+        Every screen is drawn once into a scratch surface so the text cache,
+        sprite blits and board renderer are all exercised before the first
+        real frame, then the most likely score and speed labels are rendered.
+        """
+        scratch = self.window.copy()
+        for state in (STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER, STATE_MENU):
+            self._render_offscreen(scratch, state)
+            yield
+
+        for score in range(WARMUP_SCORE_LABELS):
+            self.assets.text(self.font_medium, f"Score: {score}", COLOR_TEXT)
+            self.assets.text(self.font_medium, f"Your Score: {score}", COLOR_TEXT)
+        yield
+
+        for interval in self.difficulty.table[:WARMUP_SCORE_LABELS]:
+            self.assets.text(self.font_small, self._speed_label(1.0 / interval), COLOR_TEXT)
+        yield
+
+    def _render_offscreen(self, surface, state):
+        """Draw the screen for state into surface without touching the display"""
+        window, current_state = self.window, self.current_state
+        self.window, self.current_state = surface, state
+        try:
+            surface.fill(COLOR_BACKGROUND)
+            self._render_screen()
+        finally:
+            self.window, self.current_state = window, current_state
+
+    def _run_warmup_step(self):
+        """Run the next warmup step, if any are left"""
+        if self._warmup is None:
+            return
+        try:
+            next(self._warmup)
+        except StopIteration:
+            self._warmup = None
+
+    def _finish_warmup(self):
+        """Run all remaining warmup steps"""
+        while self._warmup is not None:
+            self._run_warmup_step()
     
+    def _best_score_text(self, template, font, color):
+        """Return the rendered best-score label, re-rendered only when the score changes
+
+        Args:
+            template: Label format string with one {} for the score
+            font: Font to render with
+            color: Text colour
+        """
+        manager = self.high_score_manager
+        version = manager.get_version()
+        key = (template, id(font), color)
+        cached = self._best_score_surfaces.get(key)
+        if cached is None or cached[0] != version:
+            surface = prepare_surface(font.render(template.format(manager.get_high_score()), True, color))
+            cached = (version, surface)
+            self._best_score_surfaces[key] = cached
+        return cached[1]
+
     def _render_menu(self):
         """Render the main menu screen"""
         game_rect, _ = self._get_layout(include_panel=False)
         # Draw title
-        title_text = self.font_title.render("SNAKE GAME", True, COLOR_TITLE)
+        title_text = self.assets.text(self.font_title, "SNAKE GAME", COLOR_TITLE)
         title_rect = title_text.get_rect(
             center=(game_rect.centerx, game_rect.top + int(game_rect.height * 0.22))
         )
         self.window.blit(title_text, title_rect)
         
         # Draw subtitle (instructions) - moved to center area
-        subtitle_text = self.font_small.render(
+        subtitle_text = self.assets.text(
+            self.font_small,
             "Use Arrow Keys/WASD to move, P to pause, Q/ESC to quit",
-            True,
             COLOR_SUBTITLE
         )
         subtitle_rect = subtitle_text.get_rect(
@@ -269,20 +529,19 @@ class SnakeGame:
         pygame.draw.rect(self.window, COLOR_BORDER, self.play_button_rect, 2)
         
         # Draw button text
-        button_text = self.font_medium.render("PLAY", True, COLOR_BUTTON_TEXT)
+        button_text = self.assets.text(self.font_medium, "PLAY", COLOR_BUTTON_TEXT)
         button_text_rect = button_text.get_rect(center=self.play_button_rect.center)
         self.window.blit(button_text, button_text_rect)
         
         # Draw high score - moved to bottom area
-        high_score = self.high_score_manager.get_high_score()
-        high_score_text = self.font_medium.render(f"Best Score: {high_score}", True, COLOR_TEXT)
+        high_score_text = self._best_score_text("Best Score: {}", self.font_medium, COLOR_TEXT)
         high_score_rect = high_score_text.get_rect(center=(game_rect.centerx, game_rect.bottom - 80))
         self.window.blit(high_score_text, high_score_rect)
         
         # Draw instructions
-        instruction_text = self.font_small.render(
+        instruction_text = self.assets.text(
+            self.font_small,
             "Click PLAY or press ENTER to start",
-            True,
             COLOR_SUBTITLE
         )
         instruction_rect = instruction_text.get_rect(
@@ -290,6 +549,20 @@ class SnakeGame:
         )
         self.window.blit(instruction_text, instruction_rect)
     
+    def _create_board_renderer(self, backend):
+        """Return a surfarray board renderer, or None for the sprite path
+
+        Falls back to the sprite path when NumPy is not installed.
+        """
+        if backend != RENDER_BACKEND_SURFARRAY:
+            return None
+        try:
+            from src.surfarray_renderer import SurfarrayBoardRenderer
+        except ImportError:
+            return None
+        walls = self.board.level.wall_positions() if self.board.level is not None else ()
+        return SurfarrayBoardRenderer(self.board.width, self.board.height, walls)
+
     def _render_game(self):
         """Render the active game screen"""
         game_rect, ui_rect = self._get_layout()
@@ -303,68 +576,69 @@ class SnakeGame:
             1
         )
 
-        # Get dynamic cell size
-        cell_width, cell_height = self._get_cell_size()
-
-        # Draw food as red circle
-        food_x, food_y = self.food.get_position()
-        pygame.draw.circle(self.window, COLOR_FOOD,
-                          (game_rect.x + food_x * cell_width + cell_width / 2,
-                           game_rect.y + food_y * cell_height + cell_height / 2),
-                          min(cell_width, cell_height) / 2 - 2)
-
-        # Draw snake body (lighter green)
-        snake_body = self.snake.get_body()
-        for i, segment in enumerate(snake_body):
-            x, y = segment
-            if i == 0:
-                # Head (bright green)
-                pygame.draw.circle(self.window, COLOR_SNAKE_HEAD,
-                                  (game_rect.x + x * cell_width + cell_width / 2,
-                                   game_rect.y + y * cell_height + cell_height / 2),
-                                  min(cell_width, cell_height) / 2 - 2)
-            else:
-                # Body (lighter green)
-                pygame.draw.circle(self.window, COLOR_SNAKE_BODY,
-                                  (game_rect.x + x * cell_width + cell_width / 2,
-                                   game_rect.y + y * cell_height + cell_height / 2),
-                                  min(cell_width, cell_height) / 2 - 2)
+        if self.board_renderer is not None:
+            self.board_renderer.draw(self.window, game_rect, self.snake, self.food.get_position())
+            pygame.draw.rect(self.window, COLOR_BORDER, game_rect, 2)
+        else:
+            self._draw_board_sprites()
 
         self._render_ui_panel(ui_rect)
 
+    def _draw_board_sprites(self):
+        """Blit food and snake sprites from the cached cell tables"""
+        # Cell rects and sprites come from the per-resize lookup tables
+        cell_rects = self.layout.cell_rects
+        sprites = self.layout.sprites
+        board_width = self.layout.board_width
+
+        # Maze walls are static, so their draw list is rebuilt only on resize
+        if self.layout.wall_draw_list:
+            self.window.blits(self.layout.wall_draw_list, doreturn=False)
+
+        # Food first, then the snake: the head is the first body segment
+        food = self.food.get_position()
+        body_sprite = sprites['body']
+        draw_list = []
+        if food is not None:
+            draw_list.append((sprites['food'], cell_rects[food[1] * board_width + food[0]]))
+        head = len(draw_list)
+        draw_list.extend([(body_sprite, cell_rects[y * board_width + x])
+                          for x, y in self.snake.get_body()])
+        if len(draw_list) > head:
+            draw_list[head] = (sprites['head'], draw_list[head][1])
+        self.window.blits(draw_list, doreturn=False)
+
+    def _ticks_per_second(self):
+        """Return the current tick rate for the panel"""
+        return self.difficulty.ticks_per_second
+
+    def _speed_label(self, ticks_per_second):
+        """Format the panel's speed line"""
+        return f"Speed: {ticks_per_second:.1f} moves/s"
+
     def _render_ui_panel(self, ui_rect):
         """Render score and controls inside the UI panel"""
-        score_text = self.font_medium.render(f"Score: {self.score}", True, COLOR_TEXT)
+        score_text = self.assets.text(self.font_medium, f"Score: {self.score}", COLOR_TEXT)
         score_rect = score_text.get_rect(topleft=(ui_rect.x + PANEL_PADDING, ui_rect.y + PANEL_PADDING))
         self.window.blit(score_text, score_rect)
 
-        high_score = self.high_score_manager.get_high_score()
-        high_score_text = self.font_small.render(f"Best: {high_score}", True, COLOR_TEXT)
+        high_score_text = self._best_score_text("Best: {}", self.font_small, COLOR_TEXT)
         high_score_rect = high_score_text.get_rect(topleft=(ui_rect.x + PANEL_PADDING, ui_rect.y + 64))
         self.window.blit(high_score_text, high_score_rect)
 
-        speed_text = self.font_small.render(f"Speed: {self.game_speed:.3f}s", True, COLOR_TEXT)
+        speed_text = self.assets.text(
+            self.font_small,
+            self._speed_label(self._ticks_per_second()),
+            COLOR_TEXT
+        )
         speed_rect = speed_text.get_rect(topleft=(ui_rect.x + PANEL_PADDING, ui_rect.y + 92))
         self.window.blit(speed_text, speed_rect)
 
-        button_y = speed_rect.bottom + 32
-        button_width = max(0, min(ui_rect.width - PANEL_PADDING * 2, 220))
-        button_x = ui_rect.x + (ui_rect.width - button_width) // 2
-
         pause_label = "RESUME" if self.current_state == STATE_PAUSED else "PAUSE"
-        pause_rect = pygame.Rect(button_x, button_y, button_width, BUTTON_HEIGHT)
-        restart_rect = pygame.Rect(
-            button_x,
-            button_y + BUTTON_HEIGHT + BUTTON_SPACING,
-            button_width,
-            BUTTON_HEIGHT
-        )
-        menu_rect = pygame.Rect(
-            button_x,
-            button_y + 2 * (BUTTON_HEIGHT + BUTTON_SPACING),
-            button_width,
-            BUTTON_HEIGHT
-        )
+        buttons = self.layout.panel_buttons
+        pause_rect = buttons['pause']
+        restart_rect = buttons['restart']
+        menu_rect = buttons['menu']
 
         mouse_pos = pygame.mouse.get_pos()
         button_specs = [
@@ -376,59 +650,38 @@ class SnakeGame:
             draw_color = hover_color if rect.collidepoint(mouse_pos) else color
             pygame.draw.rect(self.window, draw_color, rect)
             pygame.draw.rect(self.window, COLOR_BORDER, rect, 2)
-            text = self.font_medium.render(label, True, COLOR_BUTTON_TEXT)
+            text = self.assets.text(self.font_medium, label, COLOR_BUTTON_TEXT)
             text_rect = text.get_rect(center=rect.center)
             self.window.blit(text, text_rect)
-
-        self._current_button_rects = {
-            'pause': pause_rect,
-            'restart': restart_rect,
-            'menu': menu_rect
-        }
     
     def _render_game_over(self):
         """Render game over screen with final score and high score"""
         game_rect, _ = self._get_layout(include_panel=False)
         # Render "Game Over" text
-        game_over_text = self.font_large.render("GAME OVER", True, COLOR_SNAKE_HEAD)
+        game_over_text = self.assets.text(self.font_large, "GAME OVER", COLOR_SNAKE_HEAD)
         game_over_rect = game_over_text.get_rect(
-            center=(game_rect.centerx, game_rect.top + int(game_rect.height * 0.28))
+            center=(game_rect.centerx, self.layout.game_over_title_y)
         )
         self.window.blit(game_over_text, game_over_rect)
 
         # Render final score
-        score_text = self.font_medium.render(f"Your Score: {self.score}", True, COLOR_TEXT)
+        score_text = self.assets.text(self.font_medium, f"Your Score: {self.score}", COLOR_TEXT)
         score_rect = score_text.get_rect(center=(game_rect.centerx, game_over_rect.bottom + 52))
         self.window.blit(score_text, score_rect)
 
         # Render high score (highlight if it was beaten)
-        high_score = self.high_score_manager.get_high_score()
         if self.is_new_high_score:
-            high_score_text = self.font_medium.render(f"NEW BEST SCORE! {high_score}", True, COLOR_HIGHLIGHT)
+            high_score_text = self._best_score_text("NEW BEST SCORE! {}", self.font_medium, COLOR_HIGHLIGHT)
         else:
-            high_score_text = self.font_medium.render(f"Best Score: {high_score}", True, COLOR_TEXT)
+            high_score_text = self._best_score_text("Best Score: {}", self.font_medium, COLOR_TEXT)
         
         high_score_rect = high_score_text.get_rect(center=(game_rect.centerx, score_rect.bottom + 32))
         self.window.blit(high_score_text, high_score_rect)
 
-        # Render buttons
-        button_y = high_score_rect.bottom + 48
-        
-        # Play Again button
-        play_again_rect = pygame.Rect(
-            game_rect.centerx - BUTTON_WIDTH - BUTTON_MARGIN // 2,
-            button_y,
-            BUTTON_WIDTH,
-            BUTTON_HEIGHT
-        )
-        
-        # Menu button
-        menu_rect = pygame.Rect(
-            game_rect.centerx + BUTTON_MARGIN // 2,
-            button_y,
-            BUTTON_WIDTH,
-            BUTTON_HEIGHT
-        )
+        # Render buttons (positions cached by the layout manager)
+        play_again_rect = self.layout.game_over_buttons['play_again']
+        menu_rect = self.layout.game_over_buttons['menu']
+        button_y = play_again_rect.y
         
         # Draw buttons with hover effect
         mouse_pos = pygame.mouse.get_pos()
@@ -450,47 +703,60 @@ class SnakeGame:
         pygame.draw.rect(self.window, COLOR_BORDER, menu_rect, 2)
         
         # Draw button text
-        play_again_text = self.font_medium.render("PLAY AGAIN", True, COLOR_BUTTON_TEXT)
+        play_again_text = self.assets.text(self.font_medium, "PLAY AGAIN", COLOR_BUTTON_TEXT)
         play_again_text_rect = play_again_text.get_rect(center=play_again_rect.center)
         self.window.blit(play_again_text, play_again_text_rect)
         
-        menu_text = self.font_medium.render("MENU", True, COLOR_BUTTON_TEXT)
+        menu_text = self.assets.text(self.font_medium, "MENU", COLOR_BUTTON_TEXT)
         menu_text_rect = menu_text.get_rect(center=menu_rect.center)
         self.window.blit(menu_text, menu_text_rect)
 
         # Render instructions
-        instruction_text = self.font_small.render(
+        instruction_text = self.assets.text(
+            self.font_small,
             "SPACE=Play Again, M=Menu, Q/ESC=Quit",
-            True,
             COLOR_SUBTITLE
         )
         instruction_rect = instruction_text.get_rect(center=(game_rect.centerx, button_y + BUTTON_HEIGHT + 40))
         self.window.blit(instruction_text, instruction_rect)
-        
-        # Store button rects for click detection
-        self._current_button_rects = {'play_again': play_again_rect, 'menu': menu_rect}
 
     def _render_paused(self):
         """Render paused state overlay"""
         self._render_game()
 
         game_rect, _ = self._get_layout()
-        overlay_text = self.font_large.render("PAUSED", True, COLOR_HIGHLIGHT)
+        overlay_text = self.assets.text(self.font_large, "PAUSED", COLOR_HIGHLIGHT)
         overlay_rect = overlay_text.get_rect(center=(game_rect.centerx, game_rect.centery - 40))
         self.window.blit(overlay_text, overlay_rect)
 
-        instruction_text = self.font_small.render("P/ENTER=Resume, R=Restart, Q/ESC=Quit", True, COLOR_SUBTITLE)
+        instruction_text = self.assets.text(self.font_small, "P/ENTER=Resume, R=Restart, Q/ESC=Quit", COLOR_SUBTITLE)
         instruction_rect = instruction_text.get_rect(center=(game_rect.centerx, game_rect.centery + 40))
         self.window.blit(instruction_text, instruction_rect)
     
     def handle_input(self):
         """Handle user keyboard input and mouse clicks based on current state"""
         # Get pygame events
-        for event in pygame.event.get():
+        self._process_events(pygame.event.get())
+
+    def _process_events(self, events):
+        """Dispatch a batch of events and flag idle screens for redrawing"""
+        for event in events:
             if event.type == pygame.QUIT:
                 self.game_running = False
                 return
 
+            if event.type == pygame.MOUSEMOTION:
+                # Only a change of hovered button alters an idle screen
+                hovered = self._button_at(event.pos)
+                if hovered != self._hovered_button:
+                    self._hovered_button = hovered
+                    self.needs_redraw = True
+                continue
+
+            self.needs_redraw = True
+            if event.type == pygame.WINDOWLEAVE:
+                self._hovered_button = None
+
             if event.type == pygame.VIDEORESIZE:
                 self._handle_window_resize(event.w, event.h)
                 # Update button positions after resize
@@ -500,6 +766,19 @@ class SnakeGame:
                 self._handle_keyboard_input(event)
             elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:  # Left click
                 self._handle_mouse_click(event.pos)
+
+    def _button_at(self, pos):
+        """Return the name of the button under pos on the current screen"""
+        if self.current_state == STATE_MENU:
+            buttons = {'play': self.play_button_rect}
+        elif self.current_state == STATE_GAME_OVER:
+            buttons = self.layout.game_over_buttons
+        else:
+            buttons = self.layout.panel_buttons
+        for name, rect in buttons.items():
+            if rect.collidepoint(pos):
+                return name
+        return None
     
     def _handle_keyboard_input(self, event):
         """Handle keyboard input based on current state"""
@@ -510,18 +789,10 @@ class SnakeGame:
                 self.game_running = False
                 
         elif self.current_state == STATE_PLAYING:
-            current_dir = self.snake.direction
-            new_dir = None
-            
             # Handle direction controls (Arrow keys or WASD)
-            if event.key == pygame.K_UP or event.key == pygame.K_w:
-                new_dir = 'UP'
-            elif event.key == pygame.K_DOWN or event.key == pygame.K_s:
-                new_dir = 'DOWN'
-            elif event.key == pygame.K_LEFT or event.key == pygame.K_a:
-                new_dir = 'LEFT'
-            elif event.key == pygame.K_RIGHT or event.key == pygame.K_d:
-                new_dir = 'RIGHT'
+            new_dir = KEY_DIRECTIONS.get(event.key)
+            if new_dir is not None:
+                self._queue_direction(new_dir)
             
             # Handle quit controls
             elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
@@ -532,11 +803,6 @@ class SnakeGame:
                 return
             elif event.key == pygame.K_r:
                 self._start_game()
-                return
-            
-            # Update direction if new direction is valid
-            if new_dir is not None and is_valid_direction(current_dir, new_dir):
-                self.snake.direction = new_dir
                 
         elif self.current_state == STATE_GAME_OVER:
             if event.key == pygame.K_SPACE:
@@ -553,6 +819,18 @@ class SnakeGame:
             elif event.key == pygame.K_q or event.key == pygame.K_ESCAPE:
                 self.game_running = False
     
+    def _queue_direction(self, new_dir):
+        """Buffer a direction change for an upcoming tick
+
+        Each request is validated against the direction the snake will have
+        once everything already queued has been applied, so UP then LEFT
+        pressed within one tick become two consecutive turns.
+
+        Args:
+            new_dir: Direction code, or name for compatibility
+        """
+        queue_direction(self.input_queue, self.snake.heading, to_code(new_dir))
+
     def _handle_mouse_click(self, pos):
         """Handle mouse clicks for button interaction"""
         if self.current_state == STATE_MENU:
@@ -560,28 +838,46 @@ class SnakeGame:
                 self._start_game()
                 
         elif self.current_state == STATE_GAME_OVER:
-            if hasattr(self, '_current_button_rects'):
-                if self._current_button_rects['play_again'].collidepoint(pos):
-                    self._start_game()
-                elif self._current_button_rects['menu'].collidepoint(pos):
-                    self._go_to_menu()
+            buttons = self.layout.game_over_buttons
+            if buttons['play_again'].collidepoint(pos):
+                self._start_game()
+            elif buttons['menu'].collidepoint(pos):
+                self._go_to_menu()
         elif self.current_state in {STATE_PLAYING, STATE_PAUSED}:
-            if hasattr(self, '_current_button_rects'):
-                if self._current_button_rects['pause'].collidepoint(pos):
-                    self.current_state = STATE_PLAYING if self.current_state == STATE_PAUSED else STATE_PAUSED
-                elif self._current_button_rects['restart'].collidepoint(pos):
-                    self._start_game()
-                elif self._current_button_rects['menu'].collidepoint(pos):
-                    self._go_to_menu()
+            buttons = self.layout.panel_buttons
+            if buttons['pause'].collidepoint(pos):
+                self.current_state = STATE_PLAYING if self.current_state == STATE_PAUSED else STATE_PAUSED
+            elif buttons['restart'].collidepoint(pos):
+                self._start_game()
+            elif buttons['menu'].collidepoint(pos):
+                self._go_to_menu()
     
     def _start_game(self):
         """Start a new game"""
+        # Anything not warmed up yet is done now, before the first frame
+        self._finish_warmup()
+        if self.telemetry is not None:
+            self._finish_session("restart")
         self._initialize_game_objects()
         self.current_state = STATE_PLAYING
         self.game_running = True  # Ensure game_running is True for new game
+        if self.trace is not None:
+            self.trace.start_game()
+
+        if self.telemetry is not None:
+            self.session_id = uuid.uuid4().hex
+            self.telemetry.record(
+                EVENT_GAME_START,
+                session=self.session_id,
+                board=[self.board.width, self.board.height],
+                schedule=self.config.speed_schedule,
+                render_backend=self.config.render_backend,
+            )
     
     def _go_to_menu(self):
         """Return to the main menu"""
+        if self.telemetry is not None:
+            self._finish_session("menu")
         self.current_state = STATE_MENU
         self.game_running = True  # Ensure game_running is True when going to menu
     
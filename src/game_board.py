@@ -1,25 +1,83 @@
 """GameBoard class for managing the game arena"""
 
 from src.config import BOARD_WIDTH, BOARD_HEIGHT
+from src.level import find_level, load_level
+from src.direction import DIRECTIONS, DX, DY
 
 class GameBoard:
     """Represents the game board/arena"""
     
-    def __init__(self, width=BOARD_WIDTH, height=BOARD_HEIGHT):
-        """Initialize the game board"""
+    def __init__(self, width=BOARD_WIDTH, height=BOARD_HEIGHT, level=None):
+        """Initialize the game board
+
+        Args:
+            width: Board width in cells
+            height: Board height in cells
+            level (Level, optional): Maze whose walls block the snake
+        """
         self.width = width
         self.height = height
+        self.level = level
+
+        # Shared (x, y) tuples, interned on first use so positions handed out
+        # by the board are never reallocated
+        self._cells = {}
+        # cell -> the four wrapped cells reached from it, indexed by direction
+        # code; filled in by steps() as cells are first visited
+        self.neighbours = {}
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a board sized by a GameConfig, or by its level if one is set"""
+        if config.level:
+            level = load_level(find_level(config.level),
+                               snake_length=config.initial_snake_length)
+            return cls(level.width, level.height, level)
+        return cls(config.board_width, config.board_height)
     
     def is_within_bounds(self, position):
         """Check if a position is within board boundaries"""
         x, y = position
         return 0 <= x < self.width and 0 <= y < self.height
     
+    def is_wall(self, position):
+        """Check if a position is a maze wall"""
+        return self.level is not None and self.level.is_wall(position)
+
     def check_wall_collision(self, position):
         """Check if a position collides with board walls"""
-        return not self.is_within_bounds(position)
+        return not self.is_within_bounds(position) or self.is_wall(position)
 
     def wrap_position(self, position):
-        """Wrap a position to the opposite side when it exits the board"""
+        """Wrap a position to the opposite side when it exits the board
+
+        Returns:
+            tuple: The board's shared (x, y) tuple for the wrapped cell
+        """
+        x, y = position
+        cell = (x % self.width, y % self.height)
+        return self._cells.setdefault(cell, cell)
+
+    def steps(self, position):
+        """Return the wrapped cells one step from a board cell
+
+        Args:
+            position: (x, y) cell on the board
+
+        Returns:
+            tuple: The four neighbouring cells indexed by direction code,
+                or None if position is off the board
+        """
+        steps = self.neighbours.get(position)
+        if steps is None:
+            if not self.is_within_bounds(position):
+                return None
+            x, y = position
+            steps = self.neighbours[position] = tuple(
+                self.wrap_position((x + DX[code], y + DY[code])) for code in DIRECTIONS)
+        return steps
+
+    def neighbour(self, position, direction):
+        """Return the wrapped cell one step from position in a direction code"""
         x, y = position
-        return (x % self.width, y % self.height)
+        return self.wrap_position((x + DX[direction], y + DY[direction]))
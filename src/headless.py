@@ -0,0 +1,228 @@
+"""Offscreen rendering for thumbnails and video export
+
+Frames are drawn by SnakeGame._render_game into one preallocated
+offscreen surface per process, so no window is ever opened and the
+output matches what players see. A frame is a (body, food, score)
+tuple, with food None when the board has none; recordings made of
+protocol messages can be turned into frames with frames_from_recording().
+"""
+
+import os
+import argparse
+import dataclasses
+import subprocess
+import multiprocessing
+import pygame
+from src.config import (MIN_WINDOW_WIDTH, MIN_WINDOW_HEIGHT, BOARD_WIDTH, BOARD_HEIGHT,
+                        STATE_PLAYING, COLOR_BACKGROUND)
+from src.settings import DEFAULT_CONFIG
+from src.protocol import MSG_SNAPSHOT, MirrorState, decode, message_type, read_recording
+
+# Renderer owned by each pool worker process
+_worker_renderer = None
+
+# SDL state does not survive fork(), so workers always start fresh
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+
+class HeadlessRenderer:
+    """Draws game frames into a reusable offscreen surface"""
+
+    def __init__(self, width=MIN_WINDOW_WIDTH, height=MIN_WINDOW_HEIGHT,
+                 board_size=(BOARD_WIDTH, BOARD_HEIGHT)):
+        """Initialize a headless game sized to the output resolution
+
+        Args:
+            width: Output width in pixels
+            height: Output height in pixels
+            board_size: (width, height) of the recorded board in cells
+        """
+        # Imported here so SDL_VIDEODRIVER is set before pygame starts
+        from src.game import SnakeGame
+        board_width, board_height = board_size
+        config = dataclasses.replace(DEFAULT_CONFIG, board_width=board_width,
+                                     board_height=board_height)
+        self.game = SnakeGame(headless=True, config=config)
+        # Offscreen output is not bound by the window's minimum size
+        self.game.window_width = width
+        self.game.window_height = height
+        self.game.window = self.game._create_window()
+        self.game.layout.update(width, height)
+        self.game.current_state = STATE_PLAYING
+        self.surface = self.game.window
+
+    @property
+    def size(self):
+        """Return the output resolution"""
+        return self.surface.get_size()
+
+    def render(self, frame):
+        """Draw a frame and return the shared surface
+
+        Args:
+            frame: (body, food, score) tuple; food may be None
+
+        Returns:
+            pygame.Surface: The renderer's surface, overwritten on each call
+        """
+        body, food, score = frame
+        game = self.game
+        game.snake.body = list(body)
+        game.food.position = tuple(food) if food is not None else None
+        game.score = score
+        self.surface.fill(COLOR_BACKGROUND)
+        game._render_game()
+        return self.surface
+
+    def render_bytes(self, frame):
+        """Draw a frame and return it as raw RGB bytes"""
+        return pygame.image.tobytes(self.render(frame), 'RGB')
+
+    def save_png(self, frame, path):
+        """Draw a frame and save it as a PNG file"""
+        pygame.image.save(self.render(frame), path)
+
+    def save_thumbnail(self, frame, path, size=(320, 240)):
+        """Draw a frame and save a scaled-down PNG"""
+        pygame.image.save(pygame.transform.smoothscale(self.render(frame), size), path)
+
+
+def frames_from_recording(messages, player_id=0):
+    """Yield (body, food, score) frames from protocol messages
+
+    Args:
+        messages: Iterable of snapshot/delta messages, starting with a snapshot
+        player_id: Snake to follow
+    """
+    state = None
+    for data in messages:
+        if message_type(data) == MSG_SNAPSHOT:
+            snapshot = decode(data)
+            if state is None:
+                state = MirrorState(snapshot)
+            else:
+                state.apply_snapshot(snapshot)
+        elif state is None or not state.apply_delta(decode(data, len(state.players))):
+            continue
+
+        player = state.players[player_id]
+        foods = state.food_positions()
+        yield (tuple(player.snake.body), foods[0] if foods else None, player.score)
+
+
+def recording_board_size(messages):
+    """Return the (width, height) of the board in a recording's first snapshot
+
+    Returns:
+        tuple: Board size in cells, or the configured size if there is no snapshot
+    """
+    for data in messages:
+        if message_type(data) == MSG_SNAPSHOT:
+            snapshot = decode(data)
+            return snapshot.width, snapshot.height
+    return BOARD_WIDTH, BOARD_HEIGHT
+
+
+def _init_worker(width, height, board_size):
+    """Create the per-process renderer"""
+    global _worker_renderer
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    # Keep SIGTERM fatal so Pool.terminate() can stop the worker
+    os.environ['SDL_NO_SIGNAL_HANDLERS'] = '1'
+    _worker_renderer = HeadlessRenderer(width, height, board_size)
+
+
+def _render_png_job(job):
+    """Render one (index, frame, directory) job to a PNG file"""
+    index, frame, directory = job
+    path = os.path.join(directory, f"frame_{index:06d}.png")
+    _worker_renderer.save_png(frame, path)
+    return path
+
+
+def _render_bytes_job(frame):
+    """Render one frame to raw RGB bytes"""
+    return _worker_renderer.render_bytes(frame)
+
+
+def render_png_sequence(frames, directory, size=(MIN_WINDOW_WIDTH, MIN_WINDOW_HEIGHT),
+                        workers=None, chunksize=16, board_size=(BOARD_WIDTH, BOARD_HEIGHT)):
+    """Render frames to numbered PNG files using a worker pool
+
+    Returns:
+        list: Paths of the written files, in frame order
+    """
+    os.makedirs(directory, exist_ok=True)
+    jobs = ((index, frame, directory) for index, frame in enumerate(frames))
+    initargs = (size[0], size[1], board_size)
+    with _POOL_CONTEXT.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        return list(pool.imap(_render_png_job, jobs, chunksize))
+
+
+def render_rgb_stream(frames, stream, size=(MIN_WINDOW_WIDTH, MIN_WINDOW_HEIGHT),
+                      workers=None, chunksize=16, board_size=(BOARD_WIDTH, BOARD_HEIGHT)):
+    """Render frames in parallel and write raw RGB24 data to a stream in order
+
+    Returns:
+        int: Number of frames written
+    """
+    count = 0
+    initargs = (size[0], size[1], board_size)
+    with _POOL_CONTEXT.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        for data in pool.imap(_render_bytes_job, frames, chunksize):
+            stream.write(data)
+            count += 1
+    return count
+
+
+def export_video(frames, output_path, size=(MIN_WINDOW_WIDTH, MIN_WINDOW_HEIGHT), fps=10,
+                 encoder="ffmpeg", workers=None, board_size=(BOARD_WIDTH, BOARD_HEIGHT)):
+    """Pipe rendered frames into a local encoder (ffmpeg by default)
+
+    Returns:
+        int: Number of frames encoded
+    """
+    command = [
+        encoder, "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{size[0]}x{size[1]}", "-r", str(fps),
+        "-i", "-", output_path,
+    ]
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
+    try:
+        count = render_rgb_stream(frames, process.stdin, size, workers,
+                                  board_size=board_size)
+    finally:
+        process.stdin.close()
+        process.wait()
+    if process.returncode != 0:
+        raise RuntimeError(f"Encoder exited with status {process.returncode}")
+    return count
+
+
+def main(argv=None):
+    """Render a recording to PNG frames, a video or a thumbnail"""
+    parser = argparse.ArgumentParser(description="Render a recorded game without a display")
+    parser.add_argument("recording", help="Recording file of protocol messages")
+    parser.add_argument("output", help="Output directory (PNG), video file or thumbnail path")
+    parser.add_argument("--mode", choices=("png", "video", "thumbnail"), default="png")
+    parser.add_argument("--size", type=int, nargs=2, default=(MIN_WINDOW_WIDTH, MIN_WINDOW_HEIGHT))
+    parser.add_argument("--fps", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--player", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    messages = list(read_recording(args.recording))
+    frames = list(frames_from_recording(messages, args.player))
+    board_size = recording_board_size(messages)
+    size = tuple(args.size)
+    if args.mode == "png":
+        render_png_sequence(frames, args.output, size, args.workers, board_size=board_size)
+    elif args.mode == "video":
+        export_video(frames, args.output, size, args.fps, workers=args.workers,
+                     board_size=board_size)
+    elif frames:
+        HeadlessRenderer(*size, board_size=board_size).save_thumbnail(frames[-1], args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,74 +1,205 @@
-"""High Score Manager for Snake Game"""
+"""High Score Manager for Snake Game
+
+Several processes (two games, or a game and a tournament runner) may
+share one stats file. Every write re-reads the file under an exclusive
+advisory lock, applies its change and atomically replaces the file, so
+no update is lost. Reads are served from memory and only go back to disk
+when the file's mtime changes, checked at most every
+HIGH_SCORE_REFRESH_INTERVAL seconds.
+"""
 
 import json
 import os
-from src.config import BOARD_WIDTH, BOARD_HEIGHT
+import time
+from contextlib import contextmanager
+from src.config import HIGH_SCORE_REFRESH_INTERVAL
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to unlocked writes
+    fcntl = None
+
+
+
+def _default_stats():
+    """Return a fresh stats dictionary"""
+    return {
+        "high_score": 0,
+        "last_game_score": 0,
+        "total_games": 0
+    }
+
 
 class HighScoreManager:
     """Manages high score persistence and statistics"""
-    
-    def __init__(self):
-        """Initialize high score manager and load existing scores"""
-        self.high_score_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'high_scores.json')
+
+    def __init__(self, high_score_file=None):
+        """Initialize high score manager and load existing scores
+
+        Args:
+            high_score_file (str, optional): Stats file. Defaults to
+                high_scores.json in the project root.
+        """
+        if high_score_file is None:
+            high_score_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'high_scores.json')
+        self.high_score_file = high_score_file
+        self._file_key = None
+        self._next_refresh = 0.0
+        self._seen_high_score = None
+        # Bumped whenever the high score changes, so callers can cache what they draw
+        self.version = 0
         self.stats = self._load_stats()
-    
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a manager that persists to the GameConfig's path"""
+        return cls(config.high_score_path)
+
+    def _read_file_key(self):
+        """Return an identifier that changes whenever the file is replaced"""
+        try:
+            info = os.stat(self.high_score_file)
+        except OSError:
+            return None
+        return (info.st_ino, info.st_mtime_ns, info.st_size)
+
     def _load_stats(self):
         """Load high score stats from file"""
+        self._file_key = self._read_file_key()
+        self._next_refresh = time.monotonic() + HIGH_SCORE_REFRESH_INTERVAL
         try:
             if os.path.exists(self.high_score_file):
                 with open(self.high_score_file, 'r') as f:
-                    return json.load(f)
+                    stats = _default_stats()
+                    stats.update(json.load(f))
+                    return stats
             else:
-                return {
-                    "high_score": 0,
-                    "last_game_score": 0,
-                    "total_games": 0
-                }
+                return _default_stats()
         except (json.JSONDecodeError, IOError):
             # Return default stats if file is corrupted or can't be read
-            return {
-                "high_score": 0,
-                "last_game_score": 0,
-                "total_games": 0
-            }
-    
+            return _default_stats()
+
+    def _refresh(self):
+        """Reload the cached stats if another process changed the file"""
+        now = time.monotonic()
+        if now < self._next_refresh:
+            return
+        self._next_refresh = now + HIGH_SCORE_REFRESH_INTERVAL
+        if self._read_file_key() != self._file_key:
+            self.stats = self._load_stats()
+            self._note_high_score()
+
+    def _note_high_score(self):
+        """Bump the version if the cached high score differs from the last one seen"""
+        high_score = self.stats.get("high_score", 0)
+        if high_score != self._seen_high_score:
+            self._seen_high_score = high_score
+            self.version += 1
+
+    @contextmanager
+    def _locked(self):
+        """Hold an exclusive lock on the stats file's companion lock file"""
+        if fcntl is None:
+            yield
+            return
+        try:
+            lock_file = open(self.high_score_file + '.lock', 'a')
+        except IOError:
+            # Unlocked is better than not saving at all
+            yield
+            return
+        with lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _update(self, change):
+        """Apply change(stats) to the latest on-disk stats and save them
+
+        Args:
+            change: Function that edits the stats dict in place and returns
+                a (result, changed) pair
+
+        Returns:
+            The result returned by change
+        """
+        with self._locked():
+            self.stats = self._load_stats()
+            result, changed = change(self.stats)
+            if changed:
+                self._save_stats()
+        self._note_high_score()
+        return result
+
     def _save_stats(self):
-        """Save high score stats to file"""
+        """Save high score stats to file
+
+        The stats are written to a temporary file that then replaces the
+        original, so readers never see a half-written file. The temporary
+        file is created like open() would create it (mode 0666 less the
+        umask) and then takes the original's permissions, if there is one.
+        """
+        temp_path = f"{self.high_score_file}.{os.getpid()}.{os.urandom(4).hex()}.tmp"
         try:
-            with open(self.high_score_file, 'w') as f:
-                json.dump(self.stats, f, indent=2)
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
         except IOError:
             # Silently fail if we can't save (not critical)
-            pass
-    
+            return
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(self.stats, f, indent=2)
+            try:
+                os.chmod(temp_path, os.stat(self.high_score_file).st_mode & 0o777)
+            except FileNotFoundError:
+                pass
+            os.replace(temp_path, self.high_score_file)
+            self._file_key = self._read_file_key()
+        except IOError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def get_version(self):
+        """Return a counter that changes whenever the high score changes"""
+        self._refresh()
+        if self._seen_high_score is None:
+            self._note_high_score()
+        return self.version
+
     def get_high_score(self):
         """Return current high score"""
+        self._refresh()
         return self.stats.get("high_score", 0)
-    
+
     def update_score(self, new_score):
         """Update high score if new_score is higher"""
-        current_high = self.get_high_score()
-        if new_score > current_high:
-            self.stats["high_score"] = new_score
-            self._save_stats()
-            return True  # New high score!
-        return False  # No new high score
-    
+        def change(stats):
+            if new_score > stats.get("high_score", 0):
+                stats["high_score"] = new_score
+                return True, True  # New high score!
+            return False, False  # No new high score
+        return self._update(change)
+
     def update_last_game_score(self, score):
         """Update last game score and increment total games"""
-        self.stats["last_game_score"] = score
-        self.stats["total_games"] += 1
-        self._save_stats()
-    
+        def change(stats):
+            stats["last_game_score"] = score
+            stats["total_games"] += 1
+            return None, True
+        self._update(change)
+
     def get_stats(self):
         """Return all statistics as dictionary"""
+        self._refresh()
         return self.stats.copy()
-    
+
     def reset_stats(self):
         """Reset all statistics (for testing or admin purposes)"""
-        self.stats = {
-            "high_score": 0,
-            "last_game_score": 0,
-            "total_games": 0
-        }
-        self._save_stats()
\ No newline at end of file
+        def change(stats):
+            stats.clear()
+            stats.update(_default_stats())
+            return None, True
+        self._update(change)
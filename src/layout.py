@@ -0,0 +1,176 @@
+"""Layout geometry cached per window size"""
+
+import pygame
+from src.assets import prepare_surface
+from src.config import (COLOR_SNAKE_HEAD, COLOR_SNAKE_BODY, COLOR_FOOD, COLOR_WALL,
+                        BUTTON_WIDTH, BUTTON_HEIGHT, BUTTON_MARGIN, BUTTON_SPACING,
+                        PANEL_WIDTH_RATIO, PANEL_WIDTH_MIN, PANEL_WIDTH_MAX, PANEL_PADDING)
+
+
+def _bottom_of_centered(center_y, height):
+    """Return the bottom of a rect of the given height centred on center_y"""
+    return center_y - height // 2 + height
+
+
+class LayoutManager:
+    """Computes every rect the renderer and click handler need
+
+    Geometry only changes when the window is resized, so everything is
+    computed once in update() and then read from attributes each frame.
+    """
+
+    def __init__(self, board_width, board_height, font_small, font_medium, font_large, walls=()):
+        """Initialize the manager
+
+        Args:
+            board_width: Board width in cells
+            board_height: Board height in cells
+            font_small: Font used for panel stats and instructions
+            font_medium: Font used for scores and button labels
+            font_large: Font used for screen headings
+            walls: (x, y) positions of maze walls
+        """
+        self.board_width = board_width
+        self.board_height = board_height
+        self.font_small = font_small
+        self.font_medium = font_medium
+        self.font_large = font_large
+        self.walls = list(walls)
+        self.window_size = None
+
+    def update(self, window_width, window_height):
+        """Recompute all geometry for a new window size"""
+        self.window_size = (window_width, window_height)
+
+        # Full-window layout used by the menu and game over screens
+        self.menu_rect = pygame.Rect(0, 0, window_width, window_height)
+        self.menu_ui_rect = pygame.Rect(window_width, 0, 0, window_height)
+
+        # In-game layout with the side panel
+        panel_width = int(window_width * PANEL_WIDTH_RATIO)
+        panel_width = max(PANEL_WIDTH_MIN, min(PANEL_WIDTH_MAX, panel_width))
+        available_width = max(0, window_width - panel_width)
+        self.game_rect = pygame.Rect(0, 0, available_width, window_height)
+        self.ui_rect = pygame.Rect(self.game_rect.width, 0, panel_width, window_height)
+
+        self.cell_width = self.game_rect.width / self.board_width if self.board_width else 0
+        self.cell_height = self.game_rect.height / self.board_height if self.board_height else 0
+        self._update_cell_tables()
+
+        self.play_button_rect = pygame.Rect(
+            self.menu_rect.centerx - BUTTON_WIDTH // 2,
+            self.menu_rect.centery - BUTTON_HEIGHT // 2,
+            BUTTON_WIDTH,
+            BUTTON_HEIGHT
+        )
+        self._update_panel_buttons()
+        self._update_game_over_buttons()
+
+    def _update_cell_tables(self):
+        """Precompute integer pixel positions and sprites for every cell
+
+        cell_rects is indexed by y * board_width + x so the renderer can turn
+        a board position into a blit destination with one lookup.
+        """
+        game_rect = self.game_rect
+        cell_width = self.cell_width
+        cell_height = self.cell_height
+        column_edges = [game_rect.x + int(x * cell_width) for x in range(self.board_width + 1)]
+        row_edges = [game_rect.y + int(y * cell_height) for y in range(self.board_height + 1)]
+
+        self.column_centers = [int(game_rect.x + x * cell_width + cell_width / 2)
+                               for x in range(self.board_width)]
+        self.row_centers = [int(game_rect.y + y * cell_height + cell_height / 2)
+                            for y in range(self.board_height)]
+        self.cell_radius = min(cell_width, cell_height) / 2 - 2
+
+        # Every sprite is blitted at its cell's top-left corner
+        sprite_width = max(1, int(cell_width))
+        sprite_height = max(1, int(cell_height))
+        self.cell_rects = [
+            pygame.Rect(column_edges[x], row_edges[y], sprite_width, sprite_height)
+            for y in range(self.board_height)
+            for x in range(self.board_width)
+        ]
+        self.sprites = {
+            'head': self._make_sprite(sprite_width, sprite_height, COLOR_SNAKE_HEAD),
+            'body': self._make_sprite(sprite_width, sprite_height, COLOR_SNAKE_BODY),
+            'food': self._make_sprite(sprite_width, sprite_height, COLOR_FOOD),
+        }
+
+        # Walls fill their whole cell
+        wall_sprite = pygame.Surface((sprite_width, sprite_height))
+        wall_sprite.fill(COLOR_WALL)
+        wall_sprite = prepare_surface(wall_sprite)
+        self.wall_draw_list = [(wall_sprite, self.cell_rects[self.cell_index(position)])
+                               for position in self.walls]
+
+    def _make_sprite(self, width, height, color):
+        """Render a segment circle once so frames only need to blit it"""
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        if self.cell_radius > 0:
+            pygame.draw.circle(sprite, color, (width / 2, height / 2), self.cell_radius)
+        return prepare_surface(sprite)
+
+    def cell_index(self, position):
+        """Return the cell_rects index of an (x, y) position"""
+        return position[1] * self.board_width + position[0]
+
+    def _update_panel_buttons(self):
+        """Place the PAUSE / RESTART / MENU buttons below the panel stats"""
+        ui_rect = self.ui_rect
+        speed_bottom = ui_rect.y + 92 + self.font_small.get_height()
+        button_y = speed_bottom + 32
+        button_width = max(0, min(ui_rect.width - PANEL_PADDING * 2, 220))
+        button_x = ui_rect.x + (ui_rect.width - button_width) // 2
+
+        self.panel_buttons = {
+            'pause': pygame.Rect(button_x, button_y, button_width, BUTTON_HEIGHT),
+            'restart': pygame.Rect(
+                button_x,
+                button_y + BUTTON_HEIGHT + BUTTON_SPACING,
+                button_width,
+                BUTTON_HEIGHT
+            ),
+            'menu': pygame.Rect(
+                button_x,
+                button_y + 2 * (BUTTON_HEIGHT + BUTTON_SPACING),
+                button_width,
+                BUTTON_HEIGHT
+            ),
+        }
+
+    def _update_game_over_buttons(self):
+        """Place the PLAY AGAIN / MENU buttons below the game over text"""
+        game_rect = self.menu_rect
+        medium_height = self.font_medium.get_height()
+        self.game_over_title_y = game_rect.top + int(game_rect.height * 0.28)
+        title_bottom = _bottom_of_centered(self.game_over_title_y, self.font_large.get_height())
+        score_bottom = _bottom_of_centered(title_bottom + 52, medium_height)
+        high_score_bottom = _bottom_of_centered(score_bottom + 32, medium_height)
+        button_y = high_score_bottom + 48
+
+        self.game_over_buttons = {
+            'play_again': pygame.Rect(
+                game_rect.centerx - BUTTON_WIDTH - BUTTON_MARGIN // 2,
+                button_y,
+                BUTTON_WIDTH,
+                BUTTON_HEIGHT
+            ),
+            'menu': pygame.Rect(
+                game_rect.centerx + BUTTON_MARGIN // 2,
+                button_y,
+                BUTTON_WIDTH,
+                BUTTON_HEIGHT
+            ),
+        }
+
+    def get_layout(self, include_panel=True):
+        """Return the cached (game_rect, ui_rect) pair"""
+        if include_panel:
+            return self.game_rect, self.ui_rect
+        return self.menu_rect, self.menu_ui_rect
+
+    def get_cell_size(self):
+        """Return the cached (cell_width, cell_height)"""
+        return self.cell_width, self.cell_height
@@ -0,0 +1,214 @@
+"""Maze levels compiled to wall bitmaps
+
+Levels are plain text files: '#' is a wall, 'S' marks the snake's start
+(optional, defaults to the centre) and any other character is free.
+Shorter rows are padded with free cells. The snake's body extends upward
+from the start and it first moves right, so the cells above the start
+and the cell to its right must be free too.
+
+Each level is compiled once into a bit-packed wall bitmap (one bit per
+cell, so wall checks are a single lookup) and a list of free cells used
+to spawn food. The compiled form is cached on disk under the SHA-256 of
+the source text, so later loads skip parsing entirely.
+"""
+
+import os
+import random
+import struct
+import hashlib
+import tempfile
+from array import array
+from src.config import LEVEL_DIR, LEVEL_CACHE_DIR, INITIAL_SNAKE_LENGTH
+
+WALL_CHAR = '#'
+SPAWN_CHAR = 'S'
+
+_MAGIC = b"SLV1"
+_HEADER = struct.Struct('<4sHHHH')  # magic, width, height, spawn x, spawn y
+_COUNT = struct.Struct('<I')        # free cell count
+
+
+class Level:
+    """A compiled maze"""
+
+    def __init__(self, width, height, walls, free_cells, spawn):
+        """Initialize a compiled level
+
+        Args:
+            width: Level width in cells
+            height: Level height in cells
+            walls: bytearray with one bit per cell, cell index y * width + x
+            free_cells: array of free cell indices
+            spawn: (x, y) start position of the snake's head
+        """
+        self.width = width
+        self.height = height
+        self.walls = walls
+        self.free_cells = free_cells
+        self.spawn = spawn
+
+    def is_wall(self, position):
+        """Return True if position is a wall cell"""
+        x, y = position
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        index = y * self.width + x
+        return bool(self.walls[index >> 3] >> (index & 7) & 1)
+
+    def spawn_cells(self, length):
+        """Return the cells a new snake of this length covers, head first"""
+        x, y = self.spawn
+        return [(x, (y - offset) % self.height) for offset in range(length)]
+
+    def check_spawn(self, length):
+        """Make sure a new snake of this length starts clear of walls
+
+        The snake starts heading right, so the cell right of the start must
+        be free as well.
+
+        Raises:
+            ValueError: If any of its cells, or the cell it moves into first,
+                is a wall
+        """
+        if self.is_wall(self.spawn):
+            raise ValueError("Level start position is a wall; mark one with 'S'")
+        if any(self.is_wall(cell) for cell in self.spawn_cells(length)):
+            raise ValueError(f"A snake of length {length} at the level start overlaps a wall; "
+                             "mark a start with 'S' below enough free cells")
+        x, y = self.spawn
+        if self.is_wall(((x + 1) % self.width, y)):
+            raise ValueError("The snake would hit the wall right of the level start on its "
+                             "first move; mark a start with 'S' left of a free cell")
+
+    def random_free_position(self, rng=random):
+        """Return a random cell that is not a wall, drawn from rng"""
+        cell = rng.choice(self.free_cells)
+        return (cell % self.width, cell // self.width)
+
+    def wall_positions(self):
+        """Return the (x, y) positions of every wall cell"""
+        width = self.width
+        walls = self.walls
+        return [(index % width, index // width)
+                for index in range(width * self.height)
+                if walls[index >> 3] >> (index & 7) & 1]
+
+    def to_bytes(self):
+        """Serialize the compiled level"""
+        return b''.join([
+            _HEADER.pack(_MAGIC, self.width, self.height, *self.spawn),
+            bytes(self.walls),
+            _COUNT.pack(len(self.free_cells)),
+            self.free_cells.tobytes(),
+        ])
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize a compiled level
+
+        Raises:
+            ValueError: If the data is not a compiled level
+        """
+        magic, width, height, spawn_x, spawn_y = _HEADER.unpack_from(data, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a compiled level")
+        offset = _HEADER.size
+        bitmap_size = (width * height + 7) // 8
+        walls = bytearray(data[offset:offset + bitmap_size])
+        offset += bitmap_size
+        count = _COUNT.unpack_from(data, offset)[0]
+        offset += _COUNT.size
+        free_cells = array('I')
+        free_cells.frombytes(data[offset:offset + count * free_cells.itemsize])
+        if len(walls) != bitmap_size or len(free_cells) != count:
+            raise ValueError("Truncated compiled level")
+        return cls(width, height, walls, free_cells, (spawn_x, spawn_y))
+
+
+def compile_level(text, snake_length=INITIAL_SNAKE_LENGTH):
+    """Compile level text into a Level
+
+    Args:
+        text: Level source
+        snake_length: Length of the snake that must fit at the start
+
+    Raises:
+        ValueError: If the level is empty, has no free cells or the snake's
+            start cells include a wall
+    """
+    rows = [line.rstrip('\r') for line in text.split('\n')]
+    while rows and not rows[-1].strip():
+        rows.pop()
+    if not rows:
+        raise ValueError("Level is empty")
+    width = max(len(row) for row in rows)
+    height = len(rows)
+
+    walls = bytearray((width * height + 7) // 8)
+    free_cells = array('I')
+    spawn = None
+    for y, row in enumerate(rows):
+        for x in range(width):
+            char = row[x] if x < len(row) else ' '
+            index = y * width + x
+            if char == WALL_CHAR:
+                walls[index >> 3] |= 1 << (index & 7)
+            else:
+                free_cells.append(index)
+                if char == SPAWN_CHAR:
+                    spawn = (x, y)
+
+    if not free_cells:
+        raise ValueError("Level has no free cells")
+    level = Level(width, height, walls, free_cells, spawn or (width // 2, height // 2))
+    level.check_spawn(snake_length)
+    return level
+
+
+def find_level(name):
+    """Return the path of a level given a path or a name in LEVEL_DIR"""
+    if os.path.exists(name):
+        return name
+    return os.path.join(LEVEL_DIR, name + '.txt')
+
+
+def load_level(path, cache_dir=LEVEL_CACHE_DIR, snake_length=INITIAL_SNAKE_LENGTH):
+    """Load a level, using the compiled cache when the source is unchanged
+
+    Args:
+        path: Level text file
+        cache_dir: Directory for compiled levels, or None to disable caching
+        snake_length: Length of the snake that must fit at the start
+
+    Returns:
+        Level: The compiled level
+
+    Raises:
+        ValueError: If the level is invalid or the snake does not fit at its start
+    """
+    with open(path, 'rb') as f:
+        source = f.read()
+    if cache_dir is None:
+        return compile_level(source.decode('utf-8'), snake_length)
+
+    cache_path = os.path.join(cache_dir, hashlib.sha256(source).hexdigest() + '.lvl')
+    try:
+        with open(cache_path, 'rb') as f:
+            level = Level.from_bytes(f.read())
+    except (OSError, ValueError, struct.error):
+        pass
+    else:
+        level.check_spawn(snake_length)
+        return level
+
+    level = compile_level(source.decode('utf-8'), snake_length)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(level.to_bytes())
+        os.replace(temp_path, cache_path)
+    except OSError:
+        # A missing cache only costs a recompile next time
+        pass
+    return level
@@ -0,0 +1,436 @@
+"""Synthetic client load for arena server capacity testing
+
+Starts an ArenaServer in its own process on localhost, then connects
+thousands of bot clients, each an asyncio protocol plus one task, spread
+over a few processes. Bots turn at random (Poisson, LOADGEN_INPUT_RATE
+per second) while alive. One run measures a fixed window after every bot
+has had time to connect:
+
+    - server tick lateness and tick duration (jitter), and overruns
+    - client-side jitter: how far delta arrival gaps stray from the interval
+    - input latency: from sending a turn to receiving the first delta that
+      shows it applied
+    - throughput: ticks, messages, bytes and inputs per second
+
+Runs at increasing client counts make a CapacityReport. Its JSON form
+carries the package version and machine, so reports from two releases
+can be compared with --compare.
+
+    python -m src.loadgen --clients 250 500 1000 2000 --output capacity.json
+    python -m src.loadgen --clients 1000 --compare capacity.json
+"""
+
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import multiprocessing
+from array import array
+from dataclasses import dataclass, field, asdict
+from src.arena_server import MessageReader, frame_message, serve_process
+from src.config import (SERVER_HOST, SERVER_TICK_INTERVAL, LOADGEN_INPUT_RATE, LOADGEN_DURATION,
+                        LOADGEN_JITTER_BUDGET_MS, LOADGEN_LATENCY_BUDGET_MS)
+from src.direction import OPPOSITE, DIRECTIONS
+from src.protocol import (MSG_SNAPSHOT, MSG_DELTA, MSG_WELCOME, FLAG_DIED, DIRECTION_MASK,
+                          decode, encode_inputs, message_type)
+
+# Turns not confirmed within this many seconds are counted as lost
+INPUT_TIMEOUT = 2.0
+
+# Seconds allowed per thousand clients to connect before measuring
+CONNECT_TIME_PER_1000 = 2.0
+
+
+def percentile(values, fraction):
+    """Return the nearest-rank percentile of values (0.0 - 1.0), or 0.0 if empty"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(values):
+    """Return p50/p90/p99/max of a sample list, rounded to microseconds"""
+    return {
+        'p50': round(percentile(values, 0.50), 3),
+        'p90': round(percentile(values, 0.90), 3),
+        'p99': round(percentile(values, 0.99), 3),
+        'max': round(max(values), 3) if values else 0.0,
+        'samples': len(values),
+    }
+
+
+@dataclass
+class ClientStats:
+    """Samples gathered by the bots of one process"""
+    connected: int = 0
+    failed: int = 0
+    messages: int = 0
+    inputs: int = 0
+    lost_inputs: int = 0
+    latency_ms: array = field(default_factory=lambda: array('d'))
+    jitter_ms: array = field(default_factory=lambda: array('d'))
+
+    def merge(self, other):
+        """Add another process's samples into these"""
+        self.connected += other.connected
+        self.failed += other.failed
+        self.messages += other.messages
+        self.inputs += other.inputs
+        self.lost_inputs += other.lost_inputs
+        self.latency_ms.extend(other.latency_ms)
+        self.jitter_ms.extend(other.jitter_ms)
+        return self
+
+
+class BotClient(asyncio.Protocol):
+    """One simulated player: follows its own snake and turns at random"""
+
+    def __init__(self, stats, window, tick_interval, rng):
+        """Initialize the bot
+
+        Args:
+            stats (ClientStats): Where samples are recorded
+            window: (start, end) time.time() range in which to record
+            tick_interval: The server's tick interval, for jitter
+            rng: random.Random for turn timing and choice
+        """
+        self.stats = stats
+        self.window = window
+        self.tick_interval = tick_interval
+        self.rng = rng
+        self.transport = None
+        self.reader = MessageReader()
+        self.player_id = None
+        self.player_count = None
+        self.tick = 0
+        self.heading = None
+        self.alive = False
+        self.pending = None
+        self.last_arrival = None
+
+    def connection_made(self, transport):
+        """Keep the transport"""
+        self.transport = transport
+
+    def _measuring(self):
+        """Return True inside the measurement window"""
+        start, end = self.window
+        return start <= time.time() < end
+
+    def data_received(self, data):
+        """Track the bot's snake and time confirmations of its turns"""
+        for message in self.reader.feed(data):
+            kind = message_type(message)
+            now = time.perf_counter()
+            measuring = self._measuring()
+            if measuring:
+                self.stats.messages += 1
+
+            if kind == MSG_WELCOME:
+                self.player_id = decode(message).player_id
+                continue
+            if kind == MSG_SNAPSHOT:
+                snapshot = decode(message)
+                self.player_count = len(snapshot.players)
+                self.tick = snapshot.tick
+                player = snapshot.players[self.player_id]
+                self.alive = player.alive
+                self.heading = player.heading
+            elif kind == MSG_DELTA and self.player_count is not None:
+                delta = decode(message, self.player_count)
+                self.tick = delta.tick
+                flags = delta.flags[self.player_id]
+                if flags & FLAG_DIED:
+                    self.alive = False
+                elif self.alive:
+                    self.heading = flags & DIRECTION_MASK
+            else:
+                continue
+
+            # Every tick sends one snapshot or delta
+            if measuring and self.last_arrival is not None:
+                gap = (now - self.last_arrival) * 1000.0
+                self.stats.jitter_ms.append(abs(gap - self.tick_interval * 1000.0))
+            self.last_arrival = now
+
+            pending = self.pending
+            if pending is not None:
+                direction, sent_at = pending
+                if self.alive and self.heading == direction:
+                    if measuring:
+                        self.stats.latency_ms.append((now - sent_at) * 1000.0)
+                    self.pending = None
+                elif not self.alive or now - sent_at > INPUT_TIMEOUT:
+                    if measuring:
+                        self.stats.lost_inputs += 1
+                    self.pending = None
+
+    async def play(self, rate):
+        """Send a turn every exponentially distributed interval until cancelled"""
+        rng = self.rng
+        while True:
+            await asyncio.sleep(rng.expovariate(rate))
+            if self.transport.is_closing():
+                return
+            if not self.alive or self.pending is not None or self.heading is None:
+                continue
+            choices = [code for code in DIRECTIONS
+                       if code != self.heading and code != OPPOSITE[self.heading]]
+            direction = rng.choice(choices)
+            tick = self.tick + 1
+            self.transport.write(frame_message(
+                encode_inputs(tick, self.player_id, [(tick, direction)])))
+            self.pending = (direction, time.perf_counter())
+            if self._measuring():
+                self.stats.inputs += 1
+
+
+async def run_bots(port, count, window, rate=LOADGEN_INPUT_RATE,
+                   tick_interval=SERVER_TICK_INTERVAL, seed=0):
+    """Connect count bots, play until the window ends, then disconnect
+
+    Returns:
+        ClientStats: Samples from this process's bots
+    """
+    loop = asyncio.get_running_loop()
+    stats = ClientStats()
+    rng = random.Random(seed)
+    bots = []
+    tasks = []
+    for _ in range(count):
+        bot_rng = random.Random(rng.getrandbits(64))
+        try:
+            _, bot = await loop.create_connection(
+                lambda: BotClient(stats, window, tick_interval, bot_rng), SERVER_HOST, port)
+        except OSError:
+            stats.failed += 1
+            continue
+        stats.connected += 1
+        bots.append(bot)
+        tasks.append(asyncio.create_task(bot.play(rate)))
+
+    await asyncio.sleep(max(0.0, window[1] - time.time()))
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    for bot in bots:
+        bot.transport.close()
+    return stats
+
+
+def _client_job(job):
+    """Run one process's share of bots"""
+    port, count, window, rate, tick_interval, seed = job
+    return asyncio.run(run_bots(port, count, window, rate, tick_interval, seed))
+
+
+@dataclass
+class StepResult:
+    """Measurements of one run at a fixed client count"""
+    clients: int
+    connected: int
+    duration: float
+    tick_lateness_ms: dict
+    tick_duration_ms: dict
+    client_jitter_ms: dict
+    input_latency_ms: dict
+    ticks_per_second: float
+    messages_per_second: float
+    bytes_per_second: float
+    inputs_per_second: float
+    overruns: int
+    lost_inputs: int
+    slow_disconnects: int
+
+    def within(self, jitter_budget_ms, latency_budget_ms):
+        """Return True if every client connected and p99s meet the budgets"""
+        return (self.connected == self.clients
+                and self.tick_lateness_ms['p99'] <= jitter_budget_ms
+                and self.input_latency_ms['p99'] <= latency_budget_ms)
+
+
+def run_step(clients, processes=1, duration=LOADGEN_DURATION, rate=LOADGEN_INPUT_RATE,
+             tick_interval=SERVER_TICK_INTERVAL, seed=0):
+    """Serve, connect clients bots over processes and measure one window
+
+    Returns:
+        StepResult: The window's measurements
+    """
+    context = multiprocessing.get_context()
+    warmup = max(1.0, clients / 1000 * CONNECT_TIME_PER_1000)
+    ready = context.Queue()
+    results = context.Queue()
+    stop = context.Event()
+    start = time.time() + warmup
+    window = (start, start + duration)
+    server = context.Process(target=serve_process,
+                             args=(0, tick_interval, window, ready, stop, results, seed),
+                             daemon=True)
+    server.start()
+    try:
+        port = ready.get(timeout=30)
+        processes = max(1, min(processes, clients))
+        jobs = [(port, clients // processes + (index < clients % processes), window, rate,
+                 tick_interval, seed + index) for index in range(processes)]
+        # Workers exit on their own: a process forked after pygame started
+        # would ignore the SIGTERM sent by Pool.terminate()
+        pool = context.Pool(processes)
+        try:
+            parts = pool.map(_client_job, jobs)
+        finally:
+            pool.close()
+            pool.join()
+        stop.set()
+        server_stats = results.get(timeout=30)
+    finally:
+        stop.set()
+        server.join(timeout=10)
+        if server.is_alive():
+            server.terminate()
+
+    client_stats = ClientStats()
+    for part in parts:
+        client_stats.merge(part)
+    return StepResult(
+        clients=clients,
+        connected=client_stats.connected,
+        duration=duration,
+        tick_lateness_ms=summarize(server_stats.lateness_ms),
+        tick_duration_ms=summarize(server_stats.duration_ms),
+        client_jitter_ms=summarize(client_stats.jitter_ms),
+        input_latency_ms=summarize(client_stats.latency_ms),
+        ticks_per_second=round(server_stats.ticks / duration, 2),
+        messages_per_second=round(server_stats.messages / duration, 1),
+        bytes_per_second=round(server_stats.bytes_sent / duration, 1),
+        inputs_per_second=round(server_stats.inputs / duration, 1),
+        overruns=server_stats.overruns,
+        lost_inputs=client_stats.lost_inputs,
+        slow_disconnects=server_stats.slow_disconnects,
+    )
+
+
+def _package_version():
+    """Return the installed package version, or 'unknown' when run from a checkout"""
+    try:
+        from importlib.metadata import version
+        return version("thesnakegame")
+    except Exception:
+        return "unknown"
+
+
+@dataclass
+class CapacityReport:
+    """Results of a ramp of load steps and the largest one within budget"""
+    steps: list
+    jitter_budget_ms: float = LOADGEN_JITTER_BUDGET_MS
+    latency_budget_ms: float = LOADGEN_LATENCY_BUDGET_MS
+    tick_interval: float = SERVER_TICK_INTERVAL
+    input_rate: float = LOADGEN_INPUT_RATE
+    version: str = field(default_factory=_package_version)
+    python: str = field(default_factory=platform.python_version)
+    machine: str = field(default_factory=lambda: f"{platform.system()} {platform.machine()}, "
+                                                 f"{multiprocessing.cpu_count()} CPUs")
+
+    @property
+    def capacity(self):
+        """Return the largest client count whose step met the budgets (0 if none)"""
+        passing = [step.clients for step in self.steps
+                   if step.within(self.jitter_budget_ms, self.latency_budget_ms)]
+        return max(passing, default=0)
+
+    def to_dict(self):
+        """Return the report as JSON-ready data"""
+        data = asdict(self)
+        data['capacity'] = self.capacity
+        return data
+
+    def save(self, path):
+        """Write the report as JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def format(self):
+        """Return a human-readable table"""
+        lines = [
+            f"thesnakegame {self.version}, Python {self.python}, {self.machine}",
+            f"Tick {self.tick_interval * 1000:.0f} ms, {self.input_rate:g} turns/s per bot; "
+            f"budgets: p99 tick lateness {self.jitter_budget_ms:g} ms, "
+            f"p99 input latency {self.latency_budget_ms:g} ms",
+            f"{'clients':>8} {'late p99':>9} {'tick p99':>9} {'jitter p99':>10} "
+            f"{'lat p50':>8} {'lat p99':>8} {'msgs/s':>9} {'KB/s':>8} {'overruns':>8}",
+        ]
+        for step in self.steps:
+            mark = "" if step.within(self.jitter_budget_ms, self.latency_budget_ms) else "  over"
+            lines.append(
+                f"{step.clients:>8} {step.tick_lateness_ms['p99']:>9.2f} "
+                f"{step.tick_duration_ms['p99']:>9.2f} {step.client_jitter_ms['p99']:>10.2f} "
+                f"{step.input_latency_ms['p50']:>8.1f} {step.input_latency_ms['p99']:>8.1f} "
+                f"{step.messages_per_second:>9.0f} {step.bytes_per_second / 1024:>8.1f} "
+                f"{step.overruns:>8}{mark}")
+        lines.append(f"Capacity: {self.capacity} clients")
+        return "\n".join(lines)
+
+
+def compare(previous, current):
+    """Describe how a report differs from a saved one
+
+    Args:
+        previous: Report data loaded from JSON
+        current (CapacityReport): The new report
+
+    Returns:
+        str: One line for the capacity and one per client count in both
+    """
+    lines = [f"Capacity: {previous['capacity']} ({previous['version']}) -> "
+             f"{current.capacity} ({current.version})"]
+    earlier = {step['clients']: step for step in previous['steps']}
+    for step in current.steps:
+        old = earlier.get(step.clients)
+        if old is None:
+            continue
+        lines.append(
+            f"{step.clients:>6} clients: tick lateness p99 "
+            f"{old['tick_lateness_ms']['p99']:.2f} -> {step.tick_lateness_ms['p99']:.2f} ms, "
+            f"input latency p99 {old['input_latency_ms']['p99']:.1f} -> "
+            f"{step.input_latency_ms['p99']:.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Ramp the client count against a local server and report capacity"""
+    parser = argparse.ArgumentParser(description="Measure arena server capacity on localhost")
+    parser.add_argument("--clients", type=int, nargs="+", default=[250, 500, 1000, 2000],
+                        help="Client counts to run, one step each")
+    parser.add_argument("--processes", type=int, default=max(1, multiprocessing.cpu_count() // 2),
+                        help="Client processes per step")
+    parser.add_argument("--duration", type=float, default=LOADGEN_DURATION,
+                        help="Measured seconds per step")
+    parser.add_argument("--rate", type=float, default=LOADGEN_INPUT_RATE,
+                        help="Turns per second per bot")
+    parser.add_argument("--tick-interval", type=float, default=SERVER_TICK_INTERVAL)
+    parser.add_argument("--output", help="Write the report as JSON")
+    parser.add_argument("--compare", metavar="JSON", help="Compare with an earlier report")
+    args = parser.parse_args(argv)
+
+    steps = []
+    for clients in args.clients:
+        print(f"Running {clients} clients...", flush=True)
+        steps.append(run_step(clients, args.processes, args.duration, args.rate,
+                              args.tick_interval))
+    report = CapacityReport(steps, tick_interval=args.tick_interval, input_rate=args.rate)
+    print(report.format())
+    if args.output:
+        report.save(args.output)
+    if args.compare:
+        with open(args.compare) as f:
+            print(compare(json.load(f), report))
+    return 0 if report.capacity else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,40 @@
 #!/usr/bin/env python3
 """Snake Game Entry Point"""
 
+import argparse
+import sys
 from src.game import SnakeGame
+from src.settings import load_config
 
-def run():
+def run(argv=None):
     """Run the game"""
-    game = SnakeGame()
+    parser = argparse.ArgumentParser(description="Play Snake")
+    parser.add_argument("--config", help="Profile file (.json or .toml); SNAKE_* variables override it")
+    parser.add_argument("--autopilot", metavar="POLICY",
+                        help="Let a policy trained with snake-train (.npz) play")
+    parser.add_argument("--split", action="store_true",
+                        help="Simulate in a separate process so rendering never delays ticks")
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args.config)
+    except (OSError, ValueError) as error:
+        sys.exit(f"Invalid configuration: {error}")
+
+    autopilot = None
+    if args.autopilot:
+        from src.train import NeuralAutopilot
+        try:
+            autopilot = NeuralAutopilot.load(args.autopilot)
+        except (OSError, KeyError, ValueError) as error:
+            sys.exit(f"Invalid autopilot: {error}")
+
+    if args.split:
+        from src.split_game import SplitGame
+        game = SplitGame(config=config)
+    else:
+        game = SnakeGame(config=config)
+    game.autopilot = autopilot
     game.run()
 
 if __name__ == "__main__":
@@ -0,0 +1,319 @@
+"""Client-side prediction over a simulated network link
+
+LocalServer stands in for a remote arena server, PredictingClient runs
+the local snake ahead of the server and reconciles on every update, and
+LoopbackLink injects latency and packet loss between the two.
+"""
+
+import math
+import random
+from collections import deque
+from src.arena import Arena
+from src.config import KEYFRAME_INTERVAL, INPUT_MAX_LEAD_TICKS, INPUT_MAX_PENDING
+from src.protocol import (MSG_SNAPSHOT, MSG_INPUT, MirrorState, check_board_size, decode,
+                          encode_delta, encode_inputs, encode_snapshot, message_type)
+from src.snake import Snake
+from src.utils import is_valid_direction
+
+
+class LoopbackLink:
+    """One-way link that delays and randomly drops messages"""
+
+    def __init__(self, latency_ms, loss=0.0, rng=None):
+        """Initialize the link
+
+        Args:
+            latency_ms: One-way delivery delay in milliseconds
+            loss: Probability of dropping each message (0.0 - 1.0)
+            rng: Optional random.Random used for loss decisions
+        """
+        self.latency_ms = latency_ms
+        self.loss = loss
+        self.rng = rng or random.Random()
+        self._in_flight = deque()
+        self.sent = 0
+        self.dropped = 0
+        self.bytes_sent = 0
+
+    def send(self, data, now_ms):
+        """Queue a message for delivery"""
+        self.sent += 1
+        self.bytes_sent += len(data)
+        if self.rng.random() < self.loss:
+            self.dropped += 1
+            return
+        self._in_flight.append((now_ms + self.latency_ms, data))
+
+    def receive(self, now_ms):
+        """Return all messages due for delivery by now_ms, in send order"""
+        delivered = []
+        while self._in_flight and self._in_flight[0][0] <= now_ms:
+            delivered.append(self._in_flight.popleft()[1])
+        return delivered
+
+
+class LocalServer:
+    """Authoritative arena that consumes tick-tagged client inputs"""
+
+    def __init__(self, arena, keyframe_interval=KEYFRAME_INTERVAL,
+                 max_lead=INPUT_MAX_LEAD_TICKS, max_pending=INPUT_MAX_PENDING):
+        """Initialize the server around an existing arena
+
+        Args:
+            arena: Arena to run
+            keyframe_interval: Ticks between full snapshots
+            max_lead: Inputs tagged further ahead of the arena are ignored
+            max_pending: Inputs held per player; later ones are ignored
+
+        Raises:
+            ValueError: If the arena's board is too large for the protocol
+        """
+        check_board_size(arena.board.width, arena.board.height)
+        self.arena = arena
+        self.keyframe_interval = keyframe_interval
+        self.max_lead = max_lead
+        self.max_pending = max_pending
+        self._pending = {}
+        self._applied_through = {}
+
+    def receive(self, data):
+        """Queue the inputs carried by a client message"""
+        if message_type(data) != MSG_INPUT:
+            return
+        self.receive_batch(decode(data))
+
+    def receive_batch(self, batch):
+        """Queue the inputs of a decoded InputBatch"""
+        pending = self._pending.setdefault(batch.player_id, {})
+        applied_through = self._applied_through.get(batch.player_id, -1)
+        latest = self.arena.tick + self.max_lead
+        for input_tick, direction in batch.inputs:
+            if not applied_through < input_tick <= latest:
+                continue
+            if input_tick in pending or len(pending) < self.max_pending:
+                pending[input_tick] = direction
+
+    def tick(self):
+        """Advance the arena one tick
+
+        Each player gets at most one direction change per tick: the oldest
+        pending input tagged for this tick or earlier. Late inputs are
+        applied as soon as they arrive.
+
+        Returns:
+            bytes: Snapshot on keyframe ticks, delta otherwise
+        """
+        next_tick = self.arena.tick + 1
+        directions = {}
+        for player_id, pending in self._pending.items():
+            due = [input_tick for input_tick in pending if input_tick <= next_tick]
+            if due:
+                input_tick = min(due)
+                directions[player_id] = pending.pop(input_tick)
+                self._applied_through[player_id] = input_tick
+
+        result = self.arena.step(directions)
+        if self.arena.tick % self.keyframe_interval == 0:
+            return encode_snapshot(self.arena)
+        return encode_delta(self.arena, result)
+
+    def snapshot(self):
+        """Encode the current state for a newly connected client"""
+        return encode_snapshot(self.arena)
+
+
+class PredictingClient:
+    """Client that predicts its own snake and reconciles with the server
+
+    The client runs lead_ticks ahead of the last confirmed server tick so
+    its inputs reach the server in time. Every prediction is kept in a
+    short history; when the server's state for a tick differs, the local
+    snake is rolled back to the server's version and the logged inputs
+    are replayed up to the current tick.
+    """
+
+    def __init__(self, player_id, lead_ticks=1):
+        """Initialize an unsynchronised client"""
+        self.player_id = player_id
+        self.lead_ticks = lead_ticks
+        self.state = None
+        self.predicted = None
+        self.tick = None
+        self._inputs = {}
+        self._history = {}
+
+        # Statistics
+        self.rollbacks = 0
+        self.confirmed_ticks = 0
+        self.skipped_deltas = 0
+
+    def receive(self, data):
+        """Apply a server message and reconcile the prediction"""
+        if message_type(data) == MSG_SNAPSHOT:
+            snapshot = decode(data)
+            if self.state is None:
+                self.state = MirrorState(snapshot)
+                self.tick = snapshot.tick + self.lead_ticks
+                self._rollback()
+                return
+            self.state.apply_snapshot(snapshot)
+        else:
+            if self.state is None:
+                return
+            delta = decode(data, len(self.state.players))
+            if not self.state.apply_delta(delta):
+                # Wait for the next keyframe to resynchronise
+                self.skipped_deltas += 1
+                return
+        self._reconcile()
+
+    def _reconcile(self):
+        """Compare the confirmed state with the prediction for its tick"""
+        confirmed_tick = self.state.tick
+        player = self.state.players[self.player_id]
+        predicted = self._history.get(confirmed_tick)
+        actual = (tuple(player.snake.body), player.snake.heading)
+
+        if predicted is not None and predicted == actual:
+            self.confirmed_ticks += 1
+        else:
+            if predicted is not None:
+                self.rollbacks += 1
+            self._rollback()
+
+        for tick in [tick for tick in self._history if tick <= confirmed_tick]:
+            del self._history[tick]
+        for tick in [tick for tick in self._inputs if tick <= confirmed_tick]:
+            del self._inputs[tick]
+
+    def _rollback(self):
+        """Reset the predicted snake to the confirmed state and replay inputs"""
+        player = self.state.players[self.player_id]
+        if not player.alive:
+            self.predicted = None
+            return
+
+        self.predicted = Snake((0, 0), 0, board=self.state.board)
+        self.predicted.body = list(player.snake.body)
+        self.predicted.heading = player.snake.heading
+        self._history = {}
+        if self.tick < self.state.tick:
+            self.tick = self.state.tick
+        for tick in range(self.state.tick + 1, self.tick + 1):
+            self._predict(tick)
+
+    def _predict(self, tick):
+        """Simulate the local snake for one tick using the server rules"""
+        snake = self.predicted
+        direction = self._inputs.get(tick)
+        if direction is not None and is_valid_direction(snake.heading, direction):
+            snake.direction = direction
+        snake.move(snake.heading)
+        snake.body[0] = self.state.board.wrap_position(snake.body[0])
+        if snake.body[0] in self.state.foods:
+            snake.grow()
+        self._history[tick] = (tuple(snake.body), snake.heading)
+
+    def set_direction(self, direction):
+        """Request a direction change for the next predicted tick
+
+        Returns:
+            bytes: Input message carrying every unconfirmed input
+        """
+        self._inputs[self.tick + 1] = direction
+        return self.pending_inputs()
+
+    def pending_inputs(self):
+        """Encode every input the server has not confirmed yet"""
+        inputs = sorted(self._inputs.items())
+        return encode_inputs(self.tick, self.player_id, inputs)
+
+    def advance(self):
+        """Advance the local prediction by one tick"""
+        if self.state is None:
+            return
+        self.tick += 1
+        if self.predicted is not None:
+            self._predict(self.tick)
+
+
+def _choose_turn(snake, board, rng):
+    """Pick a random direction that does not immediately hit the body"""
+    options = []
+    for direction in ('UP', 'RIGHT', 'DOWN', 'LEFT'):
+        if not is_valid_direction(snake.direction, direction):
+            continue
+        target = board.wrap_position(snake.next_head_position(direction))
+        if target not in snake.body[1:-1]:
+            options.append(direction)
+    return rng.choice(options) if options else snake.direction
+
+
+def run_loopback_session(ticks=600, tick_ms=100, rtt_ms=100, loss=0.0,
+                         board_size=32, turn_probability=0.15, seed=0):
+    """Play one bot-driven client against a LocalServer over loopback links
+
+    Args:
+        ticks: Number of server ticks to simulate
+        tick_ms: Server tick interval in milliseconds
+        rtt_ms: Round trip time, split evenly between both directions
+        loss: Packet loss probability applied to both directions
+        board_size: Width and height of the arena
+        turn_probability: Chance per tick that the bot changes direction
+        seed: Seed for food, loss and bot decisions
+
+    Returns:
+        dict: Bandwidth, rollback and input latency statistics
+    """
+    rng = random.Random(seed)
+    arena = Arena(board_size, board_size, rng=rng)
+    arena.add_snake((board_size // 2, board_size // 2))
+    server = LocalServer(arena)
+
+    downlink = LoopbackLink(rtt_ms / 2, loss, rng)
+    uplink = LoopbackLink(rtt_ms / 2, loss, rng)
+    lead_ticks = math.ceil(rtt_ms / tick_ms) + 1
+    client = PredictingClient(player_id=0, lead_ticks=lead_ticks)
+    downlink.send(server.snapshot(), 0)
+
+    sent_at = {}
+    confirm_latencies = []
+    ticks_run = 0
+    for tick in range(1, ticks + 1):
+        now_ms = tick * tick_ms
+        for data in uplink.receive(now_ms):
+            server.receive(data)
+        downlink.send(server.tick(), now_ms)
+        ticks_run = tick
+
+        for data in downlink.receive(now_ms):
+            client.receive(data)
+            confirmed = client.state.tick
+            for input_tick in [t for t in sent_at if t <= confirmed]:
+                confirm_latencies.append(now_ms - sent_at.pop(input_tick))
+
+        if client.state is None:
+            continue
+        if not arena.players[0].alive:
+            break
+
+        if client.predicted is not None and rng.random() < turn_probability:
+            direction = _choose_turn(client.predicted, client.state.board, rng)
+            uplink.send(client.set_direction(direction), now_ms)
+            sent_at[client.tick + 1] = now_ms
+        elif client._inputs:
+            uplink.send(client.pending_inputs(), now_ms)
+        client.advance()
+
+    predicted_ticks = client.confirmed_ticks + client.rollbacks
+    return {
+        'ticks': ticks_run,
+        'lead_ticks': lead_ticks,
+        'downlink_bytes_per_tick': downlink.bytes_sent / max(1, ticks_run),
+        'uplink_bytes_per_tick': uplink.bytes_sent / max(1, ticks_run),
+        'rollbacks': client.rollbacks,
+        'misprediction_rate': client.rollbacks / predicted_ticks if predicted_ticks else 0.0,
+        'skipped_deltas': client.skipped_deltas,
+        'confirm_latency_ms': (sum(confirm_latencies) / len(confirm_latencies)
+                               if confirm_latencies else 0.0),
+    }
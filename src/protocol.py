@@ -0,0 +1,310 @@
+"""Binary state-sync protocol for networked play
+
+Four message types share a 5 byte header (type, tick):
+    - Snapshot: full arena state, sent every KEYFRAME_INTERVAL ticks
+    - Delta: one byte per snake (direction + flags) plus food respawns
+    - Input: a client's unconfirmed direction changes, resent until seen
+    - Welcome: the player id a server gave a newly connected client
+
+Deltas replay the move with the same Snake.move/GameBoard.wrap_position
+rules as the server, so the mirrored state stays bit-identical as long
+as no delta is lost.
+"""
+
+import struct
+from collections import namedtuple
+from src.arena import ArenaPlayer
+from src.game_board import GameBoard
+from src.snake import Snake
+from src.direction import DIRECTIONS, to_code
+
+MSG_SNAPSHOT = 1
+MSG_DELTA = 2
+MSG_INPUT = 3
+MSG_WELCOME = 4
+
+# Per-snake flags; the low two bits carry the direction code
+FLAG_GREW = 0x04
+FLAG_DIED = 0x08
+FLAG_ALIVE = 0x10
+DIRECTION_MASK = 0x03
+
+_HEADER = struct.Struct('<BI')            # type, tick
+_SNAPSHOT_INFO = struct.Struct('<HHBB')   # width, height, players, foods
+_SNAPSHOT_PLAYER = struct.Struct('<BHH')  # flags, score, length
+_CELL = struct.Struct('<H')               # y * width + x
+_FOOD_RESPAWN = struct.Struct('<BH')      # food index, cell
+_INPUT_INFO = struct.Struct('<BB')        # player id, entry count
+_INPUT_ENTRY = struct.Struct('<IB')       # tick, direction code
+_RECORD_LENGTH = struct.Struct('<I')      # recorded message length
+
+# Cell indices and body lengths travel as 16-bit values
+MAX_BOARD_CELLS = 0xFFFF
+
+Snapshot = namedtuple("Snapshot", ["tick", "width", "height", "players", "foods"])
+# Directions are decoded as the integer codes of src.direction
+SnapshotPlayer = namedtuple("SnapshotPlayer", ["alive", "heading", "score", "body"])
+Delta = namedtuple("Delta", ["tick", "flags", "respawns"])
+InputBatch = namedtuple("InputBatch", ["tick", "player_id", "inputs"])
+Welcome = namedtuple("Welcome", ["tick", "player_id"])
+
+
+def _encode_cell(position, width):
+    """Pack an (x, y) position into a single cell index"""
+    return position[1] * width + position[0]
+
+
+def check_board_size(width, height):
+    """Make sure every cell of a board fits the 16-bit cell fields
+
+    Raises:
+        ValueError: If the board has more than MAX_BOARD_CELLS cells
+    """
+    if width * height > MAX_BOARD_CELLS:
+        raise ValueError(f"A {width}x{height} board has more than {MAX_BOARD_CELLS} cells, "
+                         "the most the protocol can address")
+
+
+def _decode_cell(cell, width):
+    """Unpack a cell index into an (x, y) position"""
+    return (cell % width, cell // width)
+
+
+def encode_snapshot(arena):
+    """Encode the full state of an arena (or MirrorState)
+
+    Returns:
+        bytes: Snapshot message
+
+    Raises:
+        ValueError: If the board is too large for the protocol
+    """
+    width = arena.board.width
+    check_board_size(width, arena.board.height)
+    foods = arena.food_positions()
+    parts = [
+        _HEADER.pack(MSG_SNAPSHOT, arena.tick),
+        _SNAPSHOT_INFO.pack(width, arena.board.height, len(arena.players), len(foods)),
+    ]
+    for position in foods:
+        parts.append(_CELL.pack(_encode_cell(position, width)))
+    for player in arena.players:
+        snake = player.snake
+        flags = snake.heading
+        if player.alive:
+            flags |= FLAG_ALIVE
+        parts.append(_SNAPSHOT_PLAYER.pack(flags, player.score, len(snake.body)))
+        parts.append(struct.pack(f'<{len(snake.body)}H',
+                                 *[_encode_cell(segment, width) for segment in snake.body]))
+    return b''.join(parts)
+
+
+def encode_delta(arena, result):
+    """Encode the changes produced by one Arena.step() call
+
+    Args:
+        arena: Arena after the step
+        result: ArenaTick returned by the step
+
+    Returns:
+        bytes: Delta message
+    """
+    eaten = set(result.eaten)
+    flags = bytearray(len(arena.players))
+    for index, player in enumerate(arena.players):
+        if player.player_id in result.died:
+            flags[index] = FLAG_DIED
+        elif player.alive:
+            value = player.snake.heading
+            if player.player_id in eaten:
+                value |= FLAG_GREW
+            flags[index] = value
+
+    width = arena.board.width
+    parts = [_HEADER.pack(MSG_DELTA, arena.tick), bytes(flags), bytes((len(result.respawned),))]
+    for food_index in result.respawned:
+        position = arena.foods[food_index].position
+        parts.append(_FOOD_RESPAWN.pack(food_index, _encode_cell(position, width)))
+    return b''.join(parts)
+
+
+def encode_inputs(tick, player_id, inputs):
+    """Encode a batch of (tick, direction) inputs from one client"""
+    parts = [_HEADER.pack(MSG_INPUT, tick), _INPUT_INFO.pack(player_id, len(inputs))]
+    for input_tick, direction in inputs:
+        parts.append(_INPUT_ENTRY.pack(input_tick, to_code(direction)))
+    return b''.join(parts)
+
+
+def encode_welcome(tick, player_id):
+    """Encode the player id assigned to a connecting client"""
+    return _HEADER.pack(MSG_WELCOME, tick) + bytes((player_id,))
+
+
+def decode(data, player_count=None):
+    """Decode any protocol message
+
+    Args:
+        data: Message bytes (or a memoryview over them)
+        player_count: Number of players, required to decode deltas
+
+    Returns:
+        Snapshot, Delta, InputBatch or Welcome
+
+    Raises:
+        ValueError: If the message type is unknown, the message is
+            truncated or an input carries an invalid direction code
+    """
+    try:
+        return _decode(data, player_count)
+    except (struct.error, IndexError):
+        raise ValueError(f"Truncated message of {len(data)} bytes") from None
+
+
+def _decode(data, player_count):
+    """Decode a message; see decode()"""
+    msg_type, tick = _HEADER.unpack_from(data, 0)
+    offset = _HEADER.size
+
+    if msg_type == MSG_SNAPSHOT:
+        width, height, player_total, food_total = _SNAPSHOT_INFO.unpack_from(data, offset)
+        offset += _SNAPSHOT_INFO.size
+        foods = []
+        for _ in range(food_total):
+            foods.append(_decode_cell(_CELL.unpack_from(data, offset)[0], width))
+            offset += _CELL.size
+        players = []
+        for _ in range(player_total):
+            flags, score, length = _SNAPSHOT_PLAYER.unpack_from(data, offset)
+            offset += _SNAPSHOT_PLAYER.size
+            cells = struct.unpack_from(f'<{length}H', data, offset)
+            offset += length * _CELL.size
+            players.append(SnapshotPlayer(
+                bool(flags & FLAG_ALIVE),
+                flags & DIRECTION_MASK,
+                score,
+                [_decode_cell(cell, width) for cell in cells],
+            ))
+        return Snapshot(tick, width, height, players, foods)
+
+    if msg_type == MSG_DELTA:
+        if player_count is None:
+            raise ValueError("player_count is required to decode a delta")
+        if len(data) < offset + player_count + 1:
+            raise ValueError("Truncated delta")
+        flags = bytes(data[offset:offset + player_count])
+        offset += player_count
+        respawn_total = data[offset]
+        offset += 1
+        respawns = []
+        for _ in range(respawn_total):
+            respawns.append(_FOOD_RESPAWN.unpack_from(data, offset))
+            offset += _FOOD_RESPAWN.size
+        return Delta(tick, flags, respawns)
+
+    if msg_type == MSG_INPUT:
+        player_id, total = _INPUT_INFO.unpack_from(data, offset)
+        offset += _INPUT_INFO.size
+        if len(data) != offset + total * _INPUT_ENTRY.size:
+            raise ValueError(f"Input message of {len(data)} bytes for {total} entries")
+        inputs = []
+        for _ in range(total):
+            input_tick, code = _INPUT_ENTRY.unpack_from(data, offset)
+            offset += _INPUT_ENTRY.size
+            if code not in DIRECTIONS:
+                raise ValueError(f"Invalid direction code: {code}")
+            inputs.append((input_tick, code))
+        return InputBatch(tick, player_id, inputs)
+
+    if msg_type == MSG_WELCOME:
+        return Welcome(tick, data[offset])
+
+    raise ValueError(f"Unknown message type: {msg_type}")
+
+
+def write_recording(path, messages):
+    """Write a sequence of messages as a length-prefixed recording file"""
+    with open(path, 'wb') as f:
+        for data in messages:
+            f.write(_RECORD_LENGTH.pack(len(data)))
+            f.write(data)
+
+
+def read_recording(path):
+    """Yield the messages stored in a recording file"""
+    with open(path, 'rb') as f:
+        while True:
+            prefix = f.read(_RECORD_LENGTH.size)
+            if len(prefix) < _RECORD_LENGTH.size:
+                return
+            yield f.read(_RECORD_LENGTH.unpack(prefix)[0])
+
+
+def message_type(data):
+    """Return the type byte of a message without decoding it
+
+    Raises:
+        ValueError: If the message is empty
+    """
+    if not data:
+        raise ValueError("Empty message")
+    return data[0]
+
+
+class MirrorState:
+    """Receiver-side copy of an arena rebuilt from snapshots and deltas"""
+
+    def __init__(self, snapshot):
+        """Initialize the mirror from a decoded snapshot"""
+        self.board = None
+        self.apply_snapshot(snapshot)
+
+    def apply_snapshot(self, snapshot):
+        """Replace the mirrored state with a snapshot"""
+        self.tick = snapshot.tick
+        # Keyframes rarely change the board, and building one is not cheap
+        board = self.board
+        if board is None or (board.width, board.height) != (snapshot.width, snapshot.height):
+            self.board = GameBoard(snapshot.width, snapshot.height)
+        self.foods = list(snapshot.foods)
+        self.players = []
+        for player_id, data in enumerate(snapshot.players):
+            snake = Snake((0, 0), 0, board=self.board)
+            snake.body = [self.board.wrap_position(segment) for segment in data.body]
+            snake.heading = data.heading
+            player = ArenaPlayer(player_id, snake)
+            player.alive = data.alive
+            player.score = data.score
+            self.players.append(player)
+
+    def apply_delta(self, delta):
+        """Replay one tick of changes
+
+        Returns:
+            bool: False if the delta does not follow the current tick
+                (a message was lost), in which case nothing is applied
+        """
+        if delta.tick != self.tick + 1:
+            return False
+
+        wrap_position = self.board.wrap_position
+        for player, flags in zip(self.players, delta.flags):
+            if flags & FLAG_DIED:
+                player.alive = False
+            elif player.alive:
+                snake = player.snake
+                snake.move(flags & DIRECTION_MASK)
+                snake.body[0] = wrap_position(snake.body[0])
+                if flags & FLAG_GREW:
+                    snake.grow()
+                    player.score += 1
+
+        width = self.board.width
+        for food_index, cell in delta.respawns:
+            self.foods[food_index] = _decode_cell(cell, width)
+        self.tick = delta.tick
+        return True
+
+    def food_positions(self):
+        """Return the positions of all food items"""
+        return list(self.foods)
@@ -0,0 +1,139 @@
+"""Runtime configuration profiles
+
+The constants in src.config are the defaults. A profile file (JSON, or
+TOML on Python 3.11+) and SNAKE_* environment variables can override
+them; the result is a frozen GameConfig validated once at startup and
+passed to the game objects that need it.
+
+Example profile (kiosk.toml):
+    board_width = 40
+    board_height = 30
+    render_backend = "surfarray"
+"""
+
+import os
+import json
+from dataclasses import dataclass, fields, replace
+from src.config import (BOARD_WIDTH, BOARD_HEIGHT, GAME_SPEED_INITIAL, GAME_SPEED_MIN,
+                        GAME_SPEED_STEP, INITIAL_SNAKE_LENGTH, RENDER_BACKEND,
+                        RENDER_BACKEND_DRAW, RENDER_BACKEND_SURFARRAY, FRAME_RATE_CAP,
+                        SPEED_SCHEDULE, SPEED_SCHEDULE_LINEAR, SPEED_SCHEDULE_EXPONENTIAL,
+                        SPEED_SCHEDULE_TIERED, SPEED_SCHEDULE_TIME, TELEMETRY_PATH, LEVEL,
+                        TRACE_PATH)
+from src.level import find_level, load_level
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+ENV_PREFIX = "SNAKE_"
+CONFIG_PATH_ENV = "SNAKE_CONFIG"
+
+DEFAULT_HIGH_SCORE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'high_scores.json')
+
+
+@dataclass(frozen=True)
+class GameConfig:
+    """Validated, read-only game settings"""
+
+    board_width: int = BOARD_WIDTH
+    board_height: int = BOARD_HEIGHT
+    level: str = LEVEL
+    game_speed_initial: float = GAME_SPEED_INITIAL
+    game_speed_min: float = GAME_SPEED_MIN
+    game_speed_step: float = GAME_SPEED_STEP
+    speed_schedule: str = SPEED_SCHEDULE
+    initial_snake_length: int = INITIAL_SNAKE_LENGTH
+    render_backend: str = RENDER_BACKEND
+    frame_rate_cap: int = FRAME_RATE_CAP
+    high_score_path: str = DEFAULT_HIGH_SCORE_PATH
+    telemetry_path: str = TELEMETRY_PATH
+    trace_path: str = TRACE_PATH
+
+    def __post_init__(self):
+        """Validate the settings
+
+        Raises:
+            ValueError: If any value is out of range
+        """
+        if self.board_width < 1 or self.board_height < 1:
+            raise ValueError("board_width and board_height must be positive")
+        if self.game_speed_min <= 0 or self.game_speed_initial < self.game_speed_min:
+            raise ValueError("game speeds must satisfy 0 < game_speed_min <= game_speed_initial")
+        if self.game_speed_step < 0:
+            raise ValueError("game_speed_step must not be negative")
+        if self.speed_schedule not in (SPEED_SCHEDULE_LINEAR, SPEED_SCHEDULE_EXPONENTIAL,
+                                       SPEED_SCHEDULE_TIERED, SPEED_SCHEDULE_TIME):
+            raise ValueError(f"Unknown speed_schedule: {self.speed_schedule}")
+        if not 1 <= self.initial_snake_length < self.board_width * self.board_height:
+            raise ValueError("initial_snake_length must fit on the board")
+        if self.render_backend not in (RENDER_BACKEND_DRAW, RENDER_BACKEND_SURFARRAY):
+            raise ValueError(f"Unknown render_backend: {self.render_backend}")
+        if self.frame_rate_cap < 1:
+            raise ValueError("frame_rate_cap must be positive")
+        if not self.high_score_path:
+            raise ValueError("high_score_path must not be empty")
+
+
+DEFAULT_CONFIG = GameConfig()
+
+
+def _read_profile(path):
+    """Read a JSON or TOML profile into a dict"""
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("TOML profiles need Python 3.11+; use JSON instead")
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _coerce(field, value):
+    """Convert a profile or environment value to the field's type"""
+    field_type = field.type
+    if field_type is int and isinstance(value, float) and not value.is_integer():
+        raise ValueError(f"{field.name} must be an integer")
+    try:
+        return field_type(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid value for {field.name}: {value!r}") from None
+
+
+def load_config(path=None, environ=None):
+    """Build a GameConfig from defaults, a profile file and the environment
+
+    Args:
+        path: Profile file (.json or .toml). Defaults to $SNAKE_CONFIG if set.
+        environ: Mapping of environment variables. Defaults to os.environ.
+
+    Returns:
+        GameConfig: The validated configuration
+
+    Raises:
+        ValueError: If the profile has unknown keys or invalid values, or
+            the level is missing, invalid or has no room for the snake
+    """
+    environ = os.environ if environ is None else environ
+    path = path or environ.get(CONFIG_PATH_ENV)
+    by_name = {field.name: field for field in fields(GameConfig)}
+
+    overrides = {}
+    if path:
+        for key, value in _read_profile(path).items():
+            if key not in by_name:
+                raise ValueError(f"Unknown config key: {key}")
+            overrides[key] = _coerce(by_name[key], value)
+    for name, field in by_name.items():
+        value = environ.get(ENV_PREFIX + name.upper())
+        if value is not None:
+            overrides[name] = _coerce(field, value)
+
+    config = replace(DEFAULT_CONFIG, **overrides)
+    if config.level:
+        level_path = find_level(config.level)
+        if not os.path.exists(level_path):
+            raise ValueError(f"Level not found: {config.level}")
+        load_level(level_path, snake_length=config.initial_snake_length)
+    return config
@@ -0,0 +1,315 @@
+"""Game state and input shared between processes
+
+In split mode (snakegame --split) the rules run in their own process and
+pygame only draws, so a slow frame can never delay a tick. The two sides
+talk through two multiprocessing.shared_memory blocks:
+
+    FrameBuffer: the simulation writes each tick's state into one of two
+        slots, each guarded by a sequence counter (odd while being
+        written). The renderer reads the latest published slot in place,
+        through memoryviews, and checks the counter again after drawing;
+        a changed counter means the writer lapped it and the frame is
+        drawn again from the newer slot.
+    InputRing: a single-producer, single-consumer byte ring for direction
+        codes and commands from the renderer. Each side only writes its
+        own index, so neither needs a lock.
+
+Counters are aligned 8-byte words written with one store, which the
+platforms pygame runs on do not tear.
+"""
+
+import time
+import struct
+from array import array
+from collections import deque, namedtuple
+from multiprocessing import shared_memory
+from src.config import (STATE_MENU, STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER,
+                        MAX_CATCHUP_TICKS, SPLIT_INPUT_CAPACITY, SPLIT_POLL_INTERVAL,
+                        SPLIT_READ_RETRIES)
+from src.direction import DIRECTIONS
+from src.settings import DEFAULT_CONFIG
+
+# Screen states as stored in a frame
+STATES = (STATE_MENU, STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
+
+# Input ring commands; direction codes 0-3 are sent as themselves
+COMMAND_START = 4
+COMMAND_PAUSE = 5
+COMMAND_RESUME = 6
+COMMAND_MENU = 7
+COMMAND_QUIT = 8
+
+_WORD = struct.Struct('<Q')
+
+# Slot header: sequence, game number, tick, state, heading, score, body
+# length, food cell, tick interval in seconds
+_FRAME = struct.Struct('<QIIBBxxIIid')
+_CELL = 4
+
+# A consistent frame; body is a view of the slot's cells (y * width + x),
+# head first, valid only while the slot's sequence is still seq
+Frame = namedtuple("Frame", ["slot", "seq", "game", "tick", "state", "heading",
+                             "score", "food", "interval", "body"])
+
+
+def _attach(name, size):
+    """Create a shared block, or attach to an existing one by name"""
+    if name is None:
+        return shared_memory.SharedMemory(create=True, size=size)
+    return shared_memory.SharedMemory(name=name)
+
+
+class FrameBuffer:
+    """Double-buffered game state in shared memory, one writer and one reader"""
+
+    def __init__(self, cells, name=None):
+        """Create the buffer, or attach to one created elsewhere
+
+        Args:
+            cells: Board cells, the longest possible body
+            name: Shared memory name to attach to; None creates a new block
+        """
+        self.cells = cells
+        slot_size = -(-(_FRAME.size + cells * _CELL) // 8) * 8
+        self._slot_size = slot_size
+        self.shm = _attach(name, 8 + 2 * slot_size)
+        self.name = self.shm.name
+        self._owner = name is None
+        self._published = 0
+        buf = self.shm.buf
+        self._offsets = (8, 8 + slot_size)
+        self._bodies = [buf[offset + _FRAME.size:offset + _FRAME.size + cells * _CELL].cast('I')
+                        for offset in self._offsets]
+        if self._owner:
+            buf[:8 + 2 * slot_size] = bytes(8 + 2 * slot_size)
+
+    def __getstate__(self):
+        """Pickle by name, so a spawned process attaches to the same block"""
+        return {'cells': self.cells, 'name': self.name}
+
+    def __setstate__(self, state):
+        """Attach to the block named in the pickled state"""
+        self.__init__(state['cells'], state['name'])
+
+    def publish(self, game, tick, state, heading, score, food, interval, body):
+        """Write one frame into the slot the reader is not using
+
+        Args:
+            game: Game number, so stale frames of an old game can be ignored
+            tick: Simulation tick
+            state: State code from STATE_CODES
+            heading: Direction code of the snake
+            score: Current score
+            food: Food cell (y * width + x)
+            interval: Seconds until the next tick
+            body: Body cells, head first
+        """
+        slot = self._published & 1
+        offset = self._offsets[slot]
+        buf = self.shm.buf
+        seq = _WORD.unpack_from(buf, offset)[0] + 1
+        _WORD.pack_into(buf, offset, seq)
+        length = len(body)
+        _FRAME.pack_into(buf, offset, seq, game, tick, state, heading, score, length, food,
+                         interval)
+        self._bodies[slot][:length] = array('I', body)
+        _WORD.pack_into(buf, offset, seq + 1)
+        self._published += 1
+        _WORD.pack_into(buf, 0, self._published)
+
+    def read(self, retries=SPLIT_READ_RETRIES):
+        """Return the latest consistent Frame without copying the body
+
+        Args:
+            retries: Attempts made while the slot is being rewritten; a
+                writer that died mid-write leaves it odd for good
+
+        Returns:
+            Frame: The newest complete frame, or None before the first one
+                or when no consistent frame was seen within retries
+        """
+        buf = self.shm.buf
+        for _ in range(retries):
+            published = _WORD.unpack_from(buf, 0)[0]
+            if published == 0:
+                return None
+            slot = (published - 1) & 1
+            offset = self._offsets[slot]
+            fields = _FRAME.unpack_from(buf, offset)
+            seq = fields[0]
+            # Odd: mid-write; changed: rewritten while the header was read
+            if seq & 1 or _WORD.unpack_from(buf, offset)[0] != seq:
+                continue
+            _, game, tick, state, heading, score, length, food, interval = fields
+            body = self._bodies[slot][:min(length, self.cells)]
+            return Frame(slot, seq, game, tick, state, heading, score, food, interval, body)
+        return None
+
+    def is_current(self, frame):
+        """Return True if the frame's slot has not been rewritten since read()"""
+        return _WORD.unpack_from(self.shm.buf, self._offsets[frame.slot])[0] == frame.seq
+
+    def close(self):
+        """Detach, and free the block if this side created it
+
+        Frames returned by read() must be dropped first.
+        """
+        for body in self._bodies:
+            body.release()
+        self._bodies = []
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+class InputRing:
+    """Lock-free single-producer, single-consumer byte queue in shared memory"""
+
+    # Write index, read index on its own cache line, then the data
+    _READ = 64
+    _DATA = 128
+
+    def __init__(self, capacity=SPLIT_INPUT_CAPACITY, name=None):
+        """Create the ring, or attach to one created elsewhere
+
+        Args:
+            capacity: Bytes held before push() starts dropping
+            name: Shared memory name to attach to; None creates a new block
+        """
+        self.capacity = capacity
+        self.shm = _attach(name, self._DATA + capacity)
+        self.name = self.shm.name
+        self._owner = name is None
+        if self._owner:
+            self.shm.buf[:self._DATA] = bytes(self._DATA)
+
+    def __getstate__(self):
+        """Pickle by name, so a spawned process attaches to the same block"""
+        return {'capacity': self.capacity, 'name': self.name}
+
+    def __setstate__(self, state):
+        """Attach to the block named in the pickled state"""
+        self.__init__(state['capacity'], state['name'])
+
+    def push(self, value):
+        """Append one byte (producer side only)
+
+        Returns:
+            bool: False if the ring was full and the value was dropped
+        """
+        buf = self.shm.buf
+        write = _WORD.unpack_from(buf, 0)[0]
+        if write - _WORD.unpack_from(buf, self._READ)[0] >= self.capacity:
+            return False
+        buf[self._DATA + write % self.capacity] = value
+        _WORD.pack_into(buf, 0, write + 1)
+        return True
+
+    def pop_all(self):
+        """Remove and return every queued byte in order (consumer side only)"""
+        buf = self.shm.buf
+        read = _WORD.unpack_from(buf, self._READ)[0]
+        write = _WORD.unpack_from(buf, 0)[0]
+        if read == write:
+            return []
+        capacity = self.capacity
+        values = [buf[self._DATA + index % capacity] for index in range(read, write)]
+        _WORD.pack_into(buf, self._READ, write)
+        return values
+
+    def close(self):
+        """Detach, and free the block if this side created it"""
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+
+def run_simulation(frames, inputs, config=None, autopilot=None):
+    """Own the rules and tick on schedule until COMMAND_QUIT arrives
+
+    Runs in the simulation process of split mode. Commands and direction
+    codes are read from the InputRing between ticks, ticks run on the same
+    deadline schedule as SnakeGame.run, and a frame is published after
+    every change.
+
+    Args:
+        frames (FrameBuffer): Where frames are published
+        inputs (InputRing): Where the renderer's commands arrive
+        config (GameConfig, optional): Game settings
+        autopilot: Optional bot asked for a direction before every tick
+    """
+    from src.game_board import GameBoard
+    from src.difficulty import Difficulty, create_schedule
+    from src.simulation import Simulation, new_seed, queue_direction
+
+    config = config if config is not None else DEFAULT_CONFIG
+    board = GameBoard.from_config(config)
+    difficulty = Difficulty(create_schedule(config))
+    width = board.width
+    simulation = None
+    state = STATE_CODES[STATE_MENU]
+    game = 0
+    queue = deque()
+    next_tick = time.perf_counter()
+
+    def publish():
+        """Publish the current game as a frame"""
+        snake = simulation.snake
+        food_x, food_y = simulation.food.position
+        frames.publish(game, simulation.tick, state, snake.heading, simulation.score,
+                       food_y * width + food_x, simulation.game_speed,
+                       [y * width + x for x, y in snake.body])
+
+    while True:
+        for value in inputs.pop_all():
+            if value in DIRECTIONS:
+                if state == STATE_CODES[STATE_PLAYING]:
+                    queue_direction(queue, simulation.snake.heading, value)
+                continue
+            if value == COMMAND_START:
+                game += 1
+                simulation = Simulation(new_seed(), config, board, difficulty)
+                queue.clear()
+                state = STATE_CODES[STATE_PLAYING]
+                next_tick = time.perf_counter()
+            elif value == COMMAND_PAUSE and state == STATE_CODES[STATE_PLAYING]:
+                state = STATE_CODES[STATE_PAUSED]
+            elif value == COMMAND_RESUME and state == STATE_CODES[STATE_PAUSED]:
+                state = STATE_CODES[STATE_PLAYING]
+                next_tick = time.perf_counter()
+            elif value == COMMAND_MENU:
+                state = STATE_CODES[STATE_MENU]
+            elif value == COMMAND_QUIT:
+                return
+            else:
+                continue
+            if simulation is not None:
+                publish()
+
+        if state != STATE_CODES[STATE_PLAYING]:
+            time.sleep(SPLIT_POLL_INTERVAL)
+            continue
+
+        now = time.perf_counter()
+        ticks = 0
+        while now >= next_tick:
+            if autopilot is not None:
+                queue_direction(queue, simulation.snake.heading,
+                                autopilot.choose_direction(simulation))
+            simulation.step(queue.popleft() if queue else None)
+            next_tick += simulation.game_speed
+            ticks += 1
+            if simulation.death_cause is not None:
+                state = STATE_CODES[STATE_GAME_OVER]
+                break
+            if ticks >= MAX_CATCHUP_TICKS:
+                next_tick = max(next_tick, now)
+                break
+        if ticks:
+            publish()
+
+        # Wake for the next tick, or sooner to pick up commands
+        delay = min(next_tick - time.perf_counter(), SPLIT_POLL_INTERVAL)
+        if delay > 0:
+            time.sleep(delay)
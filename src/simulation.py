@@ -0,0 +1,174 @@
+"""Game rules without pygame
+
+The per-tick rules (turning, moving, eating, wrapping, collisions) live
+here as functions over any object with board, snake, food and score
+attributes, so SnakeGame.update() and the headless Simulation run exactly
+the same code. Food spawns come from a random.Random seeded per game,
+which makes a game reproducible from its seed and the direction changes
+applied to it (a Replay).
+"""
+
+import random
+from collections import namedtuple
+from src.snake import Snake
+from src.food import Food
+from src.game_board import GameBoard
+from src.difficulty import Difficulty, create_schedule
+from src.direction import RIGHT, OPPOSITE
+from src.settings import DEFAULT_CONFIG
+from src.config import INPUT_QUEUE_DEPTH
+from src.telemetry import DEATH_SELF, DEATH_WALL
+
+# A finished game: the food seed, the applied direction changes as
+# (tick, direction code) pairs in tick order, and the final score and
+# tick (the tick the snake died on)
+Replay = namedtuple("Replay", ["seed", "inputs", "score", "ticks"])
+
+
+def new_seed():
+    """Return a fresh 32-bit game seed"""
+    return random.getrandbits(32)
+
+
+def start_position(board):
+    """Return where a new snake's head starts on a board"""
+    if board.level is not None:
+        return board.level.spawn
+    return (board.width // 2, board.height // 2)
+
+
+def create_snake(board, length):
+    """Return a new board-attached snake heading right"""
+    snake = Snake(start_position(board), length, board=board)
+    snake.heading = RIGHT
+    return snake
+
+
+def create_food(board, snake, rng):
+    """Return food spawned from rng on a cell the snake does not cover"""
+    food = Food(board, rng=rng)
+    food.spawn(exclude_positions=snake.body)
+    return food
+
+
+def queue_direction(queue, heading, direction, depth=INPUT_QUEUE_DEPTH):
+    """Buffer a direction code for an upcoming tick
+
+    The request is validated against the heading the snake will have once
+    everything already queued has been applied, so UP then LEFT pressed
+    within one tick become two consecutive turns.
+
+    Returns:
+        bool: True if the direction was queued
+    """
+    last = queue[-1] if queue else heading
+    if direction == last or direction == OPPOSITE[last] or len(queue) >= depth:
+        return False
+    queue.append(direction)
+    return True
+
+
+def turn(snake, direction):
+    """Point the snake in a direction code unless that would reverse it
+
+    Returns:
+        bool: True if the heading changed
+    """
+    if direction == snake.heading or direction == OPPOSITE[snake.heading]:
+        return False
+    snake.heading = direction
+    return True
+
+
+def advance(state):
+    """Move state.snake one cell and resolve eating
+
+    Args:
+        state: Object with board, snake, food and score attributes
+            (a SnakeGame or a Simulation); its score is updated
+
+    Returns:
+        bool: True if the snake ate this tick
+    """
+    snake = state.snake
+    snake.move(snake.heading)
+    head = snake.body[0]
+    board = state.board
+    # Board-attached snakes already wrapped
+    head_x, head_y = head
+    if not (0 <= head_x < board.width and 0 <= head_y < board.height):
+        head = snake.body[0] = board.wrap_position(head)
+
+    if head != state.food.position:
+        return False
+    snake.grow()
+    state.score += 1
+    state.food.spawn(exclude_positions=snake.body)
+    return True
+
+
+def collision_cause(board, snake):
+    """Return why the snake died this tick, or None if it is still alive"""
+    head = snake.body[0]
+    # Wall lookup is a single bit test in the level's bitmap
+    level = board.level
+    if level is not None and level.is_wall(head):
+        return DEATH_WALL
+    # The head is always in the body once; a second copy means it bit itself
+    if snake.body.count(head) > 1:
+        return DEATH_SELF
+    return None
+
+
+class Simulation:
+    """One game played by the rules alone, with no rendering or input handling"""
+
+    def __init__(self, seed, config=None, board=None, difficulty=None, timed=True):
+        """Initialize a game
+
+        Args:
+            seed: Seed for food spawns
+            config (GameConfig, optional): Game settings. Defaults to the
+                built-in defaults.
+            board (GameBoard, optional): Board built from config, to share
+                between many simulations
+            difficulty (Difficulty, optional): Difficulty built from config,
+                to share between simulations run one after another
+            timed: Track play time and the tick interval. They never change
+                the outcome, so verification turns this off.
+        """
+        config = config if config is not None else DEFAULT_CONFIG
+        self.board = board if board is not None else GameBoard.from_config(config)
+        self.difficulty = difficulty if difficulty is not None else Difficulty(create_schedule(config))
+        self.difficulty.reset()
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.snake = create_snake(self.board, config.initial_snake_length)
+        self.food = create_food(self.board, self.snake, self.rng)
+        self.score = 0
+        self.tick = 0
+        self.play_time = 0.0
+        self.game_speed = self.difficulty.interval
+        self.death_cause = None
+        self.inputs = []
+        self.timed = timed
+
+    def step(self, direction=None):
+        """Run one tick, turning first if a direction code is given
+
+        Returns:
+            bool: True if the snake ate this tick
+        """
+        self.tick += 1
+        if direction is not None and turn(self.snake, direction):
+            self.inputs.append((self.tick, direction))
+        ate = advance(self)
+        if self.timed:
+            self.play_time += self.game_speed
+            self.game_speed = self.difficulty.update(self.score, self.play_time)
+        self.death_cause = collision_cause(self.board, self.snake)
+        return ate
+
+    def replay(self):
+        """Return the Replay of the game so far"""
+        return Replay(self.seed, list(self.inputs), self.score, self.tick)
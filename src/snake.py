@@ -1,46 +1,73 @@
 """Snake class for the game"""
 
+from src.direction import UP, DX, DY, DIRECTION_NAMES, to_code
+
 class Snake:
     """Represents the snake in the game"""
     
-    def __init__(self, initial_position, length=3):
+    def __init__(self, initial_position, length=3, board=None):
         """
         Initialize snake with starting position and length
         
         Args:
             initial_position: Tuple (x, y) for head position
             length: Initial snake body length
+            board (GameBoard, optional): Board whose neighbour table drives
+                movement. Moves then wrap around the edges and reuse the
+                board's cell tuples instead of allocating new ones.
         """
-        self.direction = 'UP'
+        self.heading = UP
         self.body = []
+        self.board = None
+        self.neighbours = None
         
         # Body extends upward from initial position
         for i in range(length):
             self.body.append((initial_position[0], initial_position[1] - i))
+
+        if board is not None:
+            self.board = board
+            self.neighbours = board.neighbours
+            self.body = [board.wrap_position(segment) for segment in self.body]
+
+    @property
+    def direction(self):
+        """Current direction as a name ('UP', 'RIGHT', ...)"""
+        return DIRECTION_NAMES[self.heading]
+
+    @direction.setter
+    def direction(self, value):
+        """Set the current direction from a name or a code"""
+        self.heading = to_code(value)
+    
+    def next_head_position(self, direction):
+        """Return the cell the head would move to in the given direction"""
+        code = to_code(direction)
+        return self._step(self.body[0], code)
+
+    def _step(self, head, code):
+        """Return the cell one step from head, from the board table when possible"""
+        if self.board is not None:
+            steps = self.board.steps(head)
+            if steps is not None:
+                return steps[code]
+        head_x, head_y = head
+        return (head_x + DX[code], head_y + DY[code])
     
     def move(self, direction):
-        """Move the snake in the given direction"""
-        self.direction = direction
-        
-        # Calculate new head position based on direction
-        head_x, head_y = self.body[0]
+        """Move the snake in the given direction (a code or a name)"""
+        code = self.heading = direction if direction.__class__ is int else to_code(direction)
+        body = self.body
         
-        if direction == 'UP':
-            new_head = (head_x, head_y - 1)
-        elif direction == 'DOWN':
-            new_head = (head_x, head_y + 1)
-        elif direction == 'LEFT':
-            new_head = (head_x - 1, head_y)
-        elif direction == 'RIGHT':
-            new_head = (head_x + 1, head_y)
-        else:
-            new_head = (head_x, head_y)
+        # Look up the new head position (inlined _step: this runs every tick)
+        steps = self.neighbours.get(body[0]) if self.neighbours is not None else None
+        new_head = steps[code] if steps is not None else self._step(body[0], code)
         
         # Add new head to front of body
-        self.body.insert(0, new_head)
+        body.insert(0, new_head)
         
         # Remove tail (snake moves, doesn't grow)
-        self.body.pop()
+        body.pop()
     
     def grow(self):
         """Grow the snake by one segment"""
@@ -0,0 +1,229 @@
+"""Long-run memory soak test
+
+Plays SnakeGame unattended (GreedyBot, SDL dummy driver) for hours of
+simulated ticks as fast as the machine allows, rendering every tick as a
+kiosk would. The game opens a real display surface under the dummy
+driver, so converted text surfaces and display flips are covered; the
+soak calls the tick and render steps itself, though, so the real-time
+pacing of SnakeGame.run() (sleeps, idle event waits) is not exercised.
+After a warm-up game, tracemalloc snapshots taken every
+SOAK_SNAPSHOT_INTERVAL simulated seconds are compared with the baseline
+to find the lines of src/game.py whose allocations keep growing. The run
+fails if resident memory or the number of live objects grows past its
+budget.
+
+    python -m src.soak --hours 4 --rss-budget-mb 16
+"""
+
+import os
+import gc
+import sys
+import time
+import argparse
+import tempfile
+import tracemalloc
+import dataclasses
+from dataclasses import dataclass, field
+from src.config import (STATE_PLAYING, SOAK_HOURS, SOAK_SNAPSHOT_INTERVAL,
+                        SOAK_RSS_BUDGET_MB, SOAK_OBJECT_BUDGET, SOAK_TOP_LINES)
+from src.settings import DEFAULT_CONFIG
+
+
+def resident_memory():
+    """Return the process's resident set size in bytes
+
+    Reads /proc where available; elsewhere falls back to the peak RSS,
+    which still catches steady growth.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+@dataclass
+class SoakSample:
+    """Memory readings at one snapshot"""
+
+    simulated_seconds: float
+    ticks: int
+    games: int
+    rss: int
+    objects: int
+    traced: int
+
+
+@dataclass
+class SoakReport:
+    """Outcome of a soak run"""
+
+    baseline: SoakSample
+    samples: list = field(default_factory=list)
+    hot_spots: list = field(default_factory=list)
+    failures: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def passed(self):
+        """Return True if every budget held"""
+        return not self.failures
+
+    def format(self):
+        """Return a human-readable summary"""
+        last = self.samples[-1] if self.samples else self.baseline
+        mb = 1024 * 1024
+        lines = [
+            f"Simulated {last.simulated_seconds / 3600:.2f} h ({last.ticks} ticks, "
+            f"{last.games} games) in {self.elapsed:.1f} s",
+            f"RSS: {self.baseline.rss / mb:.1f} MB -> {last.rss / mb:.1f} MB",
+            f"Objects: {self.baseline.objects} -> {last.objects}",
+            f"Traced: {self.baseline.traced / mb:.2f} MB -> {last.traced / mb:.2f} MB",
+            "Allocation growth in src/game.py:",
+        ]
+        for stat in self.hot_spots:
+            frame = stat.traceback[0]
+            lines.append(f"  line {frame.lineno}: {stat.size_diff:+d} B "
+                         f"({stat.count_diff:+d} blocks, {stat.size} B live)")
+        if not self.hot_spots:
+            lines.append("  (none)")
+        lines.append("PASS" if self.passed else "FAIL: " + "; ".join(self.failures))
+        return "\n".join(lines)
+
+
+class SoakTest:
+    """Drives a game on the dummy display with a bot and watches its memory"""
+
+    def __init__(self, hours=SOAK_HOURS, snapshot_interval=SOAK_SNAPSHOT_INTERVAL,
+                 rss_budget_mb=SOAK_RSS_BUDGET_MB, object_budget=SOAK_OBJECT_BUDGET,
+                 top_lines=SOAK_TOP_LINES, config=None):
+        """Initialize a soak run
+
+        Args:
+            hours: Simulated play time, summed over tick intervals
+            snapshot_interval: Simulated seconds between snapshots
+            rss_budget_mb: Allowed RSS growth over the baseline, in MB
+            object_budget: Allowed growth in GC-tracked objects
+            top_lines: Hot spots kept in the report
+            config (GameConfig, optional): Game settings. High scores are
+                always written to a temporary file.
+        """
+        self.hours = hours
+        self.snapshot_interval = snapshot_interval
+        self.rss_budget = rss_budget_mb * 1024 * 1024
+        self.object_budget = object_budget
+        self.top_lines = top_lines
+        self.config = config if config is not None else DEFAULT_CONFIG
+
+        self.game = None
+        self.simulated_seconds = 0.0
+        self.ticks = 0
+        self.games = 0
+
+    def run(self):
+        """Play for the configured time and return a SoakReport"""
+        # Imported here so SDL_VIDEODRIVER is set before pygame starts
+        os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+        import pygame
+        from src import game as game_module
+        from src.bot import GreedyBot
+
+        started = time.perf_counter()
+        with tempfile.TemporaryDirectory() as directory:
+            config = dataclasses.replace(
+                self.config,
+                high_score_path=os.path.join(directory, 'high_scores.json'),
+                telemetry_path="",
+            )
+            self.game = game_module.SnakeGame(config=config)
+            self.game.autopilot = GreedyBot()
+            game_filter = [tracemalloc.Filter(True, game_module.__file__)]
+
+            tracemalloc.start()
+            try:
+                # Warm up caches (fonts, text, layout) before the baseline
+                self._play_until(min(self.snapshot_interval, self.hours * 3600))
+                baseline_snapshot = tracemalloc.take_snapshot().filter_traces(game_filter)
+                report = SoakReport(self._sample())
+
+                end = self.hours * 3600
+                while self.simulated_seconds < end:
+                    self._play_until(min(self.simulated_seconds + self.snapshot_interval, end))
+                    snapshot = tracemalloc.take_snapshot().filter_traces(game_filter)
+                    sample = self._sample()
+                    report.samples.append(sample)
+                    report.hot_spots = [
+                        stat for stat in snapshot.compare_to(baseline_snapshot, 'lineno')
+                        if stat.size_diff > 0
+                    ][:self.top_lines]
+                    report.failures = self._check_budgets(report.baseline, sample)
+                    if report.failures:
+                        break
+            finally:
+                tracemalloc.stop()
+                pygame.display.quit()
+
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def _play_until(self, simulated_seconds):
+        """Tick and render until the simulated clock reaches simulated_seconds"""
+        game = self.game
+        while self.simulated_seconds < simulated_seconds:
+            if game.current_state != STATE_PLAYING:
+                game._start_game()
+                self.games += 1
+            game.handle_input()
+            self.simulated_seconds += game.game_speed
+            game.update()
+            game.render()
+            self.ticks += 1
+
+    def _sample(self):
+        """Take the current memory readings"""
+        gc.collect()
+        return SoakSample(
+            simulated_seconds=self.simulated_seconds,
+            ticks=self.ticks,
+            games=self.games,
+            rss=resident_memory(),
+            objects=len(gc.get_objects()),
+            traced=tracemalloc.get_traced_memory()[0],
+        )
+
+    def _check_budgets(self, baseline, sample):
+        """Return a description of every budget the sample exceeds"""
+        failures = []
+        rss_growth = sample.rss - baseline.rss
+        if rss_growth > self.rss_budget:
+            failures.append(f"RSS grew by {rss_growth / (1024 * 1024):.1f} MB")
+        object_growth = sample.objects - baseline.objects
+        if object_growth > self.object_budget:
+            failures.append(f"{object_growth} more live objects")
+        return failures
+
+
+def main(argv=None):
+    """Run a soak test and exit non-zero if a budget was exceeded"""
+    parser = argparse.ArgumentParser(description="Play unattended and check memory stays flat")
+    parser.add_argument("--hours", type=float, default=SOAK_HOURS,
+                        help="Simulated play time")
+    parser.add_argument("--snapshot-every", type=float, default=SOAK_SNAPSHOT_INTERVAL,
+                        help="Simulated seconds between snapshots")
+    parser.add_argument("--rss-budget-mb", type=float, default=SOAK_RSS_BUDGET_MB)
+    parser.add_argument("--object-budget", type=int, default=SOAK_OBJECT_BUDGET)
+    parser.add_argument("--top", type=int, default=SOAK_TOP_LINES,
+                        help="Allocation hot spots to report")
+    args = parser.parse_args(argv)
+
+    report = SoakTest(args.hours, args.snapshot_every, args.rss_budget_mb,
+                      args.object_budget, args.top).run()
+    print(report.format())
+    return 0 if report.passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
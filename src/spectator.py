@@ -0,0 +1,160 @@
+"""Spectator broadcast with shared, encode-once frames
+
+Each tick is encoded exactly once with the protocol encoders. The
+resulting bytes are wrapped in a read-only memoryview and that same view
+is queued for every subscriber, so adding viewers never adds
+serialization work.
+"""
+
+import time
+import random
+from collections import deque
+from src.arena import Arena
+from src.config import KEYFRAME_INTERVAL, SPECTATOR_QUEUE_LIMIT
+from src.protocol import encode_delta, encode_snapshot
+
+
+class Subscriber:
+    """Bounded frame queue for one spectator"""
+
+    def __init__(self, max_queue=SPECTATOR_QUEUE_LIMIT):
+        """Initialize an empty queue"""
+        self.max_queue = max_queue
+        self.queue = deque()
+        self.dropped = 0
+        self.resyncing = False
+
+    def offer(self, frame, is_keyframe):
+        """Queue a frame, dropping or coalescing for slow consumers
+
+        A keyframe replaces anything still queued. When the queue is full
+        the backlog is discarded and deltas are ignored until the next
+        keyframe, since a delta is useless without its predecessors.
+        """
+        queue = self.queue
+        if is_keyframe:
+            self.dropped += len(queue)
+            queue.clear()
+            queue.append(frame)
+            self.resyncing = False
+        elif self.resyncing:
+            self.dropped += 1
+        elif len(queue) >= self.max_queue:
+            self.dropped += len(queue) + 1
+            queue.clear()
+            self.resyncing = True
+        else:
+            queue.append(frame)
+
+    def poll(self):
+        """Return the next frame, or None if the queue is empty"""
+        if self.queue:
+            return self.queue.popleft()
+        return None
+
+    def drain(self):
+        """Return and remove every queued frame"""
+        frames = list(self.queue)
+        self.queue.clear()
+        return frames
+
+
+class SpectatorBroadcaster:
+    """Fans out one arena's frames to many subscribers"""
+
+    def __init__(self, keyframe_interval=KEYFRAME_INTERVAL, max_queue=SPECTATOR_QUEUE_LIMIT):
+        """Initialize the broadcaster
+
+        Args:
+            keyframe_interval: Ticks between full snapshots
+            max_queue: Frames a subscriber may fall behind before resyncing
+        """
+        self.keyframe_interval = keyframe_interval
+        self.max_queue = max_queue
+        self.subscribers = []
+        self._keyframe = None
+        self._since_keyframe = []
+
+    def publish(self, arena, result=None):
+        """Encode the arena's latest tick once and queue it for everyone
+
+        Args:
+            arena: Arena after its step
+            result: ArenaTick from the step, or None to force a keyframe
+
+        Returns:
+            memoryview: The shared frame
+        """
+        is_keyframe = result is None or arena.tick % self.keyframe_interval == 0
+        if is_keyframe:
+            frame = memoryview(encode_snapshot(arena))
+            self._keyframe = frame
+            self._since_keyframe = []
+        else:
+            frame = memoryview(encode_delta(arena, result))
+            self._since_keyframe.append(frame)
+
+        for subscriber in self.subscribers:
+            subscriber.offer(frame, is_keyframe)
+        return frame
+
+    def subscribe(self):
+        """Add a spectator, synced from the latest keyframe
+
+        Returns:
+            Subscriber: Queue preloaded with the keyframe and later deltas
+        """
+        subscriber = Subscriber(self.max_queue)
+        if self._keyframe is not None:
+            subscriber.offer(self._keyframe, True)
+            for frame in self._since_keyframe:
+                subscriber.offer(frame, False)
+        self.subscribers.append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber):
+        """Remove a spectator"""
+        self.subscribers.remove(subscriber)
+
+
+def measure_fanout(subscriber_count=1000, snake_count=8, tick_rate=20, ticks=200, seed=0):
+    """Measure broadcaster CPU cost and derive subscribers per core
+
+    Every subscriber drains its queue each tick, as a fast consumer would,
+    but only the publish call is timed.
+
+    Returns:
+        dict: CPU seconds per tick and the subscriber count one core could
+            serve at tick_rate
+    """
+    rng = random.Random(seed)
+    arena = Arena(64, 64, food_count=8, rng=rng)
+    for index in range(snake_count):
+        arena.add_snake((4 + index * 7, 32))
+    broadcaster = SpectatorBroadcaster()
+    subscribers = [broadcaster.subscribe() for _ in range(subscriber_count)]
+    broadcaster.publish(arena)
+
+    busy = 0.0
+    for _ in range(ticks):
+        directions = {player.player_id: rng.choice(('UP', 'DOWN', 'LEFT', 'RIGHT'))
+                      for player in arena.alive_players()}
+        result = arena.step(directions)
+        start = time.process_time()
+        broadcaster.publish(arena, result)
+        busy += time.process_time() - start
+        for subscriber in subscribers:
+            subscriber.drain()
+
+    seconds_per_tick = busy / ticks
+    per_subscriber = seconds_per_tick / subscriber_count
+    return {
+        'subscribers': subscriber_count,
+        'tick_rate': tick_rate,
+        'cpu_seconds_per_tick': seconds_per_tick,
+        'subscribers_per_core': int(1.0 / (per_subscriber * tick_rate)) if per_subscriber else 0,
+    }
+
+
+if __name__ == "__main__":
+    print(measure_fanout())
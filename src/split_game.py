@@ -0,0 +1,177 @@
+"""Two-process SnakeGame: rules in one process, pygame in the other
+
+SplitGame keeps SnakeGame's screens, input handling and drawing, but the
+snake is simulated by src.shared_state.run_simulation in a child process.
+Each loop the renderer sends key presses and screen changes through the
+InputRing, reads the newest frame from the FrameBuffer and draws it
+straight from shared memory. Ticks are timed by the child alone, so a slow
+frame only drops frames, never ticks.
+
+Telemetry and traces are recorded by the single-process game only.
+"""
+
+import time
+import dataclasses
+import multiprocessing
+import pygame
+from src.game import SnakeGame
+from src.settings import DEFAULT_CONFIG
+from src.config import STATE_MENU, STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER
+from src.direction import to_code
+from src.shared_state import (FrameBuffer, InputRing, STATES, run_simulation, COMMAND_START,
+                              COMMAND_PAUSE, COMMAND_RESUME, COMMAND_MENU, COMMAND_QUIT)
+
+# Command sent when the renderer switches to a screen on its own
+STATE_COMMANDS = {STATE_PLAYING: COMMAND_RESUME, STATE_PAUSED: COMMAND_PAUSE,
+                  STATE_MENU: COMMAND_MENU}
+
+
+class SplitGame(SnakeGame):
+    """SnakeGame whose simulation runs in a separate process"""
+
+    def __init__(self, headless=False, config=None):
+        """Initialize the renderer and the shared memory blocks
+
+        Args:
+            headless: Render offscreen (see SnakeGame)
+            config (GameConfig, optional): Runtime settings; the telemetry
+                and trace paths are ignored
+        """
+        config = config if config is not None else DEFAULT_CONFIG
+        # Leave existing telemetry and trace files untouched
+        super().__init__(headless, dataclasses.replace(config, telemetry_path="", trace_path=""))
+        # Frames hold cell indices, which the sprite path draws directly
+        self.board_renderer = None
+        self.frames = FrameBuffer(self.board.width * self.board.height)
+        self.inputs = InputRing()
+        self.process = None
+        self.frame = None
+        self._game = 0
+        self._sent_state = self.current_state
+
+    def start(self):
+        """Start the simulation process"""
+        self.process = multiprocessing.Process(
+            target=run_simulation, args=(self.frames, self.inputs, self.config, self.autopilot),
+            daemon=True)
+        self.process.start()
+
+    def close(self):
+        """Stop the simulation process and free the shared memory"""
+        if self.process is not None:
+            self.inputs.push(COMMAND_QUIT)
+            self.process.join(timeout=2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        self.frame = None
+        self.frames.close()
+        self.inputs.close()
+
+    def run(self):
+        """Handle input and draw the newest frame until the player quits"""
+        frame_interval = 1.0 / self.config.frame_rate_cap
+        last_frame = 0.0
+        self.start()
+        try:
+            while self.game_running:
+                if self.current_state == STATE_PLAYING:
+                    self._set_idle_events(False)
+                    self.handle_input()
+                else:
+                    self._set_idle_events(True)
+                    if self._warmup is not None:
+                        self._wait_for_events(timeout_ms=0)
+                        self._run_warmup_step()
+                    else:
+                        self._wait_for_events()
+                self._send_state()
+                self._sync_frame()
+
+                if self._needs_render():
+                    self.render()
+                    last_frame = time.perf_counter()
+                    # The simulation rewrote the slot mid-draw: draw again
+                    if self.frame is not None and not self.frames.is_current(self.frame):
+                        self.needs_redraw = True
+
+                if self.current_state == STATE_PLAYING:
+                    delay = last_frame + frame_interval - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+        finally:
+            self.close()
+        pygame.quit()
+
+    def _send_state(self):
+        """Tell the simulation about pause, resume and menu changes"""
+        if self.current_state == self._sent_state:
+            return
+        command = STATE_COMMANDS.get(self.current_state)
+        if command is not None:
+            self.inputs.push(command)
+        self._sent_state = self.current_state
+
+    def _sync_frame(self):
+        """Adopt the newest frame of the current game, ending it if the snake died"""
+        frame = self.frames.read()
+        if frame is None or frame.game != self._game:
+            return
+        current = self.frame
+        if current is None or (frame.slot, frame.seq) != (current.slot, current.seq):
+            self.frame = frame
+            self.score = frame.score
+            self.tick = frame.tick
+            self.needs_redraw = True
+        if STATES[frame.state] == STATE_GAME_OVER and self.current_state in (STATE_PLAYING,
+                                                                             STATE_PAUSED):
+            self._finish_game()
+
+    def _finish_game(self):
+        """Show the game over screen and record the score"""
+        self.game_over = True
+        self.current_state = STATE_GAME_OVER
+        self._sent_state = STATE_GAME_OVER
+        self.is_new_high_score = self.high_score_manager.update_score(self.score)
+        self.high_score_manager.update_last_game_score(self.score)
+
+    def _start_game(self):
+        """Ask the simulation for a new game"""
+        self._finish_warmup()
+        self._game += 1
+        self.frame = None
+        self.score = 0
+        self.tick = 0
+        self.game_over = False
+        self.is_new_high_score = False
+        self.current_state = STATE_PLAYING
+        self._sent_state = STATE_PLAYING
+        self.game_running = True
+        self.inputs.push(COMMAND_START)
+
+    def _queue_direction(self, new_dir):
+        """Send a direction change; the simulation validates and buffers it"""
+        self.inputs.push(to_code(new_dir))
+
+    def _ticks_per_second(self):
+        """Return the tick rate of the simulated game"""
+        if self.frame is None:
+            return self.difficulty.ticks_per_second
+        return 1.0 / self.frame.interval
+
+    def _draw_board_sprites(self):
+        """Blit walls, food and snake from the frame's cell indices"""
+        cell_rects = self.layout.cell_rects
+        sprites = self.layout.sprites
+        if self.layout.wall_draw_list:
+            self.window.blits(self.layout.wall_draw_list, doreturn=False)
+        frame = self.frame
+        if frame is None:
+            return
+
+        body_sprite = sprites['body']
+        draw_list = [(sprites['food'], cell_rects[frame.food])]
+        draw_list.extend([(body_sprite, cell_rects[cell]) for cell in frame.body])
+        if len(draw_list) > 1:
+            draw_list[1] = (sprites['head'], draw_list[1][1])
+        self.window.blits(draw_list, doreturn=False)
@@ -0,0 +1,117 @@
+"""Surface-array board renderer for very large boards
+
+The board is kept as a (W, H) segment-count grid that is patched as the
+snake moves (head in, tail out). Each frame the grid is mapped through a
+colour palette, written to a board-resolution surface with
+pygame.surfarray.blit_array and scaled to the game area in one call, so
+the cost depends on the board size rather than the snake length.
+"""
+
+import numpy as np
+import pygame
+from src.config import COLOR_BACKGROUND, COLOR_SNAKE_BODY, COLOR_SNAKE_HEAD, COLOR_FOOD, COLOR_WALL
+
+# Colour indices into the palette
+CELL_EMPTY = 0
+CELL_BODY = 1
+CELL_HEAD = 2
+CELL_FOOD = 3
+CELL_WALL = 4
+
+
+class SurfarrayBoardRenderer:
+    """Renders the board from a NumPy colour-index grid"""
+
+    def __init__(self, width, height, walls=()):
+        """Initialize grids and surfaces for a board of the given size
+
+        Args:
+            width: Board width in cells
+            height: Board height in cells
+            walls: (x, y) positions of maze walls
+        """
+        self.width = width
+        self.height = height
+        self.counts = np.zeros((width, height), dtype=np.int32)
+        self.palette = np.array(
+            [COLOR_BACKGROUND, COLOR_SNAKE_BODY, COLOR_SNAKE_HEAD, COLOR_FOOD, COLOR_WALL], dtype=np.uint8
+        )
+        self.wall_mask = np.zeros((width, height), dtype=bool)
+        for x, y in walls:
+            self.wall_mask[x, y] = True
+        self._index = np.zeros((width, height), dtype=np.uint8)
+        self._rgb = np.zeros((width, height, 3), dtype=np.uint8)
+        self.board_surface = pygame.Surface((width, height))
+        self._scaled = None
+
+        # State seen by the previous sync()
+        self._snake = None
+        self._body = None
+        self._head = None
+        self._tail = None
+        self._length = 0
+
+    def sync(self, snake):
+        """Bring the count grid up to date with the snake's body
+
+        A single tick only adds the new head, removes the old tail and,
+        after eating, stacks one more segment on the tail. Anything else
+        (a new game, a replaced body list, several ticks between frames)
+        triggers a full rebuild.
+        """
+        body = snake.get_body()
+        length = len(body)
+        head = body[0]
+        tail = body[-1]
+
+        if snake is not self._snake or body is not self._body or self._head is None:
+            self.rebuild(snake)
+            return
+        if head == self._head and length == self._length and tail == self._tail:
+            return
+
+        grew = length - self._length
+        if length > 1 and body[1] == self._head and grew in (0, 1):
+            counts = self.counts
+            counts[head] += 1
+            counts[self._tail] -= 1
+            if grew:
+                counts[tail] += 1
+            self._head = head
+            self._tail = tail
+            self._length = length
+        else:
+            self.rebuild(snake)
+
+    def rebuild(self, snake):
+        """Recount every segment of the snake"""
+        body = snake.get_body()
+        self.counts.fill(0)
+        if body:
+            xs, ys = zip(*body)
+            np.add.at(self.counts, (np.array(xs), np.array(ys)), 1)
+        self._snake = snake
+        self._body = body
+        self._head = body[0] if body else None
+        self._tail = body[-1] if body else None
+        self._length = len(body)
+
+    def draw(self, window, game_rect, snake, food_position):
+        """Sync with the snake and draw the whole board into game_rect"""
+        self.sync(snake)
+
+        index = self._index
+        np.minimum(self.counts, CELL_BODY, out=index, casting='unsafe')
+        index[self.wall_mask] = CELL_WALL
+        if self._head is not None:
+            index[self._head] = CELL_HEAD
+        if food_position is not None:
+            index[food_position] = CELL_FOOD
+        np.take(self.palette, index, axis=0, out=self._rgb)
+        pygame.surfarray.blit_array(self.board_surface, self._rgb)
+
+        size = game_rect.size
+        if self._scaled is None or self._scaled.get_size() != size:
+            self._scaled = pygame.Surface(size)
+        pygame.transform.scale(self.board_surface, size, self._scaled)
+        window.blit(self._scaled, game_rect.topleft)
@@ -0,0 +1,167 @@
+"""Session telemetry with batched background writes
+
+The game only appends small tuples to an in-memory ring buffer; a daemon
+thread drains it every TELEMETRY_FLUSH_INTERVAL seconds and writes the
+batch to a local sink (NDJSON lines or an SQLite table), so no file I/O
+happens on the frame path. When the buffer is full the oldest events are
+dropped and counted; a batch the sink fails to write is retried on the
+next flush.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+from collections import deque
+from src.config import TELEMETRY_BUFFER_SIZE, TELEMETRY_FLUSH_INTERVAL
+
+# Event types
+EVENT_GAME_START = "game_start"
+EVENT_FOOD_EATEN = "food_eaten"
+EVENT_DEATH = "death"
+EVENT_SESSION_END = "session_end"
+
+# Death causes
+DEATH_SELF = "self"
+DEATH_WALL = "wall"
+
+
+class NdjsonSink:
+    """Appends one JSON object per line"""
+
+    def __init__(self, path):
+        """Initialize the sink; the file is created on the first write"""
+        self.path = path
+
+    def write(self, events):
+        """Append a batch of (timestamp, type, fields) events"""
+        lines = [json.dumps({"ts": ts, "event": event, **fields}) + "\n"
+                 for ts, event, fields in events]
+        with open(self.path, 'a') as f:
+            f.writelines(lines)
+
+    def close(self):
+        """Nothing to release; the file is opened per batch"""
+
+
+class SqliteSink:
+    """Inserts events into an ``events`` table
+
+    The connection is opened on the first write. Writes come from the
+    flush thread or from close(), serialized by the recorder's lock.
+    """
+
+    def __init__(self, path):
+        """Initialize the sink without connecting yet"""
+        self.path = path
+        self._connection = None
+
+    def write(self, events):
+        """Insert a batch of (timestamp, type, fields) events in one transaction"""
+        if self._connection is None:
+            self._connection = sqlite3.connect(self.path, check_same_thread=False)
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS events (ts REAL, event TEXT, data TEXT)"
+            )
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO events VALUES (?, ?, ?)",
+                [(ts, event, json.dumps(fields)) for ts, event, fields in events],
+            )
+
+    def close(self):
+        """Close the connection"""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def create_sink(path):
+    """Pick a sink from the file extension (.db/.sqlite for SQLite, else NDJSON)"""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        return SqliteSink(path)
+    return NdjsonSink(path)
+
+
+class TelemetryRecorder:
+    """Buffers events in memory and flushes them from a background thread"""
+
+    def __init__(self, sink, capacity=TELEMETRY_BUFFER_SIZE, flush_interval=TELEMETRY_FLUSH_INTERVAL):
+        """Initialize the buffer and start the writer thread
+
+        Args:
+            sink: Object with write(events) and close()
+            capacity: Events kept before the oldest are dropped
+            flush_interval: Seconds between background flushes
+        """
+        self.sink = sink
+        self.capacity = capacity
+        self.flush_interval = flush_interval
+        self.buffer = deque(maxlen=capacity)
+        self.dropped = 0
+        self.written = 0
+        self.write_errors = 0
+        self._unsent = []
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._flush_loop, name="telemetry", daemon=True)
+        self._thread.start()
+
+    def record(self, event, **fields):
+        """Queue an event; cheap enough to call from the game loop"""
+        if len(self.buffer) == self.capacity:
+            self.dropped += 1
+        self.buffer.append((time.time(), event, fields))
+
+    def flush(self):
+        """Write everything buffered so far to the sink
+
+        A batch that fails to write is kept and sent first on the next
+        flush; beyond capacity its oldest events are dropped and counted.
+
+        Returns:
+            int: Number of events written
+        """
+        with self._write_lock:
+            batch = self._unsent
+            self._unsent = []
+            buffer = self.buffer
+            while buffer:
+                batch.append(buffer.popleft())
+            if batch:
+                try:
+                    self.sink.write(batch)
+                except (OSError, sqlite3.Error):
+                    # Telemetry must never take the game down
+                    self.write_errors += 1
+                    overflow = len(batch) - self.capacity
+                    if overflow > 0:
+                        self.dropped += overflow
+                        batch = batch[overflow:]
+                    self._unsent = batch
+                    return 0
+                self.written += len(batch)
+            return len(batch)
+
+    def _flush_loop(self):
+        """Flush periodically until close() is called"""
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Stop the writer thread, flush what is left and release the sink"""
+        self._stop.set()
+        self._thread.join()
+        self.flush()
+        with self._write_lock:
+            # Events the sink still refused are lost
+            self.dropped += len(self._unsent)
+            self._unsent = []
+            self.sink.close()
+
+
+def create_recorder(path):
+    """Return a recorder writing to path, or None when telemetry is disabled"""
+    if not path:
+        return None
+    return TelemetryRecorder(create_sink(path))
@@ -0,0 +1,215 @@
+"""Columnar per-tick game traces
+
+A trace is a directory holding one .npy file per column, with one row
+per simulation tick across any number of games:
+
+    game, tick, head_x, head_y, length, direction, food_x, food_y,
+    score, interval, ate
+
+Rows are buffered in a fixed-size chunk and appended to the column files
+whenever the chunk fills, so memory use does not depend on how many games
+are traced. Each file starts with a fixed-size .npy header whose row
+count is patched after every flush, so a trace cut short by a crash
+still loads with the rows written so far. The columns load with
+np.load(..., mmap_mode='r') for vectorized analysis of datasets far
+larger than memory (see load_trace).
+
+Enable tracing in the game with the trace_path setting, or generate a
+dataset from bot games:
+
+    python -m src.trace traces/ --games 10000
+"""
+
+import os
+import sys
+import time
+import argparse
+import numpy as np
+from src.config import TRACE_CHUNK_ROWS
+
+# Column name -> dtype, in file order
+COLUMNS = (
+    ('game', '<u4'),
+    ('tick', '<u4'),
+    ('head_x', '<i2'),
+    ('head_y', '<i2'),
+    ('length', '<u2'),
+    ('direction', 'u1'),
+    ('food_x', '<i2'),
+    ('food_y', '<i2'),
+    ('score', '<u4'),
+    ('interval', '<f4'),
+    ('ate', 'u1'),  # 1 on the tick the snake ate
+)
+
+ROW_DTYPE = np.dtype(list(COLUMNS))
+
+# Magic, version, header length and a header padded to a fixed size, so
+# the row count can be rewritten in place
+_HEADER_SIZE = 128
+
+
+def _npy_header(dtype, rows):
+    """Return a version 1.0 .npy header of exactly _HEADER_SIZE bytes"""
+    text = "{'descr': %r, 'fortran_order': False, 'shape': (%d,), }" % (
+        np.dtype(dtype).str, rows)
+    prefix = np.lib.format.magic(1, 0)
+    body_size = _HEADER_SIZE - len(prefix) - 2
+    text = text.ljust(body_size - 1) + '\n'
+    return prefix + body_size.to_bytes(2, 'little') + text.encode('latin1')
+
+
+class TraceWriter:
+    """Streams trace rows into per-column .npy files"""
+
+    def __init__(self, directory, chunk_rows=TRACE_CHUNK_ROWS):
+        """Create the column files, replacing an existing trace
+
+        Args:
+            directory: Output directory, created if missing
+            chunk_rows: Rows buffered before they are appended to disk
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.rows = 0
+        self.games = 0
+        self._chunk = np.zeros(chunk_rows, dtype=ROW_DTYPE)
+        self._used = 0
+        self._files = {}
+        for name, dtype in COLUMNS:
+            f = open(os.path.join(directory, name + '.npy'), 'wb')
+            f.write(_npy_header(dtype, 0))
+            self._files[name] = f
+
+    def start_game(self):
+        """Start numbering rows for a new game"""
+        self.games += 1
+
+    def record(self, tick, head, length, direction, food, score, interval, ate):
+        """Append one tick of the current game"""
+        self._chunk[self._used] = (self.games - 1, tick, head[0], head[1], length,
+                                   direction, food[0], food[1], score, interval, ate)
+        self._used += 1
+        if self._used == len(self._chunk):
+            self.flush()
+
+    def record_game(self, game, ate):
+        """Append the state of a SnakeGame after its tick"""
+        snake = game.snake
+        self.record(game.tick, snake.body[0], len(snake.body), snake.heading,
+                    game.food.position, game.score, game.game_speed, ate)
+
+    def flush(self):
+        """Append the buffered rows to the column files"""
+        used = self._used
+        if not used:
+            return
+        for name, _ in COLUMNS:
+            self._files[name].write(self._chunk[name][:used].tobytes())
+        self.rows += used
+        self._used = 0
+        self._write_headers()
+
+    def _write_headers(self):
+        """Patch the row count into every header after the rows are written"""
+        for name, dtype in COLUMNS:
+            f = self._files[name]
+            f.seek(0)
+            f.write(_npy_header(dtype, self.rows))
+            f.seek(0, os.SEEK_END)
+            f.flush()
+
+    def close(self):
+        """Flush the buffered rows and close the files"""
+        if not self._files:
+            return
+        self.flush()
+        for f in self._files.values():
+            f.close()
+        self._files = {}
+
+    def __enter__(self):
+        """Return the writer for use in a with block"""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Close the writer when the with block ends"""
+        self.close()
+
+
+def load_trace(directory, mmap=True):
+    """Load a trace as a dict of column arrays
+
+    Args:
+        directory: Trace directory written by TraceWriter
+        mmap: Map the files read-only instead of reading them into memory
+
+    Returns:
+        dict: Column name -> 1-D array, all of equal length
+    """
+    mode = 'r' if mmap else None
+    return {name: np.load(os.path.join(directory, name + '.npy'), mmap_mode=mode)
+            for name, _ in COLUMNS}
+
+
+def record_bot_games(directory, games, config=None, max_ticks=10000):
+    """Play games with GreedyBot and trace every tick
+
+    Nothing is rendered, so this runs at simulation speed.
+
+    Args:
+        directory: Output trace directory
+        games: Number of games to play
+        config (GameConfig, optional): Game settings; high scores go to a
+            temporary file
+        max_ticks: Games still running after this many ticks are cut off
+
+    Returns:
+        int: Rows written
+    """
+    import dataclasses
+    import tempfile
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    from src.game import SnakeGame
+    from src.bot import GreedyBot
+    from src.config import STATE_PLAYING
+    from src.settings import DEFAULT_CONFIG
+
+    with tempfile.TemporaryDirectory() as scores_directory:
+        config = dataclasses.replace(
+            config if config is not None else DEFAULT_CONFIG,
+            high_score_path=os.path.join(scores_directory, 'high_scores.json'),
+            trace_path=directory,
+            telemetry_path="",
+        )
+        game = SnakeGame(headless=True, config=config)
+        game.autopilot = GreedyBot()
+        try:
+            for _ in range(games):
+                game._start_game()
+                while game.current_state == STATE_PLAYING and game.tick < max_ticks:
+                    game.update()
+        finally:
+            game.trace.close()
+    return game.trace.rows
+
+
+def main(argv=None):
+    """Generate a trace dataset from bot games"""
+    parser = argparse.ArgumentParser(description="Trace bot games to columnar .npy files")
+    parser.add_argument("output", help="Trace directory")
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--max-ticks", type=int, default=10000,
+                        help="Cut off games that run longer than this")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    rows = record_bot_games(args.output, args.games, max_ticks=args.max_ticks)
+    elapsed = time.perf_counter() - started
+    print(f"{args.games} games, {rows} ticks in {elapsed:.1f} s "
+          f"({rows / elapsed if elapsed else 0:.0f} ticks/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,419 @@
+"""Neuroevolution of small MLP autopilots
+
+Policies are tiny two-layer NumPy networks whose weights form one flat
+genome. A generation is evaluated in lockstep: every individual plays
+several games at once in BatchedSnakeEnv, a NumPy version of the rules
+in src.simulation (same board, wrap table, start position and eating
+order), and one batched forward pass per tick picks the moves of every
+game. The population is split across a process pool, the best genome is
+checkpointed to an .npz file after each improvement, and a checkpoint
+plays in SnakeGame through NeuralAutopilot (snakegame --autopilot).
+
+    snake-train --generations 100 --population 128 --checkpoint policy.npz
+"""
+
+import os
+import sys
+import time
+import argparse
+import multiprocessing
+import numpy as np
+from src.config import (TRAIN_POPULATION, TRAIN_HIDDEN, TRAIN_GAMES, TRAIN_ELITE,
+                        TRAIN_MUTATION, TRAIN_MAX_TICKS, TRAIN_CHECKPOINT)
+from src.direction import DIRECTIONS, OPPOSITE, DX, DY, UP, RIGHT, DOWN, LEFT
+from src.game_board import GameBoard
+from src.settings import DEFAULT_CONFIG
+
+# Danger in each direction, food direction (up, right, down, left), heading
+FEATURES = 12
+ACTIONS = len(DIRECTIONS)
+
+_OPPOSITE = np.array(OPPOSITE)
+
+# Config and board tables owned by each pool worker process
+_worker_state = None
+
+
+def genome_size(hidden):
+    """Return the number of weights in a policy with this many hidden units"""
+    return FEATURES * hidden + hidden + hidden * ACTIONS + ACTIONS
+
+
+def unpack(genomes, hidden):
+    """Split (P, genome_size) genomes into per-layer weight arrays"""
+    genomes = np.atleast_2d(genomes)
+    count = len(genomes)
+    offsets = np.cumsum([0, FEATURES * hidden, hidden, hidden * ACTIONS, ACTIONS])
+    w1 = genomes[:, offsets[0]:offsets[1]].reshape(count, FEATURES, hidden)
+    b1 = genomes[:, offsets[1]:offsets[2]]
+    w2 = genomes[:, offsets[2]:offsets[3]].reshape(count, hidden, ACTIONS)
+    b2 = genomes[:, offsets[3]:offsets[4]]
+    return w1, b1, w2, b2
+
+
+def forward(weights, observations):
+    """Score every action for (P, G, FEATURES) observations
+
+    Returns:
+        np.ndarray: (P, G, ACTIONS) action scores
+    """
+    w1, b1, w2, b2 = weights
+    hidden = np.tanh(np.einsum('pgf,pfh->pgh', observations, w1) + b1[:, None, :])
+    return np.einsum('pgh,pha->pga', hidden, w2) + b2[:, None, :]
+
+
+def observe(danger, food_dx, food_dy, heading):
+    """Build the feature matrix shared by training and NeuralAutopilot
+
+    Args:
+        danger: (N, 4) booleans, True if the neighbour in that direction
+            is occupied
+        food_dx: (N,) shortest wrapped x offset from head to food
+        food_dy: (N,) shortest wrapped y offset from head to food
+        heading: (N,) direction codes
+
+    Returns:
+        np.ndarray: (N, FEATURES) float features
+    """
+    count = len(heading)
+    features = np.zeros((count, FEATURES))
+    features[:, 0:4] = danger
+    features[:, 4 + UP] = food_dy < 0
+    features[:, 4 + RIGHT] = food_dx > 0
+    features[:, 4 + DOWN] = food_dy > 0
+    features[:, 4 + LEFT] = food_dx < 0
+    features[np.arange(count), 8 + heading] = 1.0
+    return features
+
+
+def choose_actions(scores, heading):
+    """Pick the best-scoring action per game, never reversing"""
+    scores = scores.copy()
+    scores[np.arange(len(heading)), _OPPOSITE[heading]] = -np.inf
+    return scores.argmax(axis=1)
+
+
+def _wrapped(delta, size):
+    """Return offsets folded into [-size/2, size/2)"""
+    return (delta + size // 2) % size - size // 2
+
+
+class BatchedSnakeEnv:
+    """Many games stepped together as NumPy arrays"""
+
+    def __init__(self, count, config=None, seed=0, max_ticks=TRAIN_MAX_TICKS, board=None,
+                 streams=None):
+        """Start count games
+
+        Args:
+            count: Number of games
+            config (GameConfig, optional): Game settings
+            seed: Seed for food spawns
+            max_ticks: Games are stopped after this many ticks
+            board (GameBoard, optional): Board built from config, to share
+            streams: Food stream number of each game (defaults to
+                0 .. count - 1); games with the same stream get the same
+                food for the same moves
+        """
+        from src.simulation import start_position
+
+        config = config if config is not None else DEFAULT_CONFIG
+        board = board if board is not None else GameBoard.from_config(config)
+        self.width = board.width
+        self.height = board.height
+        cells = board.width * board.height
+        self.cells = cells
+        self.count = count
+        self.max_ticks = max_ticks
+        # Starve snakes that loop without eating
+        self.starvation = cells
+        streams = range(count) if streams is None else streams
+        self.rngs = [np.random.default_rng((seed, int(stream))) for stream in streams]
+
+        # Board neighbour table as cell index -> 4 neighbour indices
+        width = board.width
+        height = board.height
+        xs = np.arange(cells) % width
+        ys = np.arange(cells) // width
+        self.next_cell = np.stack([(ys + DY[code]) % height * width + (xs + DX[code]) % width
+                                   for code in DIRECTIONS], axis=1).astype(np.int64)
+        walls = np.zeros(cells, dtype=np.int16)
+        if board.level is not None:
+            walls[[y * width + x for x, y in board.level.wall_positions()]] = 1
+
+        # Snake bodies as ring buffers of cell indices, newest head at head_slot
+        length = config.initial_snake_length
+        start_x, start_y = start_position(board)
+        start = [((start_y - i) % board.height) * width + start_x for i in range(length)]
+        self.body = np.zeros((count, cells), dtype=np.int64)
+        self.body[:, :length] = start[::-1]
+        self.head_slot = np.full(count, length - 1, dtype=np.int64)
+        self.length = np.full(count, length, dtype=np.int64)
+        self.occupied = np.tile(walls, (count, 1))
+        np.add.at(self.occupied, (slice(None), start), 1)
+        self.heading = np.full(count, RIGHT, dtype=np.int64)
+
+        self.alive = np.ones(count, dtype=bool)
+        self.score = np.zeros(count, dtype=np.int64)
+        self.ticks = np.zeros(count, dtype=np.int64)
+        self.hungry = np.zeros(count, dtype=np.int64)
+        self.food = np.zeros(count, dtype=np.int64)
+        for game in range(count):
+            self._spawn_food(game)
+
+    @property
+    def head(self):
+        """Return the head cell of every game"""
+        return self.body[np.arange(self.count), self.head_slot]
+
+    def _spawn_food(self, game):
+        """Place food on a random free cell of one game"""
+        free = np.flatnonzero(self.occupied[game] == 0)
+        if free.size:
+            self.food[game] = free[self.rngs[game].integers(free.size)]
+
+    def observations(self):
+        """Return (count, FEATURES) features for every game"""
+        head = self.head
+        neighbours = self.next_cell[head]
+        danger = np.take_along_axis(self.occupied, neighbours, axis=1) > 0
+        width = self.width
+        food_dx = _wrapped(self.food % width - head % width, width)
+        food_dy = _wrapped(self.food // width - head // width, self.height)
+        return observe(danger, food_dx, food_dy, self.heading)
+
+    def step(self, actions):
+        """Advance every live game one tick with direction codes"""
+        games = np.flatnonzero(self.alive)
+        if games.size == 0:
+            return
+        heading = self.heading[games]
+        wanted = actions[games]
+        heading = np.where(wanted == _OPPOSITE[heading], heading, wanted)
+        self.heading[games] = heading
+
+        head = self.body[games, self.head_slot[games]]
+        new_head = self.next_cell[head, heading]
+        ate = new_head == self.food[games]
+
+        # Same order as Snake.move then Snake.grow: the tail always leaves,
+        # eating duplicates the new last segment, and the head dies if its
+        # cell is then held twice (by the body or a wall)
+        cells = self.cells
+        tail_slot = (self.head_slot[games] - self.length[games] + 1) % cells
+        self.occupied[games, self.body[games, tail_slot]] -= 1
+        slot = (self.head_slot[games] + 1) % cells
+        self.head_slot[games] = slot
+        self.body[games, slot] = new_head
+        self.occupied[games, new_head] += 1
+
+        grew = games[ate]
+        grew_slot = tail_slot[ate]
+        new_tail = self.body[grew, (grew_slot + 1) % cells]
+        self.body[grew, grew_slot] = new_tail
+        self.occupied[grew, new_tail] += 1
+        died = self.occupied[games, new_head] > 1
+
+        self.length[games] += ate
+        self.score[games] += ate
+        self.ticks[games] += 1
+        self.hungry[games] = np.where(ate, 0, self.hungry[games] + 1)
+
+        for game in games[ate & ~died]:
+            self._spawn_food(game)
+        self.alive[games] = ~died & (self.hungry[games] < self.starvation) & \
+            (self.ticks[games] < self.max_ticks)
+
+    def run(self, policy):
+        """Play every game to its end with policy(observations) -> actions"""
+        while self.alive.any():
+            self.step(policy(self.observations()))
+
+
+def evaluate(genomes, hidden, games=TRAIN_GAMES, seed=0, config=None, board=None):
+    """Return the fitness of each genome over the same games
+
+    All individuals and their games run in one BatchedSnakeEnv, with one
+    forward pass per tick. Fitness is the mean score plus a small bonus
+    for surviving, so early generations still have a gradient to climb.
+    """
+    genomes = np.atleast_2d(genomes)
+    population = len(genomes)
+    weights = unpack(genomes, hidden)
+    # Individual p plays games p * games .. p * games + games - 1, and every
+    # individual draws its food from the same streams
+    env = BatchedSnakeEnv(population * games, config, seed, board=board,
+                          streams=np.tile(np.arange(games), population))
+
+    def policy(observations):
+        scores = forward(weights, observations.reshape(population, games, FEATURES))
+        return choose_actions(scores.reshape(-1, ACTIONS), env.heading)
+
+    env.run(policy)
+    fitness = env.score + env.ticks / (env.cells * 10)
+    return fitness.reshape(population, games).mean(axis=1)
+
+
+def _init_worker(config):
+    """Build the per-process board"""
+    global _worker_state
+    _worker_state = (config, GameBoard.from_config(config))
+
+
+def _evaluate_job(job):
+    """Evaluate one slice of the population in a worker"""
+    genomes, hidden, games, seed = job
+    config, board = _worker_state
+    return evaluate(genomes, hidden, games, seed, config, board)
+
+
+class Trainer:
+    """Evolves a population of policies with elitism and Gaussian mutation"""
+
+    def __init__(self, population=TRAIN_POPULATION, hidden=TRAIN_HIDDEN, games=TRAIN_GAMES,
+                 elite=TRAIN_ELITE, mutation=TRAIN_MUTATION, workers=None, seed=0, config=None):
+        """Initialize a random population
+
+        Args:
+            population: Individuals per generation
+            hidden: Hidden units per policy
+            games: Games each individual plays per generation
+            elite: Fraction of the best individuals kept unchanged and used
+                as parents
+            mutation: Standard deviation of the weight noise added to children
+            workers: Pool size; None uses every CPU and 1 evaluates in this
+                process
+            seed: Seed for the population, mutations and games
+            config (GameConfig, optional): Game settings
+        """
+        self.hidden = hidden
+        self.games = games
+        self.elite = max(1, int(population * elite))
+        self.mutation = mutation
+        self.workers = workers
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.population = self.rng.normal(0.0, 0.5, (population, genome_size(hidden)))
+        self.generation = 0
+        self.best_genome = None
+        self.best_fitness = -np.inf
+        self._pool = None
+
+    def evaluate(self):
+        """Return the fitness of the current population"""
+        seed = self.seed * 1000003 + self.generation
+        if self.workers == 1:
+            return evaluate(self.population, self.hidden, self.games, seed, self.config)
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers, initializer=_init_worker,
+                                              initargs=(self.config,))
+        slices = np.array_split(self.population, self.workers or os.cpu_count() or 1)
+        jobs = [(genomes, self.hidden, self.games, seed) for genomes in slices if len(genomes)]
+        return np.concatenate(self._pool.map(_evaluate_job, jobs))
+
+    def step(self):
+        """Evaluate one generation and breed the next
+
+        Returns:
+            float: Best fitness of the evaluated generation
+        """
+        fitness = self.evaluate()
+        order = np.argsort(fitness)[::-1]
+        if fitness[order[0]] > self.best_fitness:
+            self.best_fitness = float(fitness[order[0]])
+            self.best_genome = self.population[order[0]].copy()
+
+        parents = self.population[order[:self.elite]]
+        children = parents[self.rng.integers(self.elite, size=len(self.population) - self.elite)]
+        children = children + self.rng.normal(0.0, self.mutation, children.shape)
+        self.population = np.concatenate([parents, children])
+        self.generation += 1
+        return float(fitness[order[0]])
+
+    def save(self, path):
+        """Checkpoint the best genome found so far"""
+        np.savez(path, genome=self.best_genome, hidden=self.hidden,
+                 generation=self.generation, fitness=self.best_fitness)
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+
+class NeuralAutopilot:
+    """Plays SnakeGame with a trained policy (see SnakeGame.autopilot)"""
+
+    def __init__(self, genome, hidden):
+        """Initialize from a genome
+
+        Args:
+            genome: Flat weight vector
+            hidden: Hidden units the genome was trained with
+        """
+        self.weights = unpack(np.asarray(genome, dtype=np.float64), hidden)
+
+    @classmethod
+    def load(cls, path):
+        """Load the genome saved by Trainer.save"""
+        with np.load(path) as data:
+            return cls(data['genome'], int(data['hidden']))
+
+    def choose_direction(self, game):
+        """Return the direction code for the next tick"""
+        snake = game.snake
+        board = game.board
+        head = snake.body[0]
+        # The tail cell is vacated by the move, but training sees it as
+        # occupied too, so keep it
+        blocked = set(snake.body)
+        steps = board.steps(head)
+        danger = np.array([[steps[code] in blocked or board.is_wall(steps[code])
+                            for code in DIRECTIONS]])
+        food_x, food_y = game.food.position
+        food_dx = _wrapped(np.array([food_x - head[0]]), board.width)
+        food_dy = _wrapped(np.array([food_y - head[1]]), board.height)
+        heading = np.array([snake.heading])
+        scores = forward(self.weights, observe(danger, food_dx, food_dy, heading)[None])
+        return int(choose_actions(scores[0], heading)[0])
+
+
+def main(argv=None):
+    """Train autopilot policies and checkpoint the best one"""
+    parser = argparse.ArgumentParser(description="Evolve neural autopilots for Snake")
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--population", type=int, default=TRAIN_POPULATION)
+    parser.add_argument("--hidden", type=int, default=TRAIN_HIDDEN)
+    parser.add_argument("--games", type=int, default=TRAIN_GAMES,
+                        help="Games per individual per generation")
+    parser.add_argument("--mutation", type=float, default=TRAIN_MUTATION)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoint", default=TRAIN_CHECKPOINT)
+    args = parser.parse_args(argv)
+
+    trainer = Trainer(args.population, args.hidden, args.games, mutation=args.mutation,
+                      workers=args.workers, seed=args.seed)
+    started = time.perf_counter()
+    try:
+        for _ in range(args.generations):
+            best_before = trainer.best_fitness
+            fitness = trainer.step()
+            if trainer.best_fitness > best_before:
+                trainer.save(args.checkpoint)
+            elapsed = time.perf_counter() - started
+            rate = trainer.generation / elapsed * 60 if elapsed else 0.0
+            print(f"generation {trainer.generation}: best {fitness:.2f} "
+                  f"(all-time {trainer.best_fitness:.2f}), {rate:.1f} generations/min",
+                  flush=True)
+    finally:
+        trainer.close()
+    print(f"Best policy saved to {args.checkpoint}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,19 +2,22 @@
 
 import random
 from src.config import BOARD_WIDTH, BOARD_HEIGHT
+from src.direction import OPPOSITE, to_code
 
-def get_random_position():
-    """Generate a random position on the game board"""
-    x = random.randint(0, BOARD_WIDTH - 1)
-    y = random.randint(0, BOARD_HEIGHT - 1)
+def get_random_position(width=BOARD_WIDTH, height=BOARD_HEIGHT, rng=random):
+    """Generate a random position on the game board
+
+    Args:
+        rng: Random source, e.g. a seeded random.Random. Defaults to the
+            random module.
+    """
+    x = rng.randint(0, width - 1)
+    y = rng.randint(0, height - 1)
     return (x, y)
 
 def is_valid_direction(current_dir, new_dir):
-    """Check if the new direction is valid (not 180 degree turn)"""
-    opposite_dirs = {
-        'UP': 'DOWN',
-        'DOWN': 'UP',
-        'LEFT': 'RIGHT',
-        'RIGHT': 'LEFT'
-    }
-    return opposite_dirs.get(current_dir) != new_dir
+    """Check if the new direction is valid (not 180 degree turn)
+
+    Directions may be codes or names.
+    """
+    return OPPOSITE[to_code(current_dir)] != to_code(new_dir)
@@ -0,0 +1,225 @@
+"""Replay verification for submitted high scores
+
+A leaderboard submission is a Replay: the game's food seed, the
+direction changes applied to it and the claimed score and tick of death.
+The verifier re-runs the game with the shared rules in src.simulation
+(no pygame at all) and accepts the score only if the snake dies on the
+claimed tick with the claimed score. Batches are spread over a process
+pool; each worker builds the board and difficulty table once and reuses
+them for every replay it checks.
+
+    python -m src.verify replays.jsonl
+    python -m src.verify --benchmark 5000
+"""
+
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from src.simulation import Replay, Simulation, new_seed
+from src.game_board import GameBoard
+from src.difficulty import Difficulty, create_schedule
+from src.direction import DIRECTIONS
+from src.settings import DEFAULT_CONFIG
+from src.config import VERIFY_MAX_TICKS, VERIFY_CHUNK_SIZE
+
+# Board and difficulty owned by each pool worker process
+_worker_state = None
+
+
+def replay_to_json(replay):
+    """Return a replay as one line of JSON"""
+    return json.dumps(replay._asdict(), separators=(',', ':'))
+
+
+def replay_from_json(line):
+    """Parse a replay written by replay_to_json
+
+    Raises:
+        ValueError: If the line is not a replay
+    """
+    try:
+        data = json.loads(line)
+        return Replay(data["seed"], [tuple(entry) for entry in data["inputs"]],
+                      data["score"], data["ticks"])
+    except (KeyError, TypeError, json.JSONDecodeError) as error:
+        raise ValueError(f"Invalid replay: {error}") from None
+
+
+def verify_replay(replay, config=None, board=None, difficulty=None):
+    """Re-run a replay and check its claimed result
+
+    Args:
+        replay: Replay to check
+        config (GameConfig, optional): Settings the game was played with
+        board (GameBoard, optional): Board built from config, reused if given
+        difficulty (Difficulty, optional): Difficulty built from config
+
+    Returns:
+        bool: True if the snake dies on replay.ticks with replay.score
+    """
+    ticks = replay.ticks
+    if not isinstance(ticks, int) or not 0 < ticks <= VERIFY_MAX_TICKS:
+        return False
+    if not isinstance(replay.seed, int):
+        return False
+
+    # Direction changes must be valid codes, at most one per tick, in order
+    changes = {}
+    last_tick = 0
+    for entry in replay.inputs:
+        try:
+            tick, direction = entry
+        except (TypeError, ValueError):
+            return False
+        if not isinstance(tick, int) or tick <= last_tick or tick > ticks:
+            return False
+        if direction not in DIRECTIONS:
+            return False
+        changes[tick] = direction
+        last_tick = tick
+
+    simulation = Simulation(replay.seed, config, board, difficulty, timed=False)
+    step = simulation.step
+    get_change = changes.get
+    for tick in range(1, ticks + 1):
+        step(get_change(tick))
+        if simulation.death_cause is not None:
+            break
+    return (simulation.death_cause is not None
+            and simulation.tick == ticks
+            and simulation.score == replay.score
+            and len(simulation.inputs) == len(changes))
+
+
+def _init_worker(config):
+    """Build the per-process board and difficulty table"""
+    global _worker_state
+    _worker_state = (config, GameBoard.from_config(config), Difficulty(create_schedule(config)))
+
+
+def _verify_job(replay):
+    """Verify one replay with the worker's shared state"""
+    return verify_replay(replay, *_worker_state)
+
+
+class ReplayVerifier:
+    """Checks batches of replays across a process pool"""
+
+    def __init__(self, config=None, workers=None, chunksize=VERIFY_CHUNK_SIZE):
+        """Initialize a verifier
+
+        Args:
+            config (GameConfig, optional): Settings games were played with
+            workers: Pool size; None uses every CPU and 1 verifies in this
+                process
+            chunksize: Replays sent to a worker at a time
+        """
+        self.config = config if config is not None else DEFAULT_CONFIG
+        self.workers = workers
+        self.chunksize = chunksize
+        self._pool = None
+
+    def verify(self, replays):
+        """Return a list with True for every replay whose result checks out"""
+        replays = list(replays)
+        if self.workers == 1 or len(replays) <= self.chunksize:
+            board = GameBoard.from_config(self.config)
+            difficulty = Difficulty(create_schedule(self.config))
+            return [verify_replay(replay, self.config, board, difficulty) for replay in replays]
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers, initializer=_init_worker,
+                                              initargs=(self.config,))
+        return self._pool.map(_verify_job, replays, self.chunksize)
+
+    def submit(self, high_score_manager, replays):
+        """Verify replays and record the scores of those that check out
+
+        Args:
+            high_score_manager (HighScoreManager): Leaderboard to update
+            replays: Submitted replays
+
+        Returns:
+            list: True for every accepted replay
+        """
+        replays = list(replays)
+        results = self.verify(replays)
+        best = max((replay.score for replay, accepted in zip(replays, results) if accepted),
+                   default=None)
+        if best is not None:
+            high_score_manager.update_score(best)
+        return results
+
+    def close(self):
+        """Shut down the worker pool"""
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+    def __enter__(self):
+        """Return the verifier for use in a with block"""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Shut down the pool when the with block ends"""
+        self.close()
+
+
+def record_bot_replays(count, config=None, max_ticks=10000):
+    """Play games with GreedyBot and return the replays of those that ended
+
+    Args:
+        count: Number of games to play
+        config (GameConfig, optional): Game settings
+        max_ticks: Games still running after this many ticks are dropped
+
+    Returns:
+        list: Replay of every game that ended within max_ticks
+    """
+    from src.bot import GreedyBot
+    config = config if config is not None else DEFAULT_CONFIG
+    board = GameBoard.from_config(config)
+    difficulty = Difficulty(create_schedule(config))
+    bot = GreedyBot()
+    replays = []
+    for _ in range(count):
+        simulation = Simulation(new_seed(), config, board, difficulty)
+        while simulation.death_cause is None and simulation.tick < max_ticks:
+            simulation.step(bot.choose_direction(simulation))
+        if simulation.death_cause is not None:
+            replays.append(simulation.replay())
+    return replays
+
+
+def main(argv=None):
+    """Verify replays from a file, or benchmark the verifier"""
+    parser = argparse.ArgumentParser(description="Verify submitted replays by re-simulating them")
+    parser.add_argument("replays", nargs="?", help="File with one JSON replay per line")
+    parser.add_argument("--benchmark", type=int, metavar="GAMES",
+                        help="Verify this many bot games instead of a file")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.replays is None and args.benchmark is None:
+        parser.error("give a replay file or --benchmark")
+
+    if args.benchmark is not None:
+        replays = record_bot_replays(args.benchmark)
+    else:
+        with open(args.replays) as f:
+            replays = [replay_from_json(line) for line in f if line.strip()]
+
+    with ReplayVerifier(workers=args.workers) as verifier:
+        started = time.perf_counter()
+        results = verifier.verify(replays)
+        elapsed = time.perf_counter() - started
+
+    accepted = sum(results)
+    rate = len(replays) / elapsed if elapsed else 0.0
+    print(f"{accepted}/{len(replays)} replays accepted in {elapsed:.2f} s ({rate:.0f}/s)")
+    return 0 if accepted == len(replays) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
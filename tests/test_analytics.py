@@ -0,0 +1,97 @@
+"""Tests for position heatmaps"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+import pytest
+from src.settings import GameConfig
+from src.analytics import (Heatmaps, KIND_TRAVEL, KIND_FOOD, KIND_DEATHS,
+                           collect_bot_games, collect_parallel)
+from src.config import COLOR_BACKGROUND
+
+
+class TestHeatmaps:
+    """Tests for Heatmaps class"""
+
+    def test_positions_counted_per_cell(self):
+        """Test repeated positions accumulate in (y, x) order"""
+        heatmaps = Heatmaps(4, 3)
+        heatmaps.add_positions(KIND_TRAVEL, [0, 3, 3, 1], [0, 2, 2, 1])
+
+        travel = heatmaps.maps[KIND_TRAVEL]
+        assert travel.shape == (3, 4)
+        assert travel[2, 3] == 2
+        assert travel[1, 1] == 1
+        assert travel.sum() == 4
+
+    def test_trace_counts_food_and_deaths_per_game(self):
+        """Test a trace yields one death per game and food at start and after eating"""
+        trace = {
+            'game': np.array([0, 0, 0, 1, 1]),
+            'head_x': np.array([1, 2, 3, 0, 0]),
+            'head_y': np.array([0, 0, 0, 1, 2]),
+            'food_x': np.array([3, 1, 1, 2, 2]),
+            'food_y': np.array([0, 2, 2, 2, 2]),
+            'ate': np.array([0, 0, 1, 0, 0]),
+        }
+        heatmaps = Heatmaps(4, 3)
+        heatmaps.add_trace(trace)
+
+        assert heatmaps.games == 2
+        assert heatmaps.maps[KIND_TRAVEL].sum() == 5
+        assert heatmaps.maps[KIND_DEATHS][0, 3] == 1
+        assert heatmaps.maps[KIND_DEATHS][2, 0] == 1
+        assert heatmaps.maps[KIND_FOOD][0, 3] == 1
+        assert heatmaps.maps[KIND_FOOD][2, 1] == 1
+        assert heatmaps.maps[KIND_FOOD][2, 2] == 1
+
+    def test_merge_save_and_load(self, tmp_path):
+        """Test partial maps merge and survive a round trip through .npz"""
+        first = collect_bot_games(5, seed=1)
+        second = collect_bot_games(5, seed=6)
+        combined = collect_bot_games(10, seed=1)
+
+        first.merge(second)
+        for kind in (KIND_TRAVEL, KIND_FOOD, KIND_DEATHS):
+            assert np.array_equal(first.maps[kind], combined.maps[kind])
+        assert first.games == 10
+        assert first.maps[KIND_DEATHS].sum() == 10
+
+        path = str(tmp_path / 'maps.npz')
+        first.save(path)
+        loaded = Heatmaps.load(path)
+        assert loaded.games == 10
+        assert np.array_equal(loaded.maps[KIND_FOOD], first.maps[KIND_FOOD])
+
+        with pytest.raises(ValueError):
+            first.merge(Heatmaps(3, 3))
+
+    def test_parallel_collection_matches_serial(self):
+        """Test games split across workers merge to the serial result"""
+        serial = collect_bot_games(6, seed=40)
+        pooled = collect_parallel(6, workers=2, seed=40, chunk=2)
+        assert np.array_equal(serial.maps[KIND_TRAVEL], pooled.maps[KIND_TRAVEL])
+
+    def test_parallel_collection_uses_config(self):
+        """Test workers play on the caller's board and no games give empty maps"""
+        config = GameConfig(board_width=12, board_height=9)
+        pooled = collect_parallel(2, workers=2, seed=3, chunk=1, config=config)
+        assert pooled.maps[KIND_TRAVEL].shape == (9, 12)
+
+        empty = collect_parallel(0, config=config)
+        assert empty.games == 0
+        assert empty.maps[KIND_TRAVEL].sum() == 0
+
+    def test_render_uses_palette(self, tmp_path):
+        """Test empty cells render in the background colour"""
+        heatmaps = Heatmaps(3, 2)
+        heatmaps.add_positions(KIND_FOOD, [2], [1])
+        rgb = heatmaps.to_rgb(KIND_FOOD)
+        assert tuple(rgb[0, 0]) == COLOR_BACKGROUND
+        assert tuple(rgb[1, 2]) != COLOR_BACKGROUND
+
+        path = tmp_path / 'food.png'
+        heatmaps.render(KIND_FOOD, str(path), cell_size=4)
+        assert path.stat().st_size > 0
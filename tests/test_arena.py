@@ -0,0 +1,109 @@
+"""Unit tests for the multi-snake arena"""
+
+import pytest
+from src.arena import Arena, OccupancyGrid, DEATH_HEAD_ON, DEATH_BODY
+
+
+def make_arena(width=10, height=10):
+    """Create an arena without food so tests control every cell"""
+    arena = Arena(width, height, food_count=0)
+    return arena
+
+
+class TestOccupancyGrid:
+    """Tests for OccupancyGrid class"""
+
+    def test_add_and_remove(self):
+        """Test segment counts per cell"""
+        grid = OccupancyGrid(5, 5)
+        grid.add((2, 3))
+        grid.add((2, 3))
+        assert (2, 3) in grid
+
+        grid.remove((2, 3))
+        assert grid.is_occupied((2, 3)) is True
+        grid.remove((2, 3))
+        assert (2, 3) not in grid
+
+
+class TestArena:
+    """Tests for Arena class"""
+
+    def test_add_snake_marks_grid(self):
+        """Test snake bodies are registered in the occupancy grid"""
+        arena = make_arena()
+        arena.add_snake((2, 5))
+
+        assert arena.grid.is_occupied((2, 5))
+        assert arena.grid.is_occupied((2, 4))
+        assert arena.grid.is_occupied((2, 3))
+
+    def test_add_snake_overlap_rejected(self):
+        """Test overlapping spawns raise ValueError"""
+        arena = make_arena()
+        arena.add_snake((2, 5))
+        with pytest.raises(ValueError):
+            arena.add_snake((2, 6))
+
+    def test_head_on_collision_kills_both(self):
+        """Test two heads entering the same cell both die"""
+        arena = make_arena()
+        left = arena.add_snake((2, 5), direction='RIGHT')
+        right = arena.add_snake((4, 5), direction='LEFT')
+
+        result = arena.step()
+
+        assert result.died == {0: DEATH_HEAD_ON, 1: DEATH_HEAD_ON}
+        assert not left.alive and not right.alive
+        assert not any(arena.grid.cells)
+
+    def test_head_into_other_body(self):
+        """Test a head hitting another snake's body dies, the other survives"""
+        arena = make_arena()
+        wall = arena.add_snake((5, 6), direction='DOWN')
+        runner = arena.add_snake((4, 5), direction='RIGHT')
+
+        result = arena.step()
+
+        assert result.died == {runner.player_id: DEATH_BODY}
+        assert wall.alive
+        assert wall.snake.get_head_position() == (5, 7)
+
+    def test_following_a_tail_is_allowed(self):
+        """Test a head may enter a cell vacated by a tail in the same tick"""
+        arena = make_arena()
+        leader = arena.add_snake((5, 2), direction='DOWN', length=1)
+        follower = arena.add_snake((4, 1), direction='RIGHT', length=1)
+        leader.snake.body = [(5, 2), (5, 1)]
+        arena.grid.add((5, 1))
+
+        arena.step()
+
+        assert leader.alive and follower.alive
+        assert follower.snake.get_head_position() == (5, 1)
+
+    def test_eating_food_grows_and_respawns(self):
+        """Test food is eaten, the snake grows and food moves elsewhere"""
+        arena = Arena(10, 10, food_count=1)
+        player = arena.add_snake((2, 5), direction='RIGHT')
+        food = arena.foods[0]
+        arena._food_at = {(3, 5): 0}
+        food.position = (3, 5)
+
+        result = arena.step()
+
+        assert result.eaten == [player.player_id]
+        assert result.respawned == [0]
+        assert player.score == 1
+        assert len(player.snake.get_body()) == 4
+        assert food.position not in player.snake.get_body()
+
+    def test_wrap_around(self):
+        """Test arena snakes wrap at the board edge"""
+        arena = make_arena()
+        player = arena.add_snake((9, 5), direction='RIGHT')
+
+        arena.step()
+
+        assert player.alive
+        assert player.snake.get_head_position() == (0, 5)
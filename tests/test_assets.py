@@ -0,0 +1,70 @@
+"""Unit tests for the asset cache and warmup stage"""
+
+import os
+import pygame
+from src.assets import AssetCache
+
+
+class TestAssetCache:
+    """Tests for AssetCache class"""
+
+    def test_text_is_rendered_once(self):
+        """Test repeated requests return the cached surface"""
+        pygame.font.init()
+        font = pygame.font.Font(None, 24)
+        cache = AssetCache()
+
+        first = cache.text(font, "PLAY", (255, 255, 255))
+        assert cache.text(font, "PLAY", (255, 255, 255)) is first
+        assert cache.text(font, "PLAY", (0, 0, 0)) is not first
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_least_recently_used_evicted(self):
+        """Test the cache stays bounded and keeps recently used text"""
+        pygame.font.init()
+        font = pygame.font.Font(None, 24)
+        cache = AssetCache(max_text=2)
+
+        keep = cache.text(font, "a", (255, 255, 255))
+        cache.text(font, "b", (255, 255, 255))
+        cache.text(font, "a", (255, 255, 255))
+        cache.text(font, "c", (255, 255, 255))
+
+        assert len(cache) == 2
+        assert cache.text(font, "a", (255, 255, 255)) is keep
+
+
+class TestWarmup:
+    """Tests for the warmup stage run while the menu is idle"""
+
+    def test_first_frame_needs_no_new_text(self, tmp_path):
+        """Test the first gameplay frame only uses pre-rendered text"""
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        from src.game import SnakeGame
+        from src.settings import GameConfig
+
+        game = SnakeGame(headless=True, config=GameConfig(high_score_path=str(tmp_path / "s.json")))
+        steps = 0
+        while game._warmup is not None:
+            game._run_warmup_step()
+            steps += 1
+        assert steps > 1
+
+        misses = game.assets.misses
+        game._start_game()
+        game.render()
+        assert game.assets.misses == misses
+
+    def test_warmup_leaves_state_untouched(self, tmp_path):
+        """Test offscreen warmup rendering does not change the visible state"""
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        from src.game import SnakeGame
+        from src.settings import GameConfig
+        from src.config import STATE_MENU
+
+        game = SnakeGame(headless=True, config=GameConfig(high_score_path=str(tmp_path / "s.json")))
+        window = game.window
+        game._finish_warmup()
+
+        assert game.window is window
+        assert game.current_state == STATE_MENU
@@ -0,0 +1,84 @@
+"""Unit tests for difficulty schedules"""
+
+import pytest
+from src.difficulty import (Difficulty, LinearSchedule, ExponentialSchedule, TieredSchedule,
+                            TimeBasedSchedule, create_schedule)
+from src.settings import GameConfig
+from src.config import GAME_SPEED_INITIAL, GAME_SPEED_MIN, GAME_SPEED_STEP
+
+
+class TestSchedules:
+    """Tests for the schedule classes"""
+
+    def test_linear_matches_original_curve(self):
+        """Test the default schedule reproduces the old per-food speed-up"""
+        schedule = LinearSchedule(GAME_SPEED_INITIAL, GAME_SPEED_MIN, GAME_SPEED_STEP)
+        speed = GAME_SPEED_INITIAL
+        for score in range(1, 30):
+            speed = max(GAME_SPEED_MIN, speed - GAME_SPEED_STEP)
+            assert schedule.interval(score) == pytest.approx(speed)
+
+    def test_exponential_decays_to_minimum(self):
+        """Test the exponential schedule never goes below its minimum"""
+        schedule = ExponentialSchedule(0.1, 0.01, factor=0.9)
+        assert schedule.interval(1) == pytest.approx(0.09)
+        assert schedule.interval(1000) == 0.01
+
+    def test_tiered_steps_at_thresholds(self):
+        """Test tiered intervals change only at tier boundaries"""
+        schedule = TieredSchedule(0.1, 0.01, ((0, 0.0), (5, 0.5), (10, 1.0)))
+        assert schedule.interval(4) == 0.1
+        assert schedule.interval(5) == pytest.approx(0.055)
+        assert schedule.interval(99) == pytest.approx(0.01)
+
+    def test_tiered_follows_configured_speeds(self):
+        """Test the default tiers span the config's initial and minimum speeds"""
+        config = GameConfig(speed_schedule="tiered", game_speed_initial=0.2, game_speed_min=0.05)
+        schedule = create_schedule(config)
+        assert schedule.interval(0) == pytest.approx(0.2)
+        assert schedule.interval(1000) == pytest.approx(0.05)
+
+    def test_time_based_uses_play_time(self):
+        """Test the time-based schedule ignores score"""
+        schedule = TimeBasedSchedule(0.1, 0.02, 0.01, period=10.0)
+        assert schedule.level(50, 9.9) == 0
+        assert schedule.level(0, 25.0) == 2
+
+
+class TestDifficulty:
+    """Tests for Difficulty class"""
+
+    def test_table_lookup_and_rate(self):
+        """Test update() returns the precomputed interval and rate"""
+        difficulty = Difficulty(TieredSchedule(0.1, 0.02, ((0, 0.0), (3, 1.0))), levels=8)
+        assert difficulty.update(3, 0.0) == pytest.approx(0.02)
+        assert difficulty.ticks_per_second == pytest.approx(50.0)
+
+    def test_levels_beyond_table_clamp(self):
+        """Test scores past the table reuse its last entry"""
+        difficulty = Difficulty(LinearSchedule(0.1, 0.001, 0.001), levels=10)
+        assert difficulty.update(500, 0.0) == difficulty.table[-1]
+        difficulty.reset()
+        assert difficulty.interval == 0.1
+
+    def test_create_schedule_from_config(self):
+        """Test the configured schedule name selects the class"""
+        assert isinstance(create_schedule(GameConfig(speed_schedule="exponential")), ExponentialSchedule)
+        with pytest.raises(ValueError):
+            GameConfig(speed_schedule="random")
+
+    def test_game_speeds_up_beyond_old_cap(self):
+        """Test the game takes its tick interval from the schedule"""
+        import os
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        from src.game import SnakeGame
+
+        config = GameConfig(game_speed_initial=0.05, game_speed_min=0.01, game_speed_step=0.01)
+        game = SnakeGame(headless=True, config=config)
+        head_x, head_y = game.snake.get_head_position()
+        game.food.position = (head_x + 1, head_y)
+        game.update()
+
+        assert game.score == 1
+        assert game.game_speed == pytest.approx(0.04)
+        assert game.play_time == pytest.approx(0.05)
@@ -5,6 +5,8 @@ from src.snake import Snake
 from src.food import Food
 from src.game_board import GameBoard
 from src.config import BOARD_WIDTH, BOARD_HEIGHT
+from src.direction import UP, RIGHT, DOWN, LEFT, OPPOSITE, to_code, to_name
+from src.utils import is_valid_direction
 
 
 class TestSnake:
@@ -283,6 +285,38 @@ class TestGameBoard:
         assert board.is_within_bounds((10, 14)) is False
         assert board.is_within_bounds((9, 15)) is False
 
+    def test_neighbour_table_wraps_and_interns(self):
+        """Test table moves wrap around the edges and reuse the board's cells"""
+        board = GameBoard(width=5, height=4)
+        corner = board.wrap_position((0, 0))
+
+        assert board.neighbour(corner, LEFT) == (4, 0)
+        assert board.neighbour(corner, UP) == (0, 3)
+        assert board.neighbour(corner, RIGHT) is board.wrap_position((1, 0))
+        assert board.wrap_position((-1, 4)) is board.wrap_position((4, 0))
+
+    def test_neighbour_table_fills_on_demand(self):
+        """Test a new board holds no cells until a snake visits them"""
+        board = GameBoard(width=300, height=300)
+        assert board.neighbours == {}
+
+        snake = Snake((10, 10), length=3, board=board)
+        snake.move(UP)
+        assert board.steps((10, 9))[LEFT] == (9, 9)
+        assert board.steps((300, 0)) is None
+        assert len(board.neighbours) <= 3
+
+    def test_snake_on_board_moves_without_new_cells(self):
+        """Test a board-attached snake only ever holds the board's cell tuples"""
+        board = GameBoard(width=5, height=4)
+        snake = Snake((4, 1), length=2, board=board)
+
+        snake.move(RIGHT)
+        assert snake.get_head_position() == (0, 1)
+        for _ in range(7):
+            snake.move(DOWN)
+        assert all(segment is board.wrap_position(segment) for segment in snake.body)
+
 
 class TestSnakeGame:
     """Tests for SnakeGame class"""
@@ -507,3 +541,254 @@ class TestWindowResizing:
         assert len(game.snake.get_body()) == initial_body_length
         assert game.board.width == BOARD_WIDTH
         assert game.board.height == BOARD_HEIGHT
+
+
+class TestDirectionCodes:
+    """Tests for integer direction codes and the name shim"""
+
+    def test_opposites_are_symmetric(self):
+        """Test every direction is the opposite of its opposite"""
+        for code in (UP, RIGHT, DOWN, LEFT):
+            assert OPPOSITE[OPPOSITE[code]] == code
+            assert OPPOSITE[code] != code
+
+    def test_names_and_codes_round_trip(self):
+        """Test to_code and to_name convert in both directions"""
+        for code in (UP, RIGHT, DOWN, LEFT):
+            assert to_code(to_name(code)) == code
+            assert to_code(code) == code
+        with pytest.raises(ValueError):
+            to_code('NORTH')
+
+    def test_snake_accepts_codes_and_names(self):
+        """Test moving by code or by name gives the same result"""
+        by_code = Snake((10, 10), length=3)
+        by_name = Snake((10, 10), length=3)
+        by_code.move(RIGHT)
+        by_name.move('RIGHT')
+        assert by_code.body == by_name.body
+        assert by_code.heading == by_name.heading == RIGHT
+        assert by_code.direction == 'RIGHT'
+
+    def test_valid_direction_mixes_codes_and_names(self):
+        """Test reversal checks accept codes and names alike"""
+        assert not is_valid_direction(UP, 'DOWN')
+        assert not is_valid_direction('LEFT', RIGHT)
+        assert is_valid_direction(UP, LEFT)
+
+
+class TestInputQueue:
+    """Tests for buffered direction input"""
+
+    def _make_playing_game(self):
+        """Create a game in the playing state with a dummy video driver"""
+        import os
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+        from src.game import SnakeGame
+        from src.config import STATE_PLAYING
+
+        game = SnakeGame()
+        game.current_state = STATE_PLAYING
+        game.food.position = (0, 0)
+        return game
+
+    def _press(self, game, key):
+        """Send a KEYDOWN event to the game"""
+        import pygame
+        game._handle_keyboard_input(pygame.event.Event(pygame.KEYDOWN, key=key))
+
+    def test_two_keys_in_one_tick_become_two_turns(self):
+        """Test UP then LEFT within one tick are applied on consecutive ticks"""
+        import pygame
+        game = self._make_playing_game()
+        head_x, head_y = game.snake.get_head_position()
+
+        self._press(game, pygame.K_UP)
+        self._press(game, pygame.K_LEFT)
+        assert game.snake.direction == 'RIGHT'
+
+        game.update()
+        assert game.snake.direction == 'UP'
+        assert game.snake.get_head_position() == (head_x, head_y - 1)
+
+        game.update()
+        assert game.snake.direction == 'LEFT'
+        assert game.snake.get_head_position() == (head_x - 1, head_y - 1)
+
+    def test_reversal_checked_against_queued_direction(self):
+        """Test a turn opposite to the last queued direction is rejected"""
+        import pygame
+        game = self._make_playing_game()
+
+        self._press(game, pygame.K_LEFT)
+        assert list(game.input_queue) == []
+
+        self._press(game, pygame.K_UP)
+        self._press(game, pygame.K_DOWN)
+        assert list(game.input_queue) == [UP]
+
+    def test_queue_depth_is_bounded(self):
+        """Test no more than INPUT_QUEUE_DEPTH changes are buffered"""
+        import pygame
+        from src.config import INPUT_QUEUE_DEPTH
+        game = self._make_playing_game()
+
+        for key in [pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN, pygame.K_RIGHT, pygame.K_UP]:
+            self._press(game, key)
+
+        assert len(game.input_queue) == INPUT_QUEUE_DEPTH
+
+    def test_event_filter(self):
+        """Test only handled event types are allowed into the queue"""
+        import pygame
+        self._make_playing_game()
+
+        assert pygame.event.get_blocked(pygame.MOUSEMOTION)
+        assert not pygame.event.get_blocked(pygame.KEYDOWN)
+
+
+class TestLayoutCache:
+    """Tests for geometry cached by the layout manager"""
+
+    def test_layout_is_cached_until_resize(self):
+        """Test the same rects are served until the window is resized"""
+        import os
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+        from src.game import SnakeGame
+        game = SnakeGame()
+
+        first_rect, _ = game._get_layout()
+        second_rect, _ = game._get_layout()
+        assert first_rect is second_rect
+
+        game._handle_window_resize(1000, 700)
+        resized_rect, ui_rect = game._get_layout()
+        assert resized_rect is not first_rect
+        assert resized_rect.width + ui_rect.width == 1000
+        assert game.layout.column_centers[0] == int(resized_rect.x + game._get_cell_size()[0] / 2)
+
+    def test_buttons_clickable_before_first_render(self):
+        """Test click targets no longer depend on the last rendered frame"""
+        import os
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+        from src.game import SnakeGame
+        from src.config import STATE_GAME_OVER, STATE_PLAYING, STATE_PAUSED
+
+        game = SnakeGame()
+        game.current_state = STATE_GAME_OVER
+        game._handle_mouse_click(game.layout.game_over_buttons['play_again'].center)
+        assert game.current_state == STATE_PLAYING
+
+        game._handle_mouse_click(game.layout.panel_buttons['pause'].center)
+        assert game.current_state == STATE_PAUSED
+
+    def test_cell_rects_cover_board(self):
+        """Test every board cell has a precomputed integer rect"""
+        import os
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+
+        from src.game import SnakeGame
+        game = SnakeGame()
+        layout = game.layout
+        game_rect, _ = game._get_layout()
+
+        assert len(layout.cell_rects) == BOARD_WIDTH * BOARD_HEIGHT
+        first = layout.cell_rects[layout.cell_index((0, 0))]
+        last = layout.cell_rects[layout.cell_index((BOARD_WIDTH - 1, BOARD_HEIGHT - 1))]
+        assert first.topleft == game_rect.topleft
+        assert last.right <= game_rect.right
+        assert last.bottom <= game_rect.bottom
+        assert layout.sprites['head'].get_size() == first.size
+
+
+class TestIdlePacing:
+    """Tests for event-driven redraws on idle screens"""
+
+    def _make_idle_game(self, tmp_path):
+        """Create an offscreen game on the menu screen with idle events enabled
+
+        Events already queued by SDL are discarded, so each test sees only
+        the events it posts.
+        """
+        import pygame
+        from src.game import SnakeGame
+        from src.settings import GameConfig
+
+        game = SnakeGame(headless=True, config=GameConfig(high_score_path=str(tmp_path / "s.json")))
+        game._set_idle_events(True)
+        game.render()
+        pygame.event.clear()
+        return game
+
+    def test_idle_screen_not_redrawn_without_events(self, tmp_path):
+        """Test the menu is not redrawn when nothing happened"""
+        game = self._make_idle_game(tmp_path)
+        game._wait_for_events(timeout_ms=1)
+
+        assert not game._needs_render()
+
+    def test_hover_change_triggers_redraw(self, tmp_path):
+        """Test mouse motion only redraws when the hovered button changes"""
+        import pygame
+        game = self._make_idle_game(tmp_path)
+
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=(1, 1), rel=(0, 0), buttons=(0, 0, 0)))
+        game._wait_for_events(timeout_ms=1)
+        assert not game._needs_render()
+
+        pygame.event.post(pygame.event.Event(pygame.MOUSEMOTION, pos=game.play_button_rect.center,
+                                             rel=(0, 0), buttons=(0, 0, 0)))
+        game._wait_for_events(timeout_ms=1)
+        assert game._needs_render()
+
+    def test_key_press_wakes_idle_screen(self, tmp_path):
+        """Test input handled while waiting switches back to full pacing"""
+        import pygame
+        from src.config import STATE_PLAYING
+        game = self._make_idle_game(tmp_path)
+
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_RETURN))
+        game._wait_for_events(timeout_ms=1)
+
+        assert game.current_state == STATE_PLAYING
+        assert game._needs_render()
+        game._set_idle_events(False)
+        assert pygame.event.get_blocked(pygame.MOUSEMOTION)
+
+
+class TestBestScoreCache:
+    """Tests for cached best-score labels"""
+
+    def test_label_rerendered_only_on_change(self, tmp_path):
+        """Test the best-score surface is reused until the high score changes"""
+        import os
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        from src.game import SnakeGame
+        from src.settings import GameConfig
+
+        game = SnakeGame(headless=True, config=GameConfig(high_score_path=str(tmp_path / "s.json")))
+        first = game._best_score_text("Best: {}", game.font_small, (255, 255, 255))
+        game.render()
+        assert game._best_score_text("Best: {}", game.font_small, (255, 255, 255)) is first
+
+        game.high_score_manager.update_score(0)
+        assert game._best_score_text("Best: {}", game.font_small, (255, 255, 255)) is first
+
+        game.high_score_manager.update_score(9)
+        assert game._best_score_text("Best: {}", game.font_small, (255, 255, 255)) is not first
+
+    def test_version_tracks_high_score(self, tmp_path):
+        """Test the version changes on a new high score and on reset only"""
+        from src.high_score import HighScoreManager
+        manager = HighScoreManager(str(tmp_path / "s.json"))
+        start = manager.get_version()
+
+        manager.update_last_game_score(3)
+        assert manager.get_version() == start
+        manager.update_score(3)
+        assert manager.get_version() == start + 1
+        manager.reset_stats()
+        assert manager.get_version() == start + 2
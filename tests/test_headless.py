@@ -0,0 +1,105 @@
+"""Unit tests for offscreen rendering"""
+
+import os
+import io
+import random
+import pygame
+from src.arena import Arena
+from src.protocol import encode_delta, encode_snapshot, read_recording, write_recording
+from src.headless import (HeadlessRenderer, frames_from_recording, recording_board_size,
+                          render_png_sequence, render_rgb_stream)
+from src.config import COLOR_SNAKE_HEAD, COLOR_FOOD
+
+
+def make_recording(ticks=5, size=20, food_count=1):
+    """Record a short single-snake arena game"""
+    arena = Arena(size, size, food_count=food_count, rng=random.Random(5))
+    arena.add_snake((size // 2, size // 2))
+    messages = [encode_snapshot(arena)]
+    for _ in range(ticks):
+        messages.append(encode_delta(arena, arena.step()))
+    return messages
+
+
+class TestHeadlessRenderer:
+    """Tests for HeadlessRenderer class"""
+
+    def test_render_never_opens_window(self):
+        """Test frames are drawn offscreen at the requested size"""
+        renderer = HeadlessRenderer(320, 240)
+        surface = renderer.render(([(5, 5), (5, 4)], (1, 1), 3))
+
+        assert surface.get_size() == (320, 240)
+        assert surface is not pygame.display.get_surface()
+
+    def test_surface_is_reused(self):
+        """Test every frame is drawn into the same preallocated surface"""
+        renderer = HeadlessRenderer(320, 240)
+        first = renderer.render(([(5, 5)], (1, 1), 0))
+        second = renderer.render(([(6, 5)], (1, 1), 0))
+
+        assert first is second
+
+    def test_head_is_drawn(self):
+        """Test the snake head colour appears at its cell centre"""
+        renderer = HeadlessRenderer(800, 600)
+        surface = renderer.render(([(0, 0)], (10, 10), 0))
+        cell_width, cell_height = renderer.game._get_cell_size()
+
+        centre = (int(cell_width / 2), int(cell_height / 2))
+        assert tuple(surface.get_at(centre))[:3] == COLOR_SNAKE_HEAD
+
+    def test_frames_from_recording(self, tmp_path):
+        """Test recordings decode into one frame per message"""
+        path = tmp_path / "game.rec"
+        write_recording(path, make_recording(5))
+        frames = list(frames_from_recording(read_recording(path)))
+
+        assert len(frames) == 6
+        assert frames[-1][0][0] == (15, 10)
+
+    def test_recording_board_size_is_used(self):
+        """Test a 32x32 recording renders with its head on the right cell"""
+        messages = make_recording(3, size=32)
+        board_size = recording_board_size(messages)
+        renderer = HeadlessRenderer(800, 600, board_size)
+        frames = list(frames_from_recording(messages))
+        surface = renderer.render(frames[-1])
+
+        assert board_size == (32, 32)
+        head_x, head_y = frames[-1][0][0]
+        rect = renderer.game.layout.cell_rects[head_y * 32 + head_x]
+        assert tuple(surface.get_at(rect.center))[:3] == COLOR_SNAKE_HEAD
+
+    def test_board_without_food(self):
+        """Test frames of a board with no food carry None and draw no food"""
+        frames = list(frames_from_recording(make_recording(2, food_count=0)))
+        surface = HeadlessRenderer(320, 240).render(frames[-1])
+
+        assert frames[-1][1] is None
+        width, height = surface.get_size()
+        assert all(tuple(surface.get_at((x, y)))[:3] != COLOR_FOOD
+                   for x in range(0, width, 4) for y in range(0, height, 4))
+
+
+class TestRenderPool:
+    """Tests for the worker pool exports"""
+
+    def test_png_sequence(self, tmp_path):
+        """Test the pool writes one PNG per frame in order"""
+        frames = list(frames_from_recording(make_recording(3)))
+        paths = render_png_sequence(frames, str(tmp_path), size=(160, 120), workers=2)
+
+        assert [os.path.basename(path) for path in paths] == [
+            "frame_000000.png", "frame_000001.png", "frame_000002.png", "frame_000003.png"
+        ]
+        assert all(os.path.exists(path) for path in paths)
+
+    def test_rgb_stream(self):
+        """Test raw RGB output has the exact frame size"""
+        frames = list(frames_from_recording(make_recording(2)))
+        stream = io.BytesIO()
+        count = render_rgb_stream(frames, stream, size=(160, 120), workers=2)
+
+        assert count == 3
+        assert len(stream.getvalue()) == 3 * 160 * 120 * 3
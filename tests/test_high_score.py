@@ -16,23 +16,14 @@ class TestHighScoreManager:
             tmp_file.write('{"high_score": 15, "last_game_score": 10, "total_games": 3}')
             tmp_file_path = tmp_file.name
         
-        # Mock the file path in the manager
-        original_init = HighScoreManager.__init__
-        def mock_init(self):
-            self.high_score_file = tmp_file_path
-            self.stats = self._load_stats()
-        HighScoreManager.__init__ = mock_init
-        
         try:
-            manager = HighScoreManager()
+            manager = HighScoreManager(tmp_file_path)
             assert manager.get_high_score() == 15
             stats = manager.get_stats()
             assert stats['high_score'] == 15
             assert stats['last_game_score'] == 10
             assert stats['total_games'] == 3
         finally:
-            # Restore original init
-            HighScoreManager.__init__ = original_init
             # Clean up temp file
             if os.path.exists(tmp_file_path):
                 os.unlink(tmp_file_path)
@@ -43,21 +34,14 @@ class TestHighScoreManager:
             tmp_file.write('{"high_score": 10, "last_game_score": 5, "total_games": 2}')
             tmp_file_path = tmp_file.name
         
-        original_init = HighScoreManager.__init__
-        def mock_init(self):
-            self.high_score_file = tmp_file_path
-            self.stats = self._load_stats()
-        HighScoreManager.__init__ = mock_init
-        
         try:
-            manager = HighScoreManager()
+            manager = HighScoreManager(tmp_file_path)
             is_new_high = manager.update_score(15)
             
             assert is_new_high is True
             assert manager.get_high_score() == 15
             assert manager.get_stats()['high_score'] == 15
         finally:
-            HighScoreManager.__init__ = original_init
             if os.path.exists(tmp_file_path):
                 os.unlink(tmp_file_path)
     
@@ -67,20 +51,13 @@ class TestHighScoreManager:
             tmp_file.write('{"high_score": 20, "last_game_score": 10, "total_games": 2}')
             tmp_file_path = tmp_file.name
         
-        original_init = HighScoreManager.__init__
-        def mock_init(self):
-            self.high_score_file = tmp_file_path
-            self.stats = self._load_stats()
-        HighScoreManager.__init__ = mock_init
-        
         try:
-            manager = HighScoreManager()
+            manager = HighScoreManager(tmp_file_path)
             is_new_high = manager.update_score(15)
             
             assert is_new_high is False
             assert manager.get_high_score() == 20  # Should remain unchanged
         finally:
-            HighScoreManager.__init__ = original_init
             if os.path.exists(tmp_file_path):
                 os.unlink(tmp_file_path)
     
@@ -90,21 +67,14 @@ class TestHighScoreManager:
             tmp_file.write('{"high_score": 15, "last_game_score": 10, "total_games": 2}')
             tmp_file_path = tmp_file.name
         
-        original_init = HighScoreManager.__init__
-        def mock_init(self):
-            self.high_score_file = tmp_file_path
-            self.stats = self._load_stats()
-        HighScoreManager.__init__ = mock_init
-        
         try:
-            manager = HighScoreManager()
+            manager = HighScoreManager(tmp_file_path)
             manager.update_last_game_score(25)
             
             stats = manager.get_stats()
             assert stats['last_game_score'] == 25
             assert stats['total_games'] == 3  # Incremented
         finally:
-            HighScoreManager.__init__ = original_init
             if os.path.exists(tmp_file_path):
                 os.unlink(tmp_file_path)
     
@@ -114,14 +84,8 @@ class TestHighScoreManager:
             tmp_file.write('{"high_score": 30, "last_game_score": 25, "total_games": 5}')
             tmp_file_path = tmp_file.name
         
-        original_init = HighScoreManager.__init__
-        def mock_init(self):
-            self.high_score_file = tmp_file_path
-            self.stats = self._load_stats()
-        HighScoreManager.__init__ = mock_init
-        
         try:
-            manager = HighScoreManager()
+            manager = HighScoreManager(tmp_file_path)
             manager.reset_stats()
             
             stats = manager.get_stats()
@@ -129,6 +93,85 @@ class TestHighScoreManager:
             assert stats['last_game_score'] == 0
             assert stats['total_games'] == 0
         finally:
-            HighScoreManager.__init__ = original_init
             if os.path.exists(tmp_file_path):
-                os.unlink(tmp_file_path)
\ No newline at end of file
+                os.unlink(tmp_file_path)
+
+
+def _play_games(path, games):
+    """Record finished games from a separate process"""
+    manager = HighScoreManager(path)
+    for score in range(games):
+        manager.update_last_game_score(score)
+        manager.update_score(score)
+
+
+class TestConcurrentHighScores:
+    """Tests for sharing one stats file between managers and processes"""
+
+    def test_concurrent_writers_never_lose_counts(self, tmp_path):
+        """Test total_games counts every game from every process"""
+        import multiprocessing
+        path = str(tmp_path / "scores.json")
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=_play_games, args=(path, 25)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        stats = HighScoreManager(path).get_stats()
+        assert stats["total_games"] == 100
+        assert stats["high_score"] == 24
+
+    def test_replace_keeps_file_mode(self, tmp_path):
+        """Test the atomic replace keeps the stats file's permissions"""
+        path = tmp_path / "scores.json"
+        manager = HighScoreManager(str(path))
+        manager.update_score(1)
+        os.chmod(path, 0o640)
+        manager.update_score(2)
+
+        assert path.stat().st_mode & 0o777 == 0o640
+
+    def test_new_file_mode_follows_umask(self, tmp_path):
+        """Test a new stats file gets the umask-based mode open() would give it"""
+        path = tmp_path / "scores.json"
+        previous = os.umask(0o022)
+        try:
+            HighScoreManager(str(path)).update_score(1)
+        finally:
+            os.umask(previous)
+
+        assert path.stat().st_mode & 0o777 == 0o644
+
+    def test_update_merges_with_other_instance(self, tmp_path):
+        """Test a stale instance does not overwrite another instance's update"""
+        path = str(tmp_path / "scores.json")
+        first = HighScoreManager(path)
+        second = HighScoreManager(path)
+
+        first.update_score(30)
+        assert second.update_score(20) is False
+        second.update_last_game_score(20)
+
+        assert HighScoreManager(path).get_stats() == {
+            "high_score": 30, "last_game_score": 20, "total_games": 1
+        }
+
+    def test_reads_are_cached_until_file_changes(self, tmp_path, monkeypatch):
+        """Test reads skip the disk until the refresh interval and mtime say otherwise"""
+        import src.high_score as high_score
+        path = str(tmp_path / "scores.json")
+        manager = HighScoreManager(path)
+        HighScoreManager(path).update_score(12)
+
+        # Within the refresh interval the cached value is served
+        assert manager.get_high_score() == 0
+
+        monkeypatch.setattr(high_score, "HIGH_SCORE_REFRESH_INTERVAL", 0)
+        manager._next_refresh = 0.0
+        assert manager.get_high_score() == 12
+        loads = []
+        monkeypatch.setattr(manager, "_load_stats", lambda: loads.append(1) or manager.stats)
+        manager.get_high_score()
+        assert loads == []
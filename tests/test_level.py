@@ -0,0 +1,131 @@
+"""Unit tests for maze levels"""
+
+import os
+import pytest
+import src.level as level_module
+from src.level import compile_level, load_level, find_level, Level
+from src.game_board import GameBoard
+from src.food import Food
+
+MAZE = "#####\n#...#\n#.#.#\n#S..#\n#####\n"
+
+
+class TestCompileLevel:
+    """Tests for compile_level function"""
+
+    def test_bitmap_and_free_cells(self):
+        """Test walls become bits and everything else a free cell"""
+        level = compile_level(MAZE)
+
+        assert (level.width, level.height) == (5, 5)
+        assert level.spawn == (1, 3)
+        assert level.is_wall((0, 0)) and level.is_wall((2, 2))
+        assert not level.is_wall((3, 2))
+        assert sorted(level.free_cells) == [6, 7, 8, 11, 13, 16, 17, 18]
+        assert len(level.wall_positions()) == 17
+
+    def test_short_rows_padded_with_free_cells(self):
+        """Test ragged rows are padded to the widest row"""
+        level = compile_level("###\n#\n", snake_length=1)
+        assert level.width == 3
+        assert not level.is_wall((2, 1))
+
+    def test_invalid_levels_rejected(self):
+        """Test empty, full or walled-in-start levels raise ValueError"""
+        with pytest.raises(ValueError):
+            compile_level("\n\n")
+        with pytest.raises(ValueError):
+            compile_level("###\n###\n")
+        with pytest.raises(ValueError):
+            compile_level("...\n.#.\n...\n")
+
+    def test_snake_must_fit_at_start(self):
+        """Test a start whose body cells hit a wall is rejected for that length"""
+        text = "#####\n#...#\n#.S.#\n#####\n"
+        assert compile_level(text, snake_length=2).spawn == (2, 2)
+        with pytest.raises(ValueError):
+            compile_level(text, snake_length=3)
+
+    def test_first_move_must_be_free(self):
+        """Test a wall right of the start is rejected, since the snake heads right"""
+        with pytest.raises(ValueError):
+            compile_level("#####\n#..##\n#..##\n#.S##\n#####\n")
+        assert compile_level("#####\n#...#\n#...#\n#.S.#\n#####\n").spawn == (2, 3)
+    def test_bytes_round_trip(self):
+        """Test the compiled form survives serialization"""
+        level = compile_level(MAZE)
+        copy = Level.from_bytes(level.to_bytes())
+
+        assert copy.walls == level.walls
+        assert list(copy.free_cells) == list(level.free_cells)
+        assert copy.spawn == level.spawn
+
+
+class TestLoadLevel:
+    """Tests for load_level function"""
+
+    def test_second_load_uses_cache(self, tmp_path, monkeypatch):
+        """Test compiled levels are reused while the source is unchanged"""
+        path = tmp_path / "maze.txt"
+        path.write_text(MAZE)
+        cache_dir = str(tmp_path / "cache")
+        load_level(str(path), cache_dir)
+        assert len(os.listdir(cache_dir)) == 1
+
+        def fail(text):
+            raise AssertionError("level was recompiled")
+        monkeypatch.setattr(level_module, "compile_level", fail)
+        assert load_level(str(path), cache_dir).spawn == (1, 3)
+        with pytest.raises(ValueError):
+            load_level(str(path), cache_dir, snake_length=4)
+
+    def test_changed_source_recompiles(self, tmp_path):
+        """Test editing the source produces a new cache entry"""
+        path = tmp_path / "maze.txt"
+        cache_dir = str(tmp_path / "cache")
+        path.write_text(MAZE)
+        load_level(str(path), cache_dir)
+        path.write_text(MAZE.replace("#.#", "#..", 1))
+
+        assert not load_level(str(path), cache_dir).is_wall((2, 2))
+        assert len(os.listdir(cache_dir)) == 2
+
+    def test_bundled_levels_load(self):
+        """Test the levels shipped in src/levels/ compile"""
+        for name in ("box", "cross"):
+            level = load_level(find_level(name), cache_dir=None)
+            assert not level.is_wall(level.spawn)
+
+
+class TestLevelGameplay:
+    """Tests for walls in the board, food spawning and the game"""
+
+    def test_food_never_spawns_in_walls(self):
+        """Test food is placed from the free-cell list"""
+        level = compile_level(MAZE)
+        board = GameBoard(level.width, level.height, level)
+        food = Food(board)
+        for _ in range(200):
+            food.spawn()
+            assert not board.is_wall(food.get_position())
+
+    def test_snake_dies_on_wall(self, tmp_path):
+        """Test moving into a wall ends the game"""
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        from src.game import SnakeGame
+        from src.settings import GameConfig
+        from src.config import STATE_GAME_OVER
+
+        path = tmp_path / "maze.txt"
+        path.write_text("#######\n#.....#\n#.....#\n#..S..#\n#######\n")
+        config = GameConfig(level=str(path), initial_snake_length=2,
+                            high_score_path=str(tmp_path / "s.json"))
+        game = SnakeGame(headless=True, config=config)
+        game._start_game()
+        game.food.position = (1, 1)
+        game.snake.direction = 'DOWN'
+        game.update()
+
+        assert game.board.check_wall_collision((3, 4))
+        assert game.current_state == STATE_GAME_OVER
+        assert len(game.layout.wall_draw_list) == len(game.board.level.wall_positions())
@@ -0,0 +1,153 @@
+"""Tests for the arena server and the load generator"""
+
+import json
+import time
+import asyncio
+import pytest
+from src.arena_server import ArenaServer, MessageReader, frame_message
+from src.loadgen import (CapacityReport, StepResult, percentile, summarize, compare, run_bots,
+                         run_step)
+
+
+def _step(clients, lateness_p99, latency_p99, connected=None):
+    """Build a StepResult with the given p99s"""
+    summary = summarize([1.0])
+    return StepResult(
+        clients=clients, connected=clients if connected is None else connected, duration=1.0,
+        tick_lateness_ms=dict(summary, p99=lateness_p99), tick_duration_ms=summary,
+        client_jitter_ms=summary, input_latency_ms=dict(summary, p99=latency_p99),
+        ticks_per_second=10.0, messages_per_second=1.0, bytes_per_second=1.0,
+        inputs_per_second=1.0, overruns=0, lost_inputs=0, slow_disconnects=0)
+
+
+class TestMessageReader:
+    """Tests for MessageReader class"""
+
+    def test_messages_split_across_reads(self):
+        """Test frames are reassembled whatever the read boundaries"""
+        stream = frame_message(b'abc') + frame_message(b'') + frame_message(b'xyz1')
+        reader = MessageReader()
+        messages = []
+        for index in range(0, len(stream), 3):
+            messages.extend(reader.feed(stream[index:index + 3]))
+        assert messages == [b'abc', b'', b'xyz1']
+
+    def test_oversized_length_rejected(self):
+        """Test a length prefix over the limit raises instead of buffering"""
+        reader = MessageReader(max_length=8)
+        assert reader.feed(frame_message(b'12345678')) == [b'12345678']
+        with pytest.raises(ValueError):
+            reader.feed(frame_message(b'123456789'))
+
+
+class TestArenaServer:
+    """Tests for ArenaServer class"""
+
+    def test_bots_play_against_server(self):
+        """Test bots are seated in rooms and their turns come back confirmed"""
+        async def session():
+            server = ArenaServer(port=0, tick_interval=0.02)
+            await server.start()
+            stopping = []
+            ticker = asyncio.create_task(server.run(lambda: bool(stopping)))
+            now = time.time()
+            stats = await run_bots(server.port, 10, (now + 0.2, now + 1.2), rate=10.0,
+                                   tick_interval=0.02, seed=3)
+            stopping.append(True)
+            await ticker
+            await server.close()
+            return server, stats
+
+        server, stats = asyncio.run(session())
+        assert stats.connected == 10
+        assert len(server.rooms) == 2
+        assert server.stats.peak_connections == 10
+        assert server.stats.inputs > 0
+        assert len(stats.latency_ms) > 0
+        # A turn waits for at most the next tick plus delivery
+        assert percentile(stats.latency_ms, 0.5) < 1000.0
+
+
+    def test_malformed_input_disconnects_client(self):
+        """Test garbage from a client closes its connection and the server keeps ticking"""
+        async def session():
+            server = ArenaServer(port=0, tick_interval=0.02)
+            await server.start()
+            stopping = []
+            ticker = asyncio.create_task(server.run(lambda: bool(stopping)))
+            results = []
+            # Empty frame, bad direction code, oversized length prefix
+            for payload in (frame_message(b''),
+                            frame_message(bytes((3, 0, 0, 0, 0, 0, 1, 1, 0, 0, 0, 9))),
+                            b'\xff\xff\xff\x7f'):
+                reader, writer = await asyncio.open_connection(server.host, server.port)
+                writer.write(payload)
+                await writer.drain()
+                await asyncio.wait_for(reader.read(), timeout=5.0)
+                results.append(reader.at_eof())
+                writer.close()
+            stopping.append(True)
+            await ticker
+            await server.close()
+            return server, results
+
+        server, results = asyncio.run(session())
+        assert results == [True, True, True]
+        assert server.stats.rejected == 3
+        assert server.stats.ticks > 0
+
+    def test_seeded_rooms_repeat_food(self):
+        """Test servers with the same seed give their rooms the same food spawns"""
+        class Connection:
+            """Connection that drops what the server sends"""
+            def send(self, data):
+                pass
+
+        def foods(seed):
+            server = ArenaServer(seed=seed)
+            server.join(Connection())
+            room = server.rooms[0]
+            first = room.server.arena.food_positions()
+            room.reset()
+            return first, room.server.arena.food_positions()
+
+        assert foods(5) == foods(5)
+        assert foods(5) != foods(6)
+
+
+class TestCapacityReport:
+    """Tests for CapacityReport class"""
+
+    def test_capacity_is_largest_step_within_budget(self, tmp_path):
+        """Test budgets pick the capacity and the JSON report compares"""
+        report = CapacityReport([_step(100, 1.0, 80.0), _step(200, 4.0, 120.0),
+                                 _step(400, 30.0, 400.0), _step(800, 2.0, 90.0, connected=700)],
+                                jitter_budget_ms=10.0, latency_budget_ms=150.0)
+        assert report.capacity == 200
+        assert "Capacity: 200 clients" in report.format()
+
+        path = tmp_path / 'capacity.json'
+        report.save(str(path))
+        saved = json.loads(path.read_text())
+        assert saved['capacity'] == 200
+        assert "200 clients" in compare(saved, report)
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles"""
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile([], 0.5) == 0.0
+
+
+class TestRunStep:
+    """Tests for run_step function"""
+
+    def test_small_step_measures_everything(self):
+        """Test one step with a server process and a client process"""
+        step = run_step(16, processes=1, duration=1.0, rate=4.0)
+        assert step.connected == 16
+        assert step.ticks_per_second > 0
+        assert step.tick_lateness_ms['samples'] > 0
+        assert step.input_latency_ms['samples'] > 0
+        assert step.messages_per_second > 0
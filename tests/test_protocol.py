@@ -0,0 +1,191 @@
+"""Unit tests for the state-sync protocol and client prediction"""
+
+import random
+import pytest
+from src.arena import Arena
+from src.direction import UP, LEFT
+from src.protocol import (MirrorState, Snapshot, Delta, InputBatch, Welcome, decode,
+                          encode_delta, encode_inputs, encode_snapshot, encode_welcome,
+                          message_type)
+from src.netplay import LocalServer, LoopbackLink, PredictingClient, run_loopback_session
+
+
+def make_arena(seed=1):
+    """Create a small arena with two snakes"""
+    arena = Arena(16, 16, food_count=2, rng=random.Random(seed))
+    arena.add_snake((4, 8))
+    arena.add_snake((10, 8), direction='LEFT')
+    return arena
+
+
+class TestProtocol:
+    """Tests for message encoding and the mirrored state"""
+
+    def test_snapshot_roundtrip(self):
+        """Test a snapshot decodes to the arena state"""
+        arena = make_arena()
+        snapshot = decode(encode_snapshot(arena))
+
+        assert isinstance(snapshot, Snapshot)
+        assert (snapshot.width, snapshot.height) == (16, 16)
+        assert snapshot.foods == arena.food_positions()
+        assert snapshot.players[0].body == arena.players[0].snake.get_body()
+        assert snapshot.players[1].heading == LEFT
+
+    def test_delta_is_one_byte_per_snake(self):
+        """Test a delta without food respawns costs one byte per snake"""
+        arena = make_arena()
+        arena.foods[0].position = arena.foods[1].position = (0, 0)
+        arena._food_at = {(0, 0): 1}
+        result = arena.step({0: 'DOWN'})
+        data = encode_delta(arena, result)
+
+        assert len(data) == 5 + len(arena.players) + 1
+        delta = decode(data, len(arena.players))
+        assert isinstance(delta, Delta)
+        assert delta.tick == 1
+
+    def test_mirror_follows_deltas(self):
+        """Test deltas rebuild the exact server state"""
+        arena = make_arena()
+        mirror = MirrorState(decode(encode_snapshot(arena)))
+        rng = random.Random(3)
+
+        for _ in range(50):
+            result = arena.step({0: rng.choice(['UP', 'DOWN', 'LEFT', 'RIGHT'])})
+            assert mirror.apply_delta(decode(encode_delta(arena, result), 2))
+
+        assert mirror.tick == arena.tick
+        assert mirror.food_positions() == arena.food_positions()
+        for mirrored, actual in zip(mirror.players, arena.players):
+            assert mirrored.alive == actual.alive
+            assert mirrored.score == actual.score
+            assert mirrored.snake.body == actual.snake.body
+
+    def test_mirror_rejects_gap(self):
+        """Test a delta that skips a tick is not applied"""
+        arena = make_arena()
+        mirror = MirrorState(decode(encode_snapshot(arena)))
+        arena.step()
+        result = arena.step()
+
+        assert mirror.apply_delta(decode(encode_delta(arena, result), 2)) is False
+        assert mirror.tick == 0
+
+    def test_input_roundtrip(self):
+        """Test input batches keep tick tags and directions"""
+        batch = decode(encode_inputs(7, 1, [(8, 'UP'), (9, 'LEFT')]))
+
+        assert isinstance(batch, InputBatch)
+        assert batch.player_id == 1
+        assert batch.inputs == [(8, UP), (9, LEFT)]
+
+    def test_welcome_roundtrip(self):
+        """Test the welcome message carries the assigned player id"""
+        assert decode(encode_welcome(12, 5)) == Welcome(12, 5)
+
+    def test_oversized_board_rejected(self):
+        """Test boards whose cells do not fit 16 bits fail with ValueError"""
+        arena = Arena(300, 300, food_count=0)
+        with pytest.raises(ValueError):
+            encode_snapshot(arena)
+        with pytest.raises(ValueError):
+            LocalServer(arena)
+
+    def test_mirror_keeps_board_across_keyframes(self):
+        """Test a keyframe of the same size reuses the mirror's board"""
+        arena = make_arena()
+        mirror = MirrorState(decode(encode_snapshot(arena)))
+        board = mirror.board
+        arena.step()
+        mirror.apply_snapshot(decode(encode_snapshot(arena)))
+        assert mirror.board is board
+        assert mirror.tick == 1
+
+    def test_malformed_messages_raise_value_error(self):
+        """Test empty, truncated and bad-direction messages raise ValueError"""
+        data = encode_inputs(7, 1, [(8, 'UP')])
+        with pytest.raises(ValueError):
+            message_type(b'')
+        with pytest.raises(ValueError):
+            decode(data[:-1])
+        with pytest.raises(ValueError):
+            decode(data[:-1] + bytes((9,)))
+        with pytest.raises(ValueError):
+            decode(encode_snapshot(make_arena())[:12])
+        with pytest.raises(ValueError):
+            decode(encode_delta(make_arena(), make_arena().step())[:6], 2)
+
+
+class TestNetplay:
+    """Tests for prediction and the loopback harness"""
+
+    def test_loopback_link_latency_and_loss(self):
+        """Test messages arrive after the latency and loss drops them"""
+        link = LoopbackLink(50)
+        link.send(b'a', 0)
+        assert link.receive(49) == []
+        assert link.receive(50) == [b'a']
+
+        lossy = LoopbackLink(0, loss=1.0)
+        lossy.send(b'a', 0)
+        assert lossy.receive(100) == []
+        assert lossy.dropped == 1
+
+    def test_prediction_applies_input_immediately(self):
+        """Test the client moves its snake before the server confirms"""
+        arena = make_arena()
+        server = LocalServer(arena)
+        client = PredictingClient(0, lead_ticks=2)
+        client.receive(server.snapshot())
+
+        client.set_direction('DOWN')
+        client.advance()
+        assert client.predicted.direction == 'DOWN'
+        assert arena.players[0].snake.direction == 'RIGHT'
+
+    def test_rollback_on_mismatch(self):
+        """Test a prediction the server never saw is rolled back"""
+        arena = make_arena()
+        server = LocalServer(arena)
+        client = PredictingClient(0, lead_ticks=0)
+        client.receive(server.snapshot())
+
+        # The input is never delivered to the server
+        client.set_direction('DOWN')
+        client.advance()
+        client.receive(server.tick())
+
+        assert client.rollbacks == 1
+        assert client.predicted.body == arena.players[0].snake.body
+
+    def test_server_bounds_pending_inputs(self):
+        """Test far-future inputs are ignored and each player's queue is capped"""
+        arena = make_arena()
+        server = LocalServer(arena, max_lead=10, max_pending=4)
+        server.receive(encode_inputs(0, 0, [(tick, 'DOWN') for tick in range(1, 200)]))
+        server.receive(encode_inputs(0, 1, [(11, 'UP'), (5000, 'UP')]))
+
+        assert sorted(server._pending[0]) == [1, 2, 3, 4]
+        assert sorted(server._pending[1]) == []
+
+    def test_session_without_loss_never_mispredicts(self):
+        """Test a 100ms RTT session stays in sync and costs a few bytes per tick"""
+        stats = run_loopback_session(ticks=300, rtt_ms=100, loss=0.0, seed=2)
+
+        assert stats['rollbacks'] == 0
+        assert stats['downlink_bytes_per_tick'] < 16
+
+    def test_session_with_loss_completes(self):
+        """Test packet loss is survived through keyframes"""
+        stats = run_loopback_session(ticks=300, rtt_ms=100, loss=0.1, seed=2)
+
+        assert stats['ticks'] > 0
+        assert stats['skipped_deltas'] > 0
+
+    def test_session_is_seeded_locally(self):
+        """Test a session repeats for a seed without touching the global random state"""
+        state = random.getstate()
+        first = run_loopback_session(ticks=100, seed=5)
+        assert random.getstate() == state
+        assert run_loopback_session(ticks=100, seed=5) == first
@@ -0,0 +1,80 @@
+"""Unit tests for runtime configuration profiles"""
+
+import json
+import pytest
+from src.settings import GameConfig, DEFAULT_CONFIG, load_config
+from src.config import BOARD_WIDTH, GAME_SPEED_INITIAL
+
+
+class TestGameConfig:
+    """Tests for GameConfig class"""
+
+    def test_defaults_match_constants(self):
+        """Test the default profile uses the values from src.config"""
+        assert DEFAULT_CONFIG.board_width == BOARD_WIDTH
+        assert DEFAULT_CONFIG.game_speed_initial == GAME_SPEED_INITIAL
+
+    def test_config_is_frozen(self):
+        """Test settings cannot change after startup"""
+        with pytest.raises(AttributeError):
+            DEFAULT_CONFIG.board_width = 50
+
+    def test_invalid_values_rejected(self):
+        """Test validation runs when the config is built"""
+        with pytest.raises(ValueError):
+            GameConfig(board_width=0)
+        with pytest.raises(ValueError):
+            GameConfig(game_speed_initial=0.01, game_speed_min=0.04)
+        with pytest.raises(ValueError):
+            GameConfig(render_backend="vulkan")
+        with pytest.raises(ValueError):
+            GameConfig(speed_schedule="")
+
+
+class TestLoadConfig:
+    """Tests for load_config function"""
+
+    def test_profile_and_environment_overrides(self, tmp_path):
+        """Test the environment wins over the profile, which wins over defaults"""
+        path = tmp_path / "kiosk.json"
+        path.write_text(json.dumps({"board_width": 40, "board_height": 30}))
+        config = load_config(str(path), environ={"SNAKE_BOARD_HEIGHT": "25"})
+
+        assert config.board_width == 40
+        assert config.board_height == 25
+        assert config.game_speed_min == DEFAULT_CONFIG.game_speed_min
+
+    def test_unknown_key_rejected(self, tmp_path):
+        """Test typos in a profile are reported instead of ignored"""
+        path = tmp_path / "bad.json"
+        path.write_text(json.dumps({"board_widht": 40}))
+        with pytest.raises(ValueError):
+            load_config(str(path), environ={})
+
+    def test_bad_environment_value_rejected(self):
+        """Test environment values are converted to the field type"""
+        with pytest.raises(ValueError):
+            load_config(environ={"SNAKE_FRAME_RATE_CAP": "fast"})
+
+    def test_missing_level_rejected(self):
+        """Test a level that does not exist is reported when the config loads"""
+        with pytest.raises(ValueError, match="Level not found"):
+            load_config(environ={"SNAKE_LEVEL": "no_such_level"})
+        assert load_config(environ={"SNAKE_LEVEL": "box"}).level == "box"
+
+    def test_game_uses_config(self, tmp_path):
+        """Test SnakeGame reads board size, speed and score path from the config"""
+        import os
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        from src.game import SnakeGame
+
+        score_file = str(tmp_path / "scores.json")
+        config = GameConfig(board_width=30, board_height=12, game_speed_initial=0.2,
+                            high_score_path=score_file)
+        game = SnakeGame(headless=True, config=config)
+
+        assert (game.board.width, game.board.height) == (30, 12)
+        assert game.snake.get_head_position() == (15, 6)
+        assert game.game_speed == 0.2
+        assert game.high_score_manager.high_score_file == score_file
+        assert len(game.layout.cell_rects) == 30 * 12
@@ -0,0 +1,198 @@
+"""Tests for the shared memory frame buffer and split-process mode"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import time
+import dataclasses
+import multiprocessing
+import pytest
+from src.shared_state import (FrameBuffer, InputRing, STATE_CODES, run_simulation,
+                              COMMAND_START, COMMAND_PAUSE, COMMAND_QUIT)
+from src.config import STATE_PLAYING, STATE_PAUSED, STATE_GAME_OVER
+from src.direction import DOWN
+from src.settings import DEFAULT_CONFIG
+
+
+@pytest.fixture
+def frames():
+    """A 4x4 board's frame buffer, freed after the test"""
+    buffer = FrameBuffer(16)
+    yield buffer
+    buffer.close()
+
+
+def _publish(frames, game=1, tick=1, body=(5, 4, 3)):
+    """Publish a playing frame"""
+    frames.publish(game, tick, STATE_CODES[STATE_PLAYING], 1, 2, 9, 0.1, list(body))
+
+
+def _wait_for(condition, timeout=5.0):
+    """Poll until condition() is true"""
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        assert time.perf_counter() < deadline
+        time.sleep(0.01)
+
+
+class TestFrameBuffer:
+    """Tests for FrameBuffer class"""
+
+    def test_read_returns_latest_frame_in_place(self, frames):
+        """Test the newest frame is read back with its body as a view"""
+        assert frames.read() is None
+        _publish(frames, tick=1)
+        _publish(frames, tick=2, body=(6, 5, 4, 3))
+
+        frame = frames.read()
+        assert frame.tick == 2
+        assert frame.food == 9
+        assert isinstance(frame.body, memoryview)
+        assert list(frame.body) == [6, 5, 4, 3]
+        assert frame.seq % 2 == 0
+        del frame
+
+    def test_rewritten_slot_is_detected(self, frames):
+        """Test a frame stays current until the writer reuses its slot"""
+        _publish(frames, tick=1)
+        frame = frames.read()
+        _publish(frames, tick=2)
+        assert frames.is_current(frame)
+        _publish(frames, tick=3)
+        assert not frames.is_current(frame)
+        del frame
+
+    def test_writer_dying_mid_write_does_not_hang(self, frames):
+        """Test a slot left odd by a dead writer makes read give up"""
+        _publish(frames, tick=1)
+        # Slot 0's sequence as a writer killed between its two stores leaves it
+        frames.shm.buf[8:16] = (3).to_bytes(8, 'little')
+        assert frames.read(retries=50) is None
+
+    def test_attaches_by_name(self, frames):
+        """Test a second handle sees the frames of the first"""
+        _publish(frames, tick=7)
+        reader = FrameBuffer(16, name=frames.name)
+        frame = reader.read()
+        assert frame.tick == 7
+        del frame
+        reader.close()
+
+
+class TestInputRing:
+    """Tests for InputRing class"""
+
+    def test_values_come_out_in_order_and_overflow_drops(self):
+        """Test FIFO order and that a full ring refuses new values"""
+        ring = InputRing(capacity=4)
+        try:
+            assert all(ring.push(value) for value in (3, 1, 4, 1))
+            assert not ring.push(5)
+            assert ring.pop_all() == [3, 1, 4, 1]
+            assert ring.pop_all() == []
+            assert ring.push(2)
+            assert ring.pop_all() == [2]
+        finally:
+            ring.close()
+
+
+class TestSimulationProcess:
+    """Tests for run_simulation in a child process"""
+
+    def test_ticks_keep_time_while_reader_is_busy(self):
+        """Test ticks follow the clock even when nobody reads frames"""
+        frames = FrameBuffer(DEFAULT_CONFIG.board_width * DEFAULT_CONFIG.board_height)
+        inputs = InputRing()
+        process = multiprocessing.Process(target=run_simulation, args=(frames, inputs), daemon=True)
+        process.start()
+        try:
+            inputs.push(COMMAND_START)
+            inputs.push(DOWN)
+            started = time.perf_counter()
+            # Stand-in for a renderer stuck on a slow frame
+            time.sleep(0.6)
+            _wait_for(lambda: frames.read() is not None)
+            frame = frames.read()
+            elapsed = time.perf_counter() - started
+            expected = elapsed / DEFAULT_CONFIG.game_speed_initial
+            assert expected * 0.6 <= frame.tick <= expected + 1
+            assert frame.heading == DOWN
+
+            inputs.push(COMMAND_PAUSE)
+            _wait_for(lambda: frames.read().state == STATE_CODES[STATE_PAUSED])
+            paused = frames.read().tick
+            time.sleep(0.3)
+            assert frames.read().tick == paused
+            del frame
+        finally:
+            inputs.push(COMMAND_QUIT)
+            process.join(timeout=5)
+            frames.close()
+            inputs.close()
+        assert process.exitcode == 0
+
+
+class TestSplitGame:
+    """Tests for SplitGame class"""
+
+    def _game(self, tmp_path):
+        """Create a headless split game with its own score file"""
+        from src.split_game import SplitGame
+        config = dataclasses.replace(DEFAULT_CONFIG, high_score_path=str(tmp_path / 'scores.json'))
+        return SplitGame(headless=True, config=config)
+
+    def test_renders_frames_from_child_process(self, tmp_path):
+        """Test a started game reaches the renderer and draws"""
+        game = self._game(tmp_path)
+        game.start()
+        try:
+            game._start_game()
+            _wait_for(lambda: game._sync_frame() or (game.frame is not None
+                                                      and game.frame.tick > 0))
+            game.render()
+            assert game.current_state == STATE_PLAYING
+            assert len(game.frame.body) == DEFAULT_CONFIG.initial_snake_length
+        finally:
+            game.close()
+
+    def test_game_over_frame_records_score(self, tmp_path):
+        """Test a game over frame of the current game ends it and saves the score"""
+        game = self._game(tmp_path)
+        try:
+            game._start_game()
+            game.frames.publish(1, 40, STATE_CODES[STATE_GAME_OVER], 0, 6, 0, 0.1, [1, 2, 3])
+            game._sync_frame()
+            assert game.current_state == STATE_GAME_OVER
+            assert game.score == 6
+            assert game.high_score_manager.get_high_score() == 6
+        finally:
+            game.close()
+
+    def test_trace_and_telemetry_not_opened(self, tmp_path):
+        """Test a split game leaves the configured trace and telemetry paths alone"""
+        from src.split_game import SplitGame
+        config = dataclasses.replace(DEFAULT_CONFIG, high_score_path=str(tmp_path / 'scores.json'),
+                                     trace_path=str(tmp_path / 'trace'),
+                                     telemetry_path=str(tmp_path / 'events.jsonl'))
+        game = SplitGame(headless=True, config=config)
+        try:
+            assert game.trace is None
+            assert game.telemetry is None
+            assert not (tmp_path / 'trace').exists()
+            assert not (tmp_path / 'events.jsonl').exists()
+        finally:
+            game.close()
+
+    def test_frames_of_old_games_ignored(self, tmp_path):
+        """Test a frame left over from the previous game is not shown"""
+        game = self._game(tmp_path)
+        try:
+            game._start_game()
+            game._start_game()
+            game.frames.publish(1, 40, STATE_CODES[STATE_GAME_OVER], 0, 6, 0, 0.1, [1, 2, 3])
+            game._sync_frame()
+            assert game.current_state == STATE_PLAYING
+            assert game.frame is None
+        finally:
+            game.close()
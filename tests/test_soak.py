@@ -0,0 +1,83 @@
+"""Tests for the autopilot bot and the memory soak test"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from src.bot import GreedyBot
+from src.direction import DOWN, LEFT
+from src.soak import SoakTest, SoakSample
+
+
+def _playing_game(tmp_path):
+    """Create a headless game in the playing state with its own stats file"""
+    import dataclasses
+    from src.game import SnakeGame
+    from src.settings import DEFAULT_CONFIG
+
+    config = dataclasses.replace(DEFAULT_CONFIG, high_score_path=str(tmp_path / 'scores.json'))
+    game = SnakeGame(headless=True, config=config)
+    game._start_game()
+    return game
+
+
+class TestGreedyBot:
+    """Tests for GreedyBot"""
+
+    def test_turns_towards_food(self, tmp_path):
+        """Test the bot picks the turn that closes the distance to the food"""
+        game = _playing_game(tmp_path)
+        head_x, head_y = game.snake.get_head_position()
+        game.food.position = (head_x, head_y + 3)
+
+        assert GreedyBot().choose_direction(game) == DOWN
+
+    def test_avoids_own_body(self, tmp_path):
+        """Test the bot never turns into its own body"""
+        game = _playing_game(tmp_path)
+        head_x, head_y = game.snake.get_head_position()
+        game.snake.heading = LEFT
+        game.snake.body = [(head_x, head_y), (head_x + 1, head_y),
+                           (head_x + 1, head_y - 1), (head_x, head_y - 1),
+                           (head_x - 1, head_y - 1), (head_x - 2, head_y - 1)]
+        game.food.position = (head_x, head_y - 5)
+
+        assert GreedyBot().choose_direction(game) in (LEFT, DOWN)
+
+    def test_autopilot_steers_update(self, tmp_path):
+        """Test the game asks its autopilot for a direction every tick"""
+        game = _playing_game(tmp_path)
+        head_x, head_y = game.snake.get_head_position()
+        game.food.position = (head_x, head_y + 4)
+        game.autopilot = GreedyBot()
+
+        game.update()
+        assert game.snake.heading == DOWN
+        assert game.snake.get_head_position() == (head_x, head_y + 1)
+
+
+class TestSoakTest:
+    """Tests for SoakTest"""
+
+    def test_short_soak_within_budget(self):
+        """Test a short soak plays several snapshots and passes generous budgets"""
+        soak = SoakTest(hours=0.02, snapshot_interval=18.0,
+                        rss_budget_mb=256, object_budget=100000)
+        report = soak.run()
+
+        assert report.passed, report.format()
+        assert len(report.samples) == 3
+        assert report.samples[-1].simulated_seconds >= 72.0
+        assert report.samples[-1].ticks > report.baseline.ticks
+        assert not soak.game.headless
+        assert "PASS" in report.format()
+
+    def test_budget_overrun_fails(self):
+        """Test growth past a budget is reported as a failure"""
+        soak = SoakTest(rss_budget_mb=1, object_budget=10)
+        baseline = SoakSample(0.0, 0, 1, rss=50 * 1024 * 1024, objects=1000, traced=0)
+        sample = SoakSample(60.0, 600, 2, rss=52 * 1024 * 1024, objects=1005, traced=0)
+
+        failures = soak._check_budgets(baseline, sample)
+        assert len(failures) == 1
+        assert "RSS" in failures[0]
@@ -0,0 +1,74 @@
+"""Unit tests for the spectator broadcaster"""
+
+import random
+from src.arena import Arena
+from src.protocol import MirrorState, decode
+from src.spectator import SpectatorBroadcaster, Subscriber, measure_fanout
+
+
+def make_arena():
+    """Create a small arena with one snake"""
+    arena = Arena(16, 16, food_count=1, rng=random.Random(4))
+    arena.add_snake((8, 8))
+    return arena
+
+
+class TestSubscriber:
+    """Tests for Subscriber queues"""
+
+    def test_overflow_waits_for_keyframe(self):
+        """Test a full queue is dropped until the next keyframe"""
+        subscriber = Subscriber(max_queue=2)
+        subscriber.offer(b'k', True)
+        subscriber.offer(b'd1', False)
+        subscriber.offer(b'd2', False)
+
+        assert subscriber.resyncing is True
+        assert subscriber.drain() == []
+
+        subscriber.offer(b'd3', False)
+        subscriber.offer(b'k2', True)
+        assert subscriber.drain() == [b'k2']
+        assert subscriber.dropped == 4
+
+
+class TestSpectatorBroadcaster:
+    """Tests for SpectatorBroadcaster class"""
+
+    def test_frames_are_shared(self):
+        """Test every subscriber receives the same memoryview object"""
+        arena = make_arena()
+        broadcaster = SpectatorBroadcaster()
+        first = broadcaster.subscribe()
+        second = broadcaster.subscribe()
+
+        frame = broadcaster.publish(arena)
+
+        assert isinstance(frame, memoryview)
+        assert frame.readonly
+        assert first.poll() is frame
+        assert second.poll() is frame
+
+    def test_late_joiner_syncs_from_keyframe(self):
+        """Test a late subscriber rebuilds the live state"""
+        arena = make_arena()
+        broadcaster = SpectatorBroadcaster(keyframe_interval=10)
+        broadcaster.publish(arena)
+        for _ in range(4):
+            broadcaster.publish(arena, arena.step())
+
+        late = broadcaster.subscribe()
+        frames = late.drain()
+        mirror = MirrorState(decode(frames[0]))
+        for frame in frames[1:]:
+            assert mirror.apply_delta(decode(frame, len(mirror.players)))
+
+        assert mirror.tick == arena.tick
+        assert mirror.players[0].snake.body == arena.players[0].snake.body
+
+    def test_measure_fanout(self):
+        """Test the fan-out benchmark reports a capacity"""
+        stats = measure_fanout(subscriber_count=50, ticks=10)
+
+        assert stats['subscribers'] == 50
+        assert stats['subscribers_per_core'] > 0
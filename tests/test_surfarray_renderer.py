@@ -0,0 +1,75 @@
+"""Unit tests for the surfarray board renderer"""
+
+import os
+import random
+import numpy as np
+import pygame
+from src.snake import Snake
+from src.game_board import GameBoard
+from src.surfarray_renderer import SurfarrayBoardRenderer
+from src.config import COLOR_SNAKE_HEAD, COLOR_SNAKE_BODY, COLOR_FOOD, RENDER_BACKEND_SURFARRAY
+
+
+def expected_counts(snake, width, height):
+    """Count segments per cell the slow way"""
+    counts = np.zeros((width, height), dtype=np.int32)
+    for x, y in snake.get_body():
+        counts[x, y] += 1
+    return counts
+
+
+class TestSurfarrayBoardRenderer:
+    """Tests for SurfarrayBoardRenderer class"""
+
+    def test_incremental_sync_matches_rebuild(self):
+        """Test head/tail patching keeps the grid equal to a full recount"""
+        rng = random.Random(3)
+        board = GameBoard(12, 9)
+        snake = Snake((5, 5), 4)
+        renderer = SurfarrayBoardRenderer(board.width, board.height)
+        renderer.sync(snake)
+
+        for _ in range(200):
+            snake.move(rng.choice(['UP', 'DOWN', 'LEFT', 'RIGHT']))
+            snake.body[0] = board.wrap_position(snake.body[0])
+            if rng.random() < 0.2:
+                snake.grow()
+            renderer.sync(snake)
+            assert np.array_equal(renderer.counts, expected_counts(snake, 12, 9))
+
+    def test_skipped_ticks_trigger_rebuild(self):
+        """Test several moves between syncs still produce the right grid"""
+        snake = Snake((5, 5), 3)
+        renderer = SurfarrayBoardRenderer(20, 20)
+        renderer.sync(snake)
+        snake.move('RIGHT')
+        snake.move('DOWN')
+        renderer.sync(snake)
+
+        assert np.array_equal(renderer.counts, expected_counts(snake, 20, 20))
+
+    def test_draw_colours_cells(self):
+        """Test head, body and food cells get their palette colours"""
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        pygame.init()
+        window = pygame.Surface((100, 100))
+        snake = Snake((2, 2), 3)
+        renderer = SurfarrayBoardRenderer(10, 10)
+        renderer.draw(window, pygame.Rect(0, 0, 100, 100), snake, (7, 7))
+
+        assert tuple(window.get_at((25, 25)))[:3] == COLOR_SNAKE_HEAD
+        assert tuple(window.get_at((25, 15)))[:3] == COLOR_SNAKE_BODY
+        assert tuple(window.get_at((75, 75)))[:3] == COLOR_FOOD
+
+    def test_game_uses_selected_backend(self):
+        """Test SnakeGame renders through the surfarray backend when asked"""
+        from src.game import SnakeGame
+        from src.settings import GameConfig
+        game = SnakeGame(headless=True, config=GameConfig(render_backend=RENDER_BACKEND_SURFARRAY))
+        assert isinstance(game.board_renderer, SurfarrayBoardRenderer)
+
+        game._render_game()
+        head_x, head_y = game.snake.get_head_position()
+        cell_width, cell_height = game._get_cell_size()
+        centre = (int((head_x + 0.5) * cell_width), int((head_y + 0.5) * cell_height))
+        assert tuple(game.window.get_at(centre))[:3] == COLOR_SNAKE_HEAD
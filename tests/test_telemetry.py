@@ -0,0 +1,114 @@
+"""Unit tests for session telemetry"""
+
+import json
+import sqlite3
+import time
+from src.telemetry import (TelemetryRecorder, NdjsonSink, SqliteSink, create_sink,
+                           EVENT_GAME_START, EVENT_FOOD_EATEN, EVENT_DEATH, EVENT_SESSION_END)
+
+
+def read_ndjson(path):
+    """Return the events stored in an NDJSON file"""
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TestTelemetryRecorder:
+    """Tests for TelemetryRecorder class"""
+
+    def test_close_flushes_to_ndjson(self, tmp_path):
+        """Test buffered events reach the NDJSON sink on close"""
+        path = str(tmp_path / "events.ndjson")
+        recorder = TelemetryRecorder(NdjsonSink(path), flush_interval=60)
+        recorder.record("ping", value=1)
+        recorder.record("ping", value=2)
+        recorder.close()
+
+        events = read_ndjson(path)
+        assert [event["value"] for event in events] == [1, 2]
+        assert recorder.written == 2
+
+    def test_background_thread_flushes(self, tmp_path):
+        """Test the writer thread flushes without an explicit call"""
+        path = str(tmp_path / "events.ndjson")
+        recorder = TelemetryRecorder(NdjsonSink(path), flush_interval=0.01)
+        recorder.record("ping")
+        deadline = time.time() + 2
+        while recorder.written == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        recorder.close()
+
+        assert recorder.written == 1
+
+    def test_full_buffer_drops_oldest(self, tmp_path):
+        """Test the ring buffer keeps the newest events and counts drops"""
+        path = str(tmp_path / "events.ndjson")
+        recorder = TelemetryRecorder(NdjsonSink(path), capacity=3, flush_interval=60)
+        for value in range(5):
+            recorder.record("ping", value=value)
+        recorder.close()
+
+        assert recorder.dropped == 2
+        assert [event["value"] for event in read_ndjson(path)] == [2, 3, 4]
+
+    def test_failed_batch_retried(self, tmp_path):
+        """Test a batch the sink refuses is written by the next flush"""
+        path = tmp_path / "missing" / "events.ndjson"
+        recorder = TelemetryRecorder(NdjsonSink(str(path)), flush_interval=60)
+        recorder.record("ping", value=1)
+        assert recorder.flush() == 0
+        assert recorder.write_errors == 1
+
+        path.parent.mkdir()
+        recorder.record("ping", value=2)
+        assert recorder.flush() == 2
+        recorder.close()
+
+        assert [event["value"] for event in read_ndjson(path)] == [1, 2]
+        assert recorder.dropped == 0
+
+    def test_sqlite_sink(self, tmp_path):
+        """Test .db paths select the SQLite sink"""
+        path = str(tmp_path / "events.db")
+        sink = create_sink(path)
+        assert isinstance(sink, SqliteSink)
+
+        recorder = TelemetryRecorder(sink, flush_interval=60)
+        recorder.record("ping", value=7)
+        recorder.close()
+
+        with sqlite3.connect(path) as connection:
+            rows = connection.execute("SELECT event, data FROM events").fetchall()
+        assert rows == [("ping", json.dumps({"value": 7}))]
+
+
+class TestGameTelemetry:
+    """Tests for the telemetry hooks in SnakeGame"""
+
+    def test_session_events(self, tmp_path):
+        """Test a short game emits start, food, death and session events"""
+        import os
+        os.environ['SDL_VIDEODRIVER'] = 'dummy'
+        from src.game import SnakeGame
+        from src.settings import GameConfig
+
+        path = str(tmp_path / "events.ndjson")
+        config = GameConfig(telemetry_path=path, high_score_path=str(tmp_path / "scores.json"))
+        game = SnakeGame(headless=True, config=config)
+        game._start_game()
+
+        head_x, head_y = game.snake.get_head_position()
+        game.food.position = (head_x + 1, head_y)
+        game.update()
+        game.render()
+        game._end_game()
+        game.telemetry.close()
+
+        events = read_ndjson(path)
+        assert [event["event"] for event in events] == [
+            EVENT_GAME_START, EVENT_FOOD_EATEN, EVENT_DEATH, EVENT_SESSION_END
+        ]
+        assert events[1]["tick"] == 1
+        assert events[1]["position"] == [head_x + 1, head_y]
+        assert events[3]["frames"] == 1
+        assert len({event["session"] for event in events}) == 1
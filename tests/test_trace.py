@@ -0,0 +1,67 @@
+"""Tests for columnar game traces"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import numpy as np
+from src.trace import TraceWriter, COLUMNS, load_trace, record_bot_games
+
+
+class TestTraceWriter:
+    """Tests for TraceWriter class"""
+
+    def test_rows_stream_across_chunks(self, tmp_path):
+        """Test rows written over several chunk flushes read back in order"""
+        with TraceWriter(str(tmp_path), chunk_rows=4) as writer:
+            writer.start_game()
+            for tick in range(1, 11):
+                writer.record(tick, (tick, 2), 3, 1, (5, 6), tick // 4, 0.1, tick % 4 == 0)
+
+        trace = load_trace(str(tmp_path))
+        assert set(trace) == {name for name, _ in COLUMNS}
+        assert list(trace['tick']) == list(range(1, 11))
+        assert list(trace['head_x']) == list(range(1, 11))
+        assert trace['ate'].sum() == 2
+        assert trace['interval'].dtype == np.float32
+
+    def test_columns_are_memory_mapped(self, tmp_path):
+        """Test columns load as read-only memory maps of the patched length"""
+        with TraceWriter(str(tmp_path), chunk_rows=8) as writer:
+            writer.start_game()
+            writer.record(1, (0, 0), 3, 0, (1, 1), 0, 0.1, False)
+            writer.start_game()
+            writer.record(1, (4, 4), 3, 2, (1, 1), 0, 0.1, False)
+
+        trace = load_trace(str(tmp_path))
+        assert isinstance(trace['game'], np.memmap)
+        assert list(trace['game']) == [0, 1]
+        assert load_trace(str(tmp_path), mmap=False)['direction'].tolist() == [0, 2]
+
+    def test_flushed_rows_load_before_close(self, tmp_path):
+        """Test a trace left open (e.g. by a crash) loads every flushed row"""
+        writer = TraceWriter(str(tmp_path), chunk_rows=4)
+        writer.start_game()
+        for tick in range(1, 7):
+            writer.record(tick, (tick, 0), 3, 1, (5, 6), 0, 0.1, False)
+
+        trace = load_trace(str(tmp_path), mmap=False)
+        assert trace['tick'].tolist() == [1, 2, 3, 4]
+        writer.close()
+        assert load_trace(str(tmp_path))['tick'].tolist() == list(range(1, 7))
+
+
+class TestGameTrace:
+    """Tests for tracing SnakeGame ticks"""
+
+    def test_bot_games_traced_per_tick(self, tmp_path):
+        """Test every tick of every game becomes a row, with eaten food flagged"""
+        rows = record_bot_games(str(tmp_path), games=3, max_ticks=500)
+        trace = load_trace(str(tmp_path))
+
+        assert len(trace['tick']) == rows > 0
+        assert set(trace['game'].tolist()) == {0, 1, 2}
+        first = trace['game'] == 0
+        assert trace['tick'][first].tolist() == list(range(1, first.sum() + 1))
+        # Score only goes up on ticks where food was eaten
+        assert trace['ate'][first].sum() == trace['score'][first][-1]
@@ -0,0 +1,110 @@
+"""Tests for the neuroevolution trainer"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import random
+import numpy as np
+from src.train import (BatchedSnakeEnv, Trainer, NeuralAutopilot, FEATURES, ACTIONS,
+                       genome_size, unpack, forward, evaluate)
+from src.simulation import Simulation
+from src.direction import DIRECTIONS, OPPOSITE
+
+
+class TestBatchedSnakeEnv:
+    """Tests for BatchedSnakeEnv class"""
+
+    def test_matches_simulation_rules(self):
+        """Test heads, lengths and death tick match Simulation given the same food"""
+        moves = random.Random(3)
+        for seed in range(5):
+            simulation = Simulation(seed, timed=False)
+            env = BatchedSnakeEnv(1, max_ticks=10 ** 6)
+            env.starvation = 10 ** 6
+            width = env.width
+            while simulation.death_cause is None:
+                x, y = simulation.food.position
+                env.food[0] = y * width + x
+                action = moves.choice(DIRECTIONS)
+                simulation.step(action)
+                env.step(np.array([action]))
+
+                x, y = simulation.snake.body[0]
+                assert env.head[0] == y * width + x
+                assert env.length[0] == len(simulation.snake.body)
+                assert env.alive[0] == (simulation.death_cause is None)
+            assert env.score[0] == simulation.score
+
+    def test_observations_shape_and_heading(self):
+        """Test every game gets one feature row with its heading set"""
+        env = BatchedSnakeEnv(6, seed=1)
+        observations = env.observations()
+        assert observations.shape == (6, FEATURES)
+        assert (observations[:, 8:].sum(axis=1) == 1).all()
+
+
+class TestPolicy:
+    """Tests for the policy network helpers"""
+
+    def test_forward_scores_every_action(self):
+        """Test a batch of genomes scores each game's actions"""
+        hidden = 5
+        genomes = np.random.default_rng(0).normal(size=(3, genome_size(hidden)))
+        scores = forward(unpack(genomes, hidden), np.zeros((3, 4, FEATURES)))
+        assert scores.shape == (3, 4, ACTIONS)
+
+    def test_evaluation_is_deterministic(self):
+        """Test the same genomes and seed give the same fitness"""
+        genomes = np.random.default_rng(2).normal(size=(4, genome_size(4)))
+        first = evaluate(genomes, 4, games=2, seed=9)
+        assert first.shape == (4,)
+        assert np.array_equal(first, evaluate(genomes, 4, games=2, seed=9))
+
+
+class TestTrainer:
+    """Tests for Trainer class"""
+
+    def test_step_keeps_population_and_tracks_best(self, tmp_path):
+        """Test a generation keeps the population size and checkpoints the best"""
+        trainer = Trainer(population=8, hidden=4, games=1, workers=1, seed=5)
+        best = trainer.step()
+        trainer.step()
+
+        assert trainer.generation == 2
+        assert trainer.population.shape == (8, genome_size(4))
+        assert trainer.best_fitness >= best
+
+        path = str(tmp_path / 'policy.npz')
+        trainer.save(path)
+        autopilot = NeuralAutopilot.load(path)
+        assert autopilot.weights[0].shape == (1, FEATURES, 4)
+
+    def test_pool_matches_inline_evaluation(self):
+        """Test splitting the population across workers keeps the fitness"""
+        inline = Trainer(population=6, hidden=4, games=1, workers=1, seed=7)
+        pooled = Trainer(population=6, hidden=4, games=1, workers=2, seed=7)
+        try:
+            assert np.array_equal(inline.evaluate(), pooled.evaluate())
+        finally:
+            pooled.close()
+
+
+class TestNeuralAutopilot:
+    """Tests for NeuralAutopilot class"""
+
+    def test_plays_game_without_reversing(self, tmp_path):
+        """Test the autopilot steers SnakeGame and never picks a reversal"""
+        import dataclasses
+        from src.game import SnakeGame
+        from src.settings import DEFAULT_CONFIG
+
+        config = dataclasses.replace(DEFAULT_CONFIG, high_score_path=str(tmp_path / 'scores.json'))
+        game = SnakeGame(headless=True, config=config)
+        autopilot = NeuralAutopilot(np.random.default_rng(4).normal(size=genome_size(6)), 6)
+        game.autopilot = autopilot
+        game._start_game()
+        for _ in range(20):
+            direction = autopilot.choose_direction(game)
+            assert direction != OPPOSITE[game.snake.heading]
+            game.update()
@@ -0,0 +1,109 @@
+"""Tests for the shared game rules and replay verification"""
+
+import os
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from src.simulation import Simulation, Replay
+from src.verify import (ReplayVerifier, verify_replay, record_bot_replays,
+                        replay_to_json, replay_from_json)
+from src.high_score import HighScoreManager
+from src.bot import GreedyBot
+
+
+def _bot_replay(seed):
+    """Play a bot game to its end and return the simulation"""
+    simulation = Simulation(seed)
+    bot = GreedyBot()
+    while simulation.death_cause is None:
+        simulation.step(bot.choose_direction(simulation))
+    return simulation
+
+
+class TestSimulation:
+    """Tests for Simulation class"""
+
+    def test_same_seed_and_inputs_replay_identically(self):
+        """Test a game is fully determined by its seed and direction changes"""
+        first = _bot_replay(11)
+        second = Simulation(11)
+        changes = dict(first.inputs)
+        while second.death_cause is None:
+            second.step(changes.get(second.tick + 1))
+
+        assert second.replay() == first.replay()
+        assert second.snake.body == first.snake.body
+
+    def test_game_replay_verifies(self, tmp_path):
+        """Test a game played by SnakeGame verifies with the headless rules"""
+        import dataclasses
+        from src.game import SnakeGame
+        from src.settings import DEFAULT_CONFIG
+        from src.config import STATE_PLAYING
+
+        config = dataclasses.replace(DEFAULT_CONFIG, high_score_path=str(tmp_path / 'scores.json'))
+        game = SnakeGame(headless=True, config=config)
+        game.autopilot = GreedyBot()
+        game._start_game()
+        while game.current_state == STATE_PLAYING:
+            game.update()
+
+        replay = game.get_replay()
+        assert replay.inputs
+        assert verify_replay(replay, config)
+
+
+class TestVerifyReplay:
+    """Tests for verify_replay function"""
+
+    def test_tampered_results_rejected(self):
+        """Test inflated scores, wrong death ticks and forged inputs fail"""
+        replay = _bot_replay(5).replay()
+        assert verify_replay(replay)
+
+        assert not verify_replay(replay._replace(score=replay.score + 1))
+        assert not verify_replay(replay._replace(ticks=replay.ticks + 1))
+        assert not verify_replay(replay._replace(ticks=replay.ticks - 1))
+        assert not verify_replay(replay._replace(inputs=replay.inputs[:-1]))
+
+    def test_malformed_replays_rejected(self):
+        """Test invalid direction codes, unordered ticks and bad counts fail"""
+        assert not verify_replay(Replay(1, [(3, 7)], 0, 10))
+        assert not verify_replay(Replay(1, [(5, 0), (4, 1)], 0, 10))
+        assert not verify_replay(Replay(1, [], 0, 0))
+        assert not verify_replay(Replay(1, [], 0, 10 ** 9))
+        assert not verify_replay(Replay(1, [5], 0, 10))
+        assert not verify_replay(Replay(1, [(1, 0, 2)], 0, 10))
+
+    def test_json_round_trip(self):
+        """Test replays survive the JSON line format"""
+        replay = _bot_replay(8).replay()
+        assert replay_from_json(replay_to_json(replay)) == replay
+
+
+class TestReplayVerifier:
+    """Tests for ReplayVerifier class"""
+
+    def test_pool_matches_inline_verification(self):
+        """Test the process pool gives the same verdicts as verifying in-process"""
+        replays = record_bot_replays(12)
+        replays[3] = replays[3]._replace(score=replays[3].score + 5)
+
+        with ReplayVerifier(workers=2, chunksize=4) as verifier:
+            pooled = verifier.verify(replays)
+        inline = ReplayVerifier(workers=1).verify(replays)
+
+        assert pooled == inline
+        assert pooled.count(False) == 1
+        assert pooled[3] is False
+
+    def test_submit_records_only_accepted_scores(self, tmp_path):
+        """Test forged scores never reach the high score file"""
+        manager = HighScoreManager(str(tmp_path / 'scores.json'))
+        honest = _bot_replay(21).replay()
+        forged = honest._replace(score=honest.score + 100)
+
+        results = ReplayVerifier(workers=1).submit(manager, iter([honest, forged]))
+
+        assert results == [True, False]
+        assert manager.get_high_score() == honest.score